@@ -0,0 +1,6 @@
+"""
+Performance baseline for the `detl` engine.
+
+Run `python -m benchmarks run` to time every registry handler and full contracts against
+seeded synthetic data, and `python -m benchmarks compare` to flag regressions between runs.
+"""
@@ -0,0 +1,140 @@
+import argparse
+import sys
+from pathlib import Path
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from benchmarks import contracts, registries, wide
+from benchmarks.connectors import suite as connector_suite
+from benchmarks.connectors.targets import all_targets
+from benchmarks.harness import RESULTS_DIR, BenchmarkRun, compare, git_commit, load_run, run_case, save_run
+
+SUITES = {
+    "registries": registries.cases,
+    "contracts": contracts.cases,
+    "wide": wide.cases,
+}
+
+DEFAULT_ROWS = [1_000_000]
+
+console = Console()
+
+
+def _fmt_rate(rate: float) -> str:
+    return f"{rate / 1e6:,.2f}M" if rate >= 1e6 else f"{rate:,.0f}"
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    run = BenchmarkRun(commit=git_commit())
+    table = Table(title=f"detl benchmarks @ {run.commit}")
+    for column in ("case", "rows", "best (s)", "median (s)", "rows/s"):
+        table.add_column(column, justify="left" if column == "case" else "right")
+
+    for rows in args.rows:
+        for suite in args.suite:
+            console.print(f"[cyan]Building '{suite}' suite for {rows:,} rows...[/cyan]")
+            for name, group, fn in SUITES[suite](rows, seed=args.seed, null_rate=args.null_rate, dirty_rate=args.dirty_rate):
+                if args.filter and args.filter not in f"{group}/{name}":
+                    continue
+                result = run_case(name, group, rows, fn, repeats=args.repeats, warmup=args.warmup)
+                run.results.append(result)
+                table.add_row(f"{group}/{name}", f"{rows:,}", f"{result.best:.4f}", f"{result.median:.4f}", _fmt_rate(result.rows_per_sec))
+
+    console.print(table)
+    if not args.no_save:
+        path = save_run(run, args.output)
+        console.print(f"[green]Results saved to {path}[/green]")
+    return 0
+
+
+def cmd_connectors(args: argparse.Namespace) -> int:
+    run = BenchmarkRun(commit=git_commit())
+    batch_sizes = [b or None for b in args.batch_sizes]
+    for rows in args.rows:
+        run.results.extend(connector_suite.run(
+            rows, args.targets, batch_sizes=batch_sizes, repeats=args.repeats, warmup=args.warmup, seed=args.seed
+        ))
+
+    table = Table(title=f"detl connector I/O @ {run.commit}")
+    for column in ("case", "rows", "best (s)", "rows/s", "MB/s", "peak mem (MB)"):
+        table.add_column(column, justify="left" if column == "case" else "right", no_wrap=column == "case")
+    for r in run.results:
+        mb_s = f"{r.mb_per_sec:,.1f}" if r.mb_per_sec is not None else "-"
+        peak = f"{r.peak_memory / 1e6:,.1f}" if r.peak_memory is not None else "-"
+        table.add_row(escape(f"{r.group}/{r.name}"), f"{r.rows:,}", f"{r.best:.4f}", _fmt_rate(r.rows_per_sec), mb_s, peak)
+    console.print(table)
+
+    if not args.no_save:
+        path = save_run(run, args.output)
+        console.print(f"[green]Results saved to {path}[/green]")
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    base = load_run(args.base, args.results_dir)
+    head = load_run(args.head, args.results_dir)
+    rows, regressions = compare(base, head, threshold=args.threshold)
+
+    table = Table(title=f"{base.commit} -> {head.commit} (threshold {args.threshold:.0%})")
+    for column in ("case", "base (s)", "head (s)", "change"):
+        table.add_column(column, justify="left" if column == "case" else "right")
+    flagged = {c.key for c in regressions}
+    for c in sorted(rows, key=lambda c: c.ratio, reverse=True):
+        change = f"{c.ratio - 1:+.1%}"
+        if c.key in flagged:
+            change = f"[bold red]{change} REGRESSION[/bold red]"
+        elif c.ratio < 1 - args.threshold:
+            change = f"[green]{change}[/green]"
+        table.add_row(escape(c.key), f"{c.base:.4f}", f"{c.head:.4f}", change)
+    console.print(table)
+
+    if regressions:
+        console.print(f"[bold red]{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.[/bold red]")
+        return 1
+    console.print("[green]No regressions detected.[/green]")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="detl performance baseline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Execute benchmark suites and store the results as JSON.")
+    run_p.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Row counts to benchmark, e.g. 1000000 10000000 100000000.")
+    run_p.add_argument("--suite", nargs="+", choices=sorted(SUITES), default=sorted(SUITES), help="Suites to execute.")
+    run_p.add_argument("--filter", type=str, default=None, help="Only run cases whose 'group/name' contains this substring.")
+    run_p.add_argument("--repeats", type=int, default=3)
+    run_p.add_argument("--warmup", type=int, default=1)
+    run_p.add_argument("--seed", type=int, default=42)
+    run_p.add_argument("--null-rate", type=float, default=0.05)
+    run_p.add_argument("--dirty-rate", type=float, default=0.01)
+    run_p.add_argument("--output", type=Path, default=RESULTS_DIR, help="Directory for the JSON results.")
+    run_p.add_argument("--no-save", action="store_true", help="Print results without writing JSON.")
+    run_p.set_defaults(func=cmd_run)
+
+    io_p = sub.add_parser("connectors", help="Measure read/write throughput of every connector against local stand-ins.")
+    io_p.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    io_p.add_argument("--targets", nargs="+", choices=sorted(all_targets()), default=sorted(all_targets()))
+    io_p.add_argument("--batch-sizes", type=int, nargs="+", default=[0], help="Batch sizes for batched connectors; 0 means unbatched.")
+    io_p.add_argument("--repeats", type=int, default=3)
+    io_p.add_argument("--warmup", type=int, default=1)
+    io_p.add_argument("--seed", type=int, default=42)
+    io_p.add_argument("--output", type=Path, default=RESULTS_DIR)
+    io_p.add_argument("--no-save", action="store_true")
+    io_p.set_defaults(func=cmd_connectors)
+
+    cmp_p = sub.add_parser("compare", help="Compare two stored runs and flag regressions.")
+    cmp_p.add_argument("base", help="Baseline results JSON path or commit sha.")
+    cmp_p.add_argument("head", help="Candidate results JSON path or commit sha.")
+    cmp_p.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression.")
+    cmp_p.add_argument("--results-dir", type=Path, default=RESULTS_DIR)
+    cmp_p.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+"""
+Connector I/O throughput benchmarks (`python -m benchmarks connectors`).
+
+Every connector in `detl.connectors` is exercised against a local stand-in: files in a temporary
+directory, SQLite databases, a throwaway Postgres/MySQL started through testcontainers and an
+in-process moto S3 (or any MinIO endpoint).
+"""
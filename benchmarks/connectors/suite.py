@@ -0,0 +1,105 @@
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+import polars as pl
+from rich.console import Console
+from rich.markup import escape
+
+from benchmarks.connectors.memory import PeakMemory
+from benchmarks.connectors.targets import Target, TargetUnavailable, all_targets
+from benchmarks.datagen import generate
+from benchmarks.harness import BenchmarkResult
+
+console = Console()
+
+
+def _materialize(frame: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame:
+    return frame.collect() if isinstance(frame, pl.LazyFrame) else frame
+
+
+def _measure(fn: Callable[[], object], repeats: int, warmup: int) -> tuple[List[float], int]:
+    for _ in range(warmup):
+        fn()
+    timings, peak = [], 0
+    for _ in range(repeats):
+        with PeakMemory() as mem:
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        peak = max(peak, mem.growth)
+    return timings, peak
+
+
+def _batch_label(batch_size: Optional[int]) -> str:
+    return f"[batch={batch_size}]" if batch_size else ""
+
+
+def run_target(target: Target, df: pl.DataFrame, batch_sizes: Iterable[Optional[int]], repeats: int, warmup: int) -> List[BenchmarkResult]:
+    group = f"connectors/{target.name}"
+    frame_bytes = int(df.estimated_size())
+    results = []
+
+    def record(name: str, fn: Callable[[], object]) -> None:
+        try:
+            timings, peak = _measure(fn, repeats, warmup)
+        except Exception as e:
+            # An engine that cannot handle the data at all is a finding, not a reason to abort the suite
+            console.print(f"[red]{escape(f'{group}/{name}')} failed: {escape(str(e).splitlines()[0])}[/red]")
+            return
+        results.append(BenchmarkResult(name=name, group=group, rows=df.height, timings=timings, bytes=frame_bytes, peak_memory=peak))
+
+    sizes = list(batch_sizes) if target.batched else [None]
+    for batch_size in sizes:
+        sink = target.sink(batch_size)
+        record(f"write{_batch_label(batch_size)}", lambda: sink.write(df))
+        source = target.source(batch_size)
+        record(f"read{_batch_label(batch_size)}", lambda: _materialize(source.read()))
+
+    for engine, fn in target.write_variants().items():
+        record(f"write[{engine}]", lambda f=fn: f(df))
+    for engine, fn in target.read_variants().items():
+        record(f"read[{engine}]", fn)
+
+    stored = target.stored_bytes()
+    if stored is not None:
+        console.print(f"[cyan]{target.name}: {stored / 1e6:,.1f} MB at rest for {df.height:,} rows[/cyan]")
+    return results
+
+
+def run(
+    rows: int,
+    targets: Iterable[str],
+    batch_sizes: Iterable[Optional[int]] = (None,),
+    repeats: int = 3,
+    warmup: int = 1,
+    seed: int = 42,
+) -> List[BenchmarkResult]:
+    """Writes then reads a synthetic frame of `rows` rows through each requested target.
+
+    Targets whose stand-in cannot be provisioned here (no docker, missing optional packages) are
+    reported and skipped rather than failing the whole suite.
+    """
+    available = all_targets()
+    unknown = set(targets) - set(available)
+    if unknown:
+        raise ValueError(f"Unknown connector target(s): {sorted(unknown)}. Expected any of {sorted(available)}.")
+
+    df = generate(rows, seed=seed)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="detl-bench-") as tmp:
+        for name in targets:
+            target = available[name]
+            workdir = Path(tmp) / name
+            workdir.mkdir()
+            try:
+                target.start(workdir, rows)
+            except TargetUnavailable as e:
+                console.print(f"[yellow]Skipping '{name}': {e}[/yellow]")
+                continue
+            try:
+                results.extend(run_target(target, df, batch_sizes, repeats, warmup))
+            finally:
+                target.stop()
+    return results
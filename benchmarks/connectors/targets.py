@@ -0,0 +1,303 @@
+"""Local stand-ins for every connector family, each exposing a configured detl Source and Sink."""
+import abc
+import importlib.util
+import os
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import polars as pl
+
+from detl.connectors import (
+    Source, Sink,
+    CsvSource, CsvSink,
+    ParquetSource, ParquetSink,
+    ExcelSource, ExcelSink,
+    PostgresSource, PostgresSink,
+    MySQLSource, MySQLSink,
+    SQLiteSource, SQLiteSink,
+    S3Source, S3Sink,
+    MemorySource, MemorySink,
+)
+
+TABLE = "detl_bench"
+BUCKET = "detl-bench"
+EXCEL_MAX_ROWS = 1_048_575
+
+Variant = Callable[[pl.DataFrame], object]
+
+
+class TargetUnavailable(Exception):
+    """Raised when a stand-in cannot be started in this environment (missing package, no docker...)."""
+    pass
+
+
+def _require(*modules: str) -> None:
+    missing = [m for m in modules if importlib.util.find_spec(m) is None]
+    if missing:
+        raise TargetUnavailable(f"missing optional package(s): {', '.join(missing)}")
+
+
+class Target(abc.ABC):
+    """A connector family under test. Subclasses provision their backing store in `start`."""
+    name: str = ""
+    # Whether the connectors accept a `batch_size`; unbatched targets run once per suite
+    batched: bool = False
+
+    def start(self, workdir: Path, rows: int) -> None:
+        self.workdir = workdir
+
+    def stop(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def source(self, batch_size: Optional[int]) -> Source:
+        """The Source reading the stand-in's data."""
+
+    @abc.abstractmethod
+    def sink(self, batch_size: Optional[int]) -> Sink:
+        """The Sink writing into the stand-in."""
+
+    def stored_bytes(self) -> Optional[int]:
+        """Size of the written payload at rest, when the stand-in can tell."""
+        return None
+
+    def read_variants(self) -> Dict[str, Callable[[], object]]:
+        """Alternative read engines for the same data, keyed by engine name."""
+        return {}
+
+    def write_variants(self) -> Dict[str, Variant]:
+        """Alternative write engines for the same data, keyed by engine name."""
+        return {}
+
+
+class _FileTarget(Target):
+    suffix = ""
+
+    def start(self, workdir: Path, rows: int) -> None:
+        super().start(workdir, rows)
+        self.path = workdir / f"bench{self.suffix}"
+
+    def stored_bytes(self) -> Optional[int]:
+        return self.path.stat().st_size if self.path.exists() else None
+
+
+class CsvTarget(_FileTarget):
+    name, suffix = "csv", ".csv"
+
+    def source(self, batch_size):
+        return CsvSource(self.path)
+
+    def sink(self, batch_size):
+        return CsvSink(self.path)
+
+
+class ParquetTarget(_FileTarget):
+    name, suffix = "parquet", ".parquet"
+
+    def source(self, batch_size):
+        return ParquetSource(self.path)
+
+    def sink(self, batch_size):
+        return ParquetSink(self.path)
+
+
+class ExcelTarget(_FileTarget):
+    name, suffix = "excel", ".xlsx"
+
+    def start(self, workdir: Path, rows: int) -> None:
+        _require("fastexcel", "xlsxwriter")
+        if rows > EXCEL_MAX_ROWS:
+            raise TargetUnavailable(f"a single worksheet holds at most {EXCEL_MAX_ROWS:,} rows")
+        super().start(workdir, rows)
+
+    def source(self, batch_size):
+        return ExcelSource(self.path)
+
+    def sink(self, batch_size):
+        return ExcelSink(self.path)
+
+
+class MemoryTarget(Target):
+    name = "memory"
+
+    def start(self, workdir: Path, rows: int) -> None:
+        super().start(workdir, rows)
+        self._sink = MemorySink()
+
+    def source(self, batch_size):
+        return MemorySource(self._sink.result if self._sink.result is not None else pl.DataFrame())
+
+    def sink(self, batch_size):
+        return self._sink
+
+
+class _DatabaseTarget(Target):
+    batched = True
+    source_cls: type = None
+    sink_cls: type = None
+
+    @property
+    def query(self) -> str:
+        return f"SELECT * FROM {TABLE}"
+
+    def source(self, batch_size):
+        return self.source_cls(self.uri, self.query, batch_size=batch_size)
+
+    def sink(self, batch_size):
+        return self.sink_cls(self.uri, TABLE, if_table_exists="replace", batch_size=batch_size)
+
+    def read_variants(self):
+        return {
+            engine: (lambda e=engine: pl.read_database_uri(self.query, self.uri, engine=e))
+            for engine in ("connectorx", "adbc")
+        }
+
+    def write_variants(self):
+        return {
+            engine: (lambda df, e=engine: df.write_database(TABLE, self.write_uri, if_table_exists="replace", engine=e))
+            for engine in ("adbc", "sqlalchemy")
+        }
+
+    @property
+    def write_uri(self) -> str:
+        return self.uri
+
+
+class SQLiteTarget(_DatabaseTarget):
+    name = "sqlite"
+    source_cls, sink_cls = SQLiteSource, SQLiteSink
+
+    def start(self, workdir: Path, rows: int) -> None:
+        _require("connectorx", "adbc_driver_sqlite")
+        super().start(workdir, rows)
+        self.path = workdir / "bench.db"
+        self.uri = f"sqlite:///{self.path}"
+
+    def stored_bytes(self) -> Optional[int]:
+        return self.path.stat().st_size if self.path.exists() else None
+
+
+class PostgresTarget(_DatabaseTarget):
+    """Uses `DETL_BENCH_POSTGRES_URI` when set, otherwise a throwaway testcontainers instance."""
+    name = "postgres"
+    source_cls, sink_cls = PostgresSource, PostgresSink
+
+    def start(self, workdir: Path, rows: int) -> None:
+        _require("connectorx", "adbc_driver_postgresql")
+        super().start(workdir, rows)
+        self._container = None
+        self.uri = os.environ.get("DETL_BENCH_POSTGRES_URI")
+        if self.uri:
+            return
+        _require("testcontainers", "psycopg2")
+        from testcontainers.postgres import PostgresContainer
+        try:
+            # Same image as tests/integration so numbers line up with the integration suite
+            self._container = PostgresContainer("postgres:15-alpine").start()
+        except Exception as e:
+            raise TargetUnavailable(f"could not start Postgres container: {e}")
+        self.uri = self._container.get_connection_url().replace("postgresql+psycopg2://", "postgresql://")
+
+    def stop(self) -> None:
+        if self._container is not None:
+            self._container.stop()
+
+    def read_variants(self):
+        variants = super().read_variants()
+        # connectorx can split a scan over several connections when given a partition column
+        variants["connectorx-partitioned"] = lambda: pl.read_database_uri(
+            self.query, self.uri, engine="connectorx", partition_on="int_0", partition_num=4
+        )
+        return variants
+
+
+class MySQLTarget(_DatabaseTarget):
+    """Uses `DETL_BENCH_MYSQL_URI` when set, otherwise a throwaway testcontainers instance."""
+    name = "mysql"
+    source_cls, sink_cls = MySQLSource, MySQLSink
+
+    def start(self, workdir: Path, rows: int) -> None:
+        _require("connectorx", "pymysql", "sqlalchemy")
+        super().start(workdir, rows)
+        self._container = None
+        self.uri = os.environ.get("DETL_BENCH_MYSQL_URI")
+        if self.uri:
+            return
+        _require("testcontainers")
+        from testcontainers.mysql import MySqlContainer
+        try:
+            self._container = MySqlContainer("mysql:8.0").start()
+        except Exception as e:
+            raise TargetUnavailable(f"could not start MySQL container: {e}")
+        self.uri = self._container.get_connection_url().replace("mysql+pymysql://", "mysql://")
+
+    def stop(self) -> None:
+        if self._container is not None:
+            self._container.stop()
+
+    @property
+    def write_uri(self) -> str:
+        return self.uri.replace("mysql://", "mysql+pymysql://")
+
+    def read_variants(self):
+        return {"connectorx": lambda: pl.read_database_uri(self.query, self.uri, engine="connectorx")}
+
+    def write_variants(self):
+        return {"sqlalchemy": lambda df: df.write_database(TABLE, self.write_uri, if_table_exists="replace", engine="sqlalchemy")}
+
+
+class S3Target(Target):
+    """Targets `DETL_BENCH_S3_ENDPOINT` (e.g. MinIO) when set, otherwise an in-process moto mock."""
+    fmt = "parquet"
+
+    def __init__(self, fmt: str = "parquet"):
+        self.fmt = fmt
+        self.name = f"s3-{fmt}"
+
+    def start(self, workdir: Path, rows: int) -> None:
+        _require("boto3")
+        super().start(workdir, rows)
+        self._mock = None
+        self.endpoint_url = os.environ.get("DETL_BENCH_S3_ENDPOINT")
+        if not self.endpoint_url:
+            _require("moto")
+            from moto import mock_aws
+            os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+            os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+            os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+            self._mock = mock_aws()
+            self._mock.start()
+
+        import boto3
+        client = boto3.client("s3", endpoint_url=self.endpoint_url)
+        try:
+            client.create_bucket(Bucket=BUCKET)
+        except client.exceptions.BucketAlreadyOwnedByYou:
+            pass
+        self._client = client
+        self.uri = f"s3://{BUCKET}/bench.{self.fmt}"
+
+    def stop(self) -> None:
+        if self._mock is not None:
+            self._mock.stop()
+
+    def source(self, batch_size):
+        return S3Source(self.uri, format=self.fmt, endpoint_url=self.endpoint_url)
+
+    def sink(self, batch_size):
+        return S3Sink(self.uri, format=self.fmt, endpoint_url=self.endpoint_url)
+
+    def stored_bytes(self) -> Optional[int]:
+        try:
+            return self._client.head_object(Bucket=BUCKET, Key=f"bench.{self.fmt}")["ContentLength"]
+        except Exception:
+            return None
+
+
+def all_targets() -> Dict[str, Target]:
+    targets = [
+        MemoryTarget(), CsvTarget(), ParquetTarget(), ExcelTarget(),
+        SQLiteTarget(), PostgresTarget(), MySQLTarget(),
+        S3Target("parquet"), S3Target("csv"),
+    ]
+    return {t.name: t for t in targets}
@@ -0,0 +1,75 @@
+"""End-to-end benchmarks running full Data Contracts through `Processor`."""
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import polars as pl
+
+from benchmarks.datagen import DATE_FORMATS, DATETIME_FORMAT, VOCAB, generate, kitchen_sink_frame
+from detl.config import Config
+from detl.connectors.memory import MemorySource
+from detl.core import Processor
+
+Case = Tuple[str, str, Callable[[], object]]
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+SYNTHETIC_CONTRACT = {
+    "conf": {"undefined_columns": "drop", "on_duplicate_rows": {"tactic": "drop_extras", "subset": ["int_0", "string_2"]}},
+    "columns": {
+        "int_0": {
+            "dtype": "int",
+            "on_null": {"tactic": "fill_median"},
+            "constraints": {"min_policy": {"threshold": 0, "violate_action": {"tactic": "drop_row"}}},
+        },
+        "float_1": {
+            "dtype": "float",
+            "on_null": {"tactic": "fill_mean"},
+            "constraints": {"max_policy": {"threshold": 1e6, "violate_action": {"tactic": "fill_max"}}},
+        },
+        "string_2": {
+            "dtype": "string",
+            "trim": True,
+            "on_null": {"tactic": "fill_value", "value": "unknown"},
+            "constraints": {
+                "allowed_values": {"values": VOCAB + ["unknown"], "violate_action": {"tactic": "fill_value", "value": "unknown"}},
+            },
+        },
+        "boolean_3": {"dtype": "boolean"},
+        "date_4": {
+            "dtype": "date",
+            "format": {"input": DATE_FORMATS["iso"], "output": DATE_FORMATS["iso"]},
+            "on_null": {"tactic": "fill_min"},
+        },
+        "datetime_5": {
+            "dtype": "datetime",
+            "format": {"input": DATETIME_FORMAT, "output": DATETIME_FORMAT},
+            "on_null": {"tactic": "drop_row"},
+        },
+    },
+    "pipeline": [
+        {"filter": "int_0 > 10"},
+        {"mutate": {"float_scaled": "float_1 / 1000"}},
+        {"sort": {"by": "float_1", "order": "desc"}},
+    ],
+}
+
+
+def _contract_case(config: Config, frame: pl.DataFrame) -> Callable[[], object]:
+    def run() -> pl.DataFrame:
+        out = Processor(config).execute(MemorySource(frame.lazy()))
+        return out.collect() if isinstance(out, pl.LazyFrame) else out
+    return run
+
+
+def cases(rows: int, seed: int = 42, null_rate: float = 0.05, dirty_rate: float = 0.01) -> List[Case]:
+    """Builds end-to-end benchmarks for the bundled example contracts and a synthetic all-types contract."""
+    return [
+        ("kitchen_sink", "contracts", _contract_case(
+            Config(EXAMPLES_DIR / "03_kitchen_sink.yml"),
+            kitchen_sink_frame(rows, null_rate=null_rate, dirty_rate=dirty_rate, seed=seed),
+        )),
+        ("synthetic_all_types", "contracts", _contract_case(
+            Config(SYNTHETIC_CONTRACT),
+            generate(rows, seed=seed, null_rate=null_rate, dirty_rate=dirty_rate),
+        )),
+    ]
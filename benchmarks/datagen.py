@@ -0,0 +1,167 @@
+import numpy as np
+import polars as pl
+
+COLUMN_KINDS = ("int", "float", "string", "boolean", "date", "datetime")
+STRING_SHAPES = ("word", "email", "code", "text")
+DATE_SHAPES = ("iso", "european", "mixed")
+
+DATE_FORMATS = {
+    "iso": "%Y-%m-%d",
+    "european": "%d/%m/%Y",
+}
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+VOCAB = [
+    "alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+    "india", "juliet", "kilo", "lima", "mike", "november", "oscar", "papa",
+    "quebec", "romeo", "sierra", "tango", "uniform", "victor", "whiskey", "xray",
+    "yankee", "zulu", "amber", "basalt", "cobalt", "dune", "ember", "fjord",
+]
+DOMAINS = ["example.com", "test.org", "mail.net", "corp.io"]
+LETTERS = [chr(c) for c in range(ord("A"), ord("Z") + 1)]
+COUNTRIES = ["US", "DE", "FR", "GB", "JP", "BR", "IN", "CA", "AU", "ES"]
+ROLES = ["admin", "user", "guest"]
+DIRTY_ROLES = ["Admin1", "USER", "root", ""]
+
+# 2000-01-01 as days / microseconds since the unix epoch
+_EPOCH_2000_DAYS = 10957
+_EPOCH_2000_US = _EPOCH_2000_DAYS * 86_400 * 1_000_000
+
+
+def _rng(seed: int, *stream: int) -> np.random.Generator:
+    """Independent generator per column so adding columns never reshuffles existing ones."""
+    return np.random.default_rng([seed, *stream])
+
+
+def _mask(rng: np.random.Generator, rows: int, rate: float) -> pl.Series:
+    return pl.Series(rng.random(rows) < rate) if rate > 0 else pl.Series(np.zeros(rows, dtype=bool))
+
+
+def _pick(rng: np.random.Generator, rows: int, choices: list[str]) -> pl.Series:
+    idx = pl.Series(rng.integers(0, len(choices), rows, dtype=np.uint32))
+    return pl.Series(choices).gather(idx)
+
+
+def _overlay(clean: pl.Series, dirty: pl.Series, mask: pl.Series) -> pl.Series:
+    return pl.select(pl.when(mask).then(dirty).otherwise(clean).alias(clean.name)).to_series()
+
+
+def _with_nulls(series: pl.Series, mask: pl.Series) -> pl.Series:
+    return pl.select(pl.when(mask).then(None).otherwise(series).alias(series.name)).to_series()
+
+
+def _strings(rng: np.random.Generator, rows: int, shape: str) -> pl.Series:
+    if shape == "word":
+        return _pick(rng, rows, VOCAB)
+    if shape == "email":
+        number = pl.Series(rng.integers(0, 10_000, rows))
+        return pl.select(
+            pl.concat_str([_pick(rng, rows, VOCAB), number.cast(pl.Utf8), pl.lit("@"), _pick(rng, rows, DOMAINS)])
+        ).to_series()
+    if shape == "code":
+        number = pl.Series(rng.integers(1000, 10_000, rows))
+        return pl.select(
+            pl.concat_str([_pick(rng, rows, LETTERS), _pick(rng, rows, LETTERS), pl.lit("-"), number.cast(pl.Utf8)])
+        ).to_series()
+    if shape == "text":
+        words = [_pick(rng, rows, VOCAB) for _ in range(6)]
+        return pl.select(pl.concat_str(words, separator=" ")).to_series()
+    raise ValueError(f"Unknown string shape '{shape}'. Expected one of {STRING_SHAPES}.")
+
+
+def _dates(rng: np.random.Generator, rows: int, shape: str) -> pl.Series:
+    days = pl.Series(rng.integers(0, 9000, rows) + _EPOCH_2000_DAYS, dtype=pl.Int32).cast(pl.Date)
+    if shape in DATE_FORMATS:
+        return days.dt.to_string(DATE_FORMATS[shape])
+    if shape == "mixed":
+        european = _mask(rng, rows, 0.5)
+        return _overlay(days.dt.to_string(DATE_FORMATS["iso"]), days.dt.to_string(DATE_FORMATS["european"]), european)
+    raise ValueError(f"Unknown date shape '{shape}'. Expected one of {DATE_SHAPES}.")
+
+
+def _column(kind: str, rows: int, rng: np.random.Generator, dirty_rate: float, string_shape: str, date_shape: str) -> pl.Series:
+    dirty = _mask(rng, rows, dirty_rate)
+    if kind == "int":
+        clean = pl.Series(rng.integers(0, 1000, rows))
+        return _overlay(clean, pl.Series(-rng.integers(1, 1000, rows)), dirty)
+    if kind == "float":
+        clean = pl.Series(rng.normal(50_000.0, 15_000.0, rows))
+        return _overlay(clean, pl.Series(rng.uniform(1e9, 1e10, rows)), dirty)
+    if kind == "string":
+        clean = _strings(rng, rows, string_shape)
+        padded = pl.select(pl.concat_str([pl.lit("  "), clean.str.to_uppercase(), pl.lit(" ")])).to_series()
+        return _overlay(clean, padded, dirty)
+    if kind == "boolean":
+        return pl.Series(rng.random(rows) < 0.5)
+    if kind == "date":
+        return _overlay(_dates(rng, rows, date_shape), _pick(rng, rows, ["N/A", "2024-13-45", "unknown"]), dirty)
+    if kind == "datetime":
+        micros = pl.Series(rng.integers(0, 9000 * 86_400, rows) * 1_000_000 + _EPOCH_2000_US)
+        clean = micros.cast(pl.Datetime("us")).dt.to_string(DATETIME_FORMAT)
+        return _overlay(clean, _pick(rng, rows, ["N/A", "2024-02-30 25:61:00"]), dirty)
+    raise ValueError(f"Unknown column kind '{kind}'. Expected one of {COLUMN_KINDS}.")
+
+
+def generate(
+    rows: int,
+    columns: int = len(COLUMN_KINDS),
+    null_rate: float = 0.05,
+    dirty_rate: float = 0.01,
+    seed: int = 42,
+    string_shape: str = "word",
+    date_shape: str = "iso",
+) -> pl.DataFrame:
+    """Builds a reproducible raw dataset with a configurable share of nulls and dirty values.
+
+    Column kinds cycle through `COLUMN_KINDS` and are named `<kind>_<index>`. Temporal columns are
+    emitted as strings (shaped by `date_shape`) so that parsing cost is part of every benchmark.
+
+    Args:
+        rows (int): Number of rows to generate.
+        columns (int): Number of columns. Defaults to one of each kind.
+        null_rate (float): Probability that any cell (except booleans) is null.
+        dirty_rate (float): Probability that a cell holds an out-of-range or malformed value.
+        seed (int): Seed for the numpy generator; identical arguments yield identical frames.
+        string_shape (str): One of `STRING_SHAPES`.
+        date_shape (str): One of `DATE_SHAPES`.
+
+    Returns:
+        pl.DataFrame: The synthetic frame.
+    """
+    if rows < 0 or columns < 1:
+        raise ValueError("rows must be >= 0 and columns must be >= 1.")
+
+    series = []
+    for idx in range(columns):
+        kind = COLUMN_KINDS[idx % len(COLUMN_KINDS)]
+        rng = _rng(seed, idx)
+        col = _column(kind, rows, rng, dirty_rate, string_shape, date_shape).alias(f"{kind}_{idx}")
+        if kind != "boolean":
+            col = _with_nulls(col, _mask(rng, rows, null_rate))
+        series.append(col)
+    return pl.DataFrame(series)
+
+
+def kitchen_sink_frame(rows: int, null_rate: float = 0.05, dirty_rate: float = 0.01, seed: int = 42) -> pl.DataFrame:
+    """Builds a frame matching the column layout of `examples/03_kitchen_sink.yml`."""
+    rng = _rng(seed, 10_000)
+
+    user_id = pl.Series(np.arange(1, rows + 1, dtype=np.int64))
+    # Dirty ids are either corrupt (negative) or re-used, which exercises drop_row and dedup
+    reused = pl.Series(rng.integers(1, max(rows, 1) + 1, rows))
+    user_id = _overlay(user_id, reused, _mask(rng, rows, dirty_rate))
+    user_id = _overlay(user_id, -user_id, _mask(rng, rows, dirty_rate))
+
+    name = _overlay(_pick(rng, rows, VOCAB), _pick(rng, rows, LETTERS), _mask(rng, rows, dirty_rate))
+    age = _overlay(pl.Series(rng.integers(18, 99, rows)), pl.Series(rng.integers(1, 130, rows)), _mask(rng, rows, dirty_rate * 5))
+    salary = pl.Series(rng.normal(90_000.0, 40_000.0, rows)).abs()
+    role = _overlay(_pick(rng, rows, ROLES), _pick(rng, rows, DIRTY_ROLES), _mask(rng, rows, dirty_rate))
+
+    return pl.DataFrame([
+        user_id.alias("user_id"),
+        name.alias("name"),
+        _with_nulls(age.alias("age"), _mask(rng, rows, null_rate)),
+        _with_nulls(_pick(rng, rows, COUNTRIES).alias("country"), _mask(rng, rows, null_rate)),
+        _with_nulls(salary.alias("salary"), _mask(rng, rows, null_rate)),
+        role.alias("role"),
+    ])
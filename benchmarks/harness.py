@@ -0,0 +1,125 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import polars as pl
+from pydantic import BaseModel, Field
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+class BenchmarkResult(BaseModel):
+    name: str
+    group: str
+    rows: int
+    timings: List[float]
+    bytes: Optional[int] = None
+    peak_memory: Optional[int] = None
+
+    @property
+    def best(self) -> float:
+        return min(self.timings)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.best if self.best > 0 else float("inf")
+
+    @property
+    def mb_per_sec(self) -> Optional[float]:
+        if self.bytes is None or self.best <= 0:
+            return None
+        return self.bytes / 1e6 / self.best
+
+    @property
+    def key(self) -> str:
+        return f"{self.group}/{self.name}@{self.rows}"
+
+
+class BenchmarkRun(BaseModel):
+    commit: str = "unknown"
+    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    python: str = Field(default_factory=platform.python_version)
+    polars: str = pl.__version__
+    machine: str = Field(default_factory=platform.platform)
+    results: List[BenchmarkResult] = Field(default_factory=list)
+
+
+class Comparison(BaseModel):
+    key: str
+    base: float
+    head: float
+
+    @property
+    def ratio(self) -> float:
+        return self.head / self.base if self.base > 0 else float("inf")
+
+
+def git_commit(short: bool = True) -> str:
+    """Returns the current HEAD sha, or 'unknown' outside of a git checkout."""
+    cmd = ["git", "rev-parse", "--short" if short else "--verify", "HEAD"]
+    try:
+        return subprocess.run(cmd, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def time_it(fn: Callable[[], object], repeats: int = 3, warmup: int = 1) -> List[float]:
+    """Wall-clock timings in seconds of `repeats` calls to `fn` after `warmup` untimed calls."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def save_run(run: BenchmarkRun, directory: Path = RESULTS_DIR) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = run.created_at.replace(":", "").replace("-", "")
+    path = directory / f"{run.commit}-{stamp}.json"
+    path.write_text(run.model_dump_json(indent=2), encoding="utf-8")
+    return path
+
+
+def load_run(ref: str | Path, directory: Path = RESULTS_DIR) -> BenchmarkRun:
+    """Loads a run from a JSON path, or the newest stored run recorded for a commit sha."""
+    path = Path(ref)
+    if not path.exists():
+        matches = sorted(directory.glob(f"{ref}*.json"))
+        if not matches:
+            raise FileNotFoundError(f"No benchmark results found for '{ref}' in '{directory}'.")
+        path = matches[-1]
+    return BenchmarkRun.model_validate(json.loads(path.read_text(encoding="utf-8")))
+
+
+def compare(base: BenchmarkRun, head: BenchmarkRun, threshold: float = 0.10) -> tuple[List[Comparison], List[Comparison]]:
+    """Pairs results present in both runs by key and compares their best timings.
+
+    Returns:
+        tuple: (all comparisons, regressions whose head time exceeds base by more than `threshold`).
+    """
+    base_by_key = {r.key: r for r in base.results}
+    rows = [
+        Comparison(key=r.key, base=base_by_key[r.key].best, head=r.best)
+        for r in head.results if r.key in base_by_key
+    ]
+    regressions = [c for c in rows if c.ratio > 1 + threshold]
+    return rows, regressions
+
+
+def run_case(name: str, group: str, rows: int, fn: Callable[[], object], repeats: int, warmup: int, on_result: Optional[Callable[[BenchmarkResult], None]] = None) -> BenchmarkResult:
+    result = BenchmarkResult(name=name, group=group, rows=rows, timings=time_it(fn, repeats=repeats, warmup=warmup))
+    if on_result:
+        on_result(result)
+    return result
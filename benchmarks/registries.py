@@ -0,0 +1,157 @@
+"""Micro-benchmarks covering every handler registered in the `detl.engine` registries."""
+from typing import Callable, Dict, List, Tuple
+
+import polars as pl
+
+from benchmarks.datagen import VOCAB, DATE_FORMATS, DATETIME_FORMAT, generate
+from detl.engine.actions import ACTION_REGISTRY
+from detl.engine.constraints import CONSTRAINT_REGISTRY
+from detl.engine.nulls import NULL_REGISTRY
+from detl.engine.pipeline import PIPELINE_REGISTRY
+from detl.engine.types import TYPE_REGISTRY
+from detl.schema import ColumnDef
+from detl.schema.common import NumericViolateAction
+from detl.schema.constraints import ConstraintsDef
+
+Case = Tuple[str, str, Callable[[], object]]
+
+INT, FLOAT, STRING, BOOL, DATE, DATETIME = "int_0", "float_1", "string_2", "boolean_3", "date_4", "datetime_5"
+
+
+def _key(name) -> str:
+    return str(getattr(name, "value", name))
+
+
+def _column(spec: dict) -> ColumnDef:
+    return ColumnDef.model_validate(spec)
+
+
+def _mixed_dates(iso: pl.Expr) -> pl.Expr:
+    parsed = iso.str.strptime(pl.Date, DATE_FORMATS["iso"], strict=False)
+    european = parsed.dt.to_string(DATE_FORMATS["european"])
+    return pl.when(pl.int_range(pl.len()) % 2 == 0).then(iso).otherwise(european)
+
+
+def _type_cases(raw: pl.LazyFrame) -> Dict[str, Callable[[], object]]:
+    # Numeric columns are re-typed from text, which is what CSV and Excel feeds hand us
+    text = raw.with_columns(
+        pl.col(INT, FLOAT).cast(pl.Utf8),
+        _mixed_dates(pl.col(DATE)).alias("date_mixed"),
+        pl.col(DATETIME).str.strptime(pl.Datetime, DATETIME_FORMAT, strict=False).alias("datetime_typed"),
+    ).collect().lazy()  # Each case then only pays for its own handler, not for deriving these columns
+    defs = {
+        "string": (STRING, _column({"dtype": "string", "trim": True})),
+        "int": (INT, _column({"dtype": "int"})),
+        "float": (FLOAT, _column({"dtype": "float"})),
+        "boolean": (BOOL, _column({"dtype": "boolean"})),
+        "date": (DATE, _column({"dtype": "date", "format": {"input": DATE_FORMATS["iso"], "output": DATE_FORMATS["iso"]}})),
+        "datetime": (DATETIME, _column({"dtype": "datetime", "format": {"input": DATETIME_FORMAT, "output": DATETIME_FORMAT}})),
+        # Half ISO, half European dates, parsed in one pass
+        "date_mixed": ("date_mixed", _column({"dtype": "date", "format": {"input": list(DATE_FORMATS.values()), "output": DATE_FORMATS["iso"]}})),
+        # Already a Datetime, as read from Parquet: nothing left to parse
+        "datetime_typed": ("datetime_typed", _column({"dtype": "datetime", "format": {"input": DATETIME_FORMAT, "output": DATETIME_FORMAT}})),
+        "category": (STRING, _column({"dtype": "category"})),
+        "enum": (STRING, _column({"dtype": "enum", "constraints": {"allowed_values": {"values": VOCAB, "violate_action": {"tactic": "drop_row"}}}})),
+        "float32": (FLOAT, _column({"dtype": "float32"})),
+    }
+    for name in ("int8", "int16", "int32", "uint8", "uint16", "uint32", "uint64"):
+        defs[name] = (INT, _column({"dtype": name}))
+    return {
+        name: (lambda h=TYPE_REGISTRY[col_def.dtype], c=col, d=col_def: h(text, c, d).collect())
+        for name, (col, col_def) in defs.items()
+    }
+
+
+def _null_cases(lf: pl.LazyFrame) -> Dict[str, Callable[[], object]]:
+    defs = {
+        "drop_row": (INT, {"dtype": "int", "on_null": {"tactic": "drop_row"}}),
+        # Booleans never contain nulls, so 'fail' scans the column without raising
+        "fail": (BOOL, {"dtype": "boolean", "on_null": {"tactic": "fail"}}),
+        "fill_value": (INT, {"dtype": "int", "on_null": {"tactic": "fill_value", "value": 0}}),
+        "fill_mean": (FLOAT, {"dtype": "float", "on_null": {"tactic": "fill_mean"}}),
+        "fill_median": (FLOAT, {"dtype": "float", "on_null": {"tactic": "fill_median"}}),
+        "fill_max": (INT, {"dtype": "int", "on_null": {"tactic": "fill_max"}}),
+        "fill_min": (INT, {"dtype": "int", "on_null": {"tactic": "fill_min"}}),
+        "fill_most_frequent": (STRING, {"dtype": "string", "on_null": {"tactic": "fill_most_frequent"}}),
+        "ffill": (INT, {"dtype": "int", "on_null": {"tactic": "ffill"}}),
+        "bfill": (INT, {"dtype": "int", "on_null": {"tactic": "bfill"}}),
+    }
+    return {
+        name: (lambda h=NULL_REGISTRY[name], c=col, d=_column(spec): h(lf, c, d).collect())
+        for name, (col, spec) in defs.items()
+    }
+
+
+def _constraint_cases(lf: pl.LazyFrame) -> Dict[str, Callable[[], object]]:
+    drop = {"tactic": "drop_row"}
+    defs = {
+        "unique": (INT, {"unique": {"tactic": "drop_extras"}}),
+        "min_policy": (INT, {"min_policy": {"threshold": 0, "violate_action": drop}}),
+        "max_policy": (INT, {"max_policy": {"threshold": 900, "violate_action": drop}}),
+        "min_length": (STRING, {"min_length": {"length": 5, "violate_action": drop}}),
+        "max_length": (STRING, {"max_length": {"length": 7, "violate_action": drop}}),
+        "allowed_values": (STRING, {"allowed_values": {"values": VOCAB[:16], "violate_action": drop}}),
+        "regex": (STRING, {"regex": {"pattern": "^[a-z]+$", "violate_action": drop}}),
+        # Anchored literals skip the regex engine; a pattern list is matched in one pass
+        "regex_literal": (STRING, {"regex": {"pattern": ["^alpha", "ray$", "^golf$"], "violate_action": drop}}),
+        "regex_list": (STRING, {"regex": {"pattern": ["^[a-d][a-z]+$", "^[w-z][a-z]+$"], "violate_action": drop}}),
+        "custom_expr": (INT, {"custom_expr": {"expr": f"{INT} > 10", "violate_action": drop}}),
+    }
+    cases = {}
+    for name, (col, spec) in defs.items():
+        (field,) = spec
+        policy = getattr(ConstraintsDef.model_validate(spec), field)
+        cases[name] = lambda h=CONSTRAINT_REGISTRY[field], c=col, p=policy: h(lf, c, p).collect()
+    return cases
+
+
+def _action_cases(lf: pl.LazyFrame) -> Dict[str, Callable[[], object]]:
+    mask = pl.col(INT) < 100
+    cases = {}
+    for name in ("drop_row", "fill_max", "fill_min", "fill_mean", "fill_median"):
+        action = NumericViolateAction(tactic=name)
+        cases[name] = lambda h=ACTION_REGISTRY[name], a=action: h(lf, INT, mask, a).collect()
+    fill = NumericViolateAction(tactic="fill_value", value=100)
+    cases["fill_value"] = lambda: ACTION_REGISTRY["fill_value"](lf, INT, mask, fill).collect()
+    # A mask that never trips keeps 'fail' measuring the full scan instead of the exception path
+    never = pl.col(INT) > 10**12
+    fail = NumericViolateAction(tactic="fail")
+    cases["fail"] = lambda: ACTION_REGISTRY["fail"](lf, INT, never, fail).collect()
+    return cases
+
+
+def _pipeline_cases(lf: pl.LazyFrame) -> Dict[str, Callable[[], object]]:
+    configs = {
+        "mutate": {"doubled": f"{INT} * 2", "ratio": f"{FLOAT} / 100"},
+        "filter": f"{INT} > 500",
+        "rename": {INT: "renamed"},
+        "sort": {"by": FLOAT, "order": "desc"},
+    }
+    return {
+        name: (lambda h=PIPELINE_REGISTRY[name], cfg=config: h(lf, cfg).collect())
+        for name, config in configs.items()
+    }
+
+
+def _checked(group: str, registry: dict, cases: Dict[str, Callable[[], object]]) -> List[Case]:
+    missing = {_key(k) for k in registry} - set(cases)
+    if missing:
+        raise RuntimeError(f"Registry '{group}' has handlers without a benchmark case: {sorted(missing)}")
+    return [(name, group, fn) for name, fn in cases.items()]
+
+
+def cases(rows: int, seed: int = 42, null_rate: float = 0.05, dirty_rate: float = 0.01) -> List[Case]:
+    """Builds one benchmark per registered handler over a shared synthetic frame of `rows` rows."""
+    raw = generate(rows, seed=seed, null_rate=null_rate, dirty_rate=dirty_rate).lazy()
+    typed = raw.with_columns(
+        pl.col(DATE).str.strptime(pl.Date, DATE_FORMATS["iso"], strict=False),
+        pl.col(DATETIME).str.strptime(pl.Datetime, DATETIME_FORMAT, strict=False),
+    ).collect().lazy()
+
+    return [
+        *_checked("types", TYPE_REGISTRY, _type_cases(raw)),
+        *_checked("nulls", NULL_REGISTRY, _null_cases(typed)),
+        *_checked("constraints", CONSTRAINT_REGISTRY, _constraint_cases(typed)),
+        *_checked("actions", ACTION_REGISTRY, _action_cases(typed)),
+        *_checked("pipeline", PIPELINE_REGISTRY, _pipeline_cases(typed)),
+    ]
@@ -0,0 +1,83 @@
+"""Wide-table benchmarks: one contract rule set repeated across thousands of columns.
+
+These measure how planning and execution scale with the column count rather than the row count, so rows are
+capped at `MAX_ROWS` whatever `--rows` asks for. Comparing the cases of one run shows whether the cost per
+column stays flat.
+"""
+from typing import Callable, List, Sequence, Tuple
+
+import polars as pl
+
+from benchmarks.datagen import VOCAB, generate
+from detl.config import Config
+from detl.connectors.memory import MemorySource
+from detl.core import Processor
+
+Case = Tuple[str, str, Callable[[], object]]
+
+COLUMN_COUNTS = [1_000, 2_500, 5_000, 10_000]
+MAX_ROWS = 1_000
+
+# Every column kind mixes a cast, a null tactic and constraints that drop, fill and fail
+RULES = {
+    "float": {
+        "dtype": "float",
+        "on_null": {"tactic": "fill_value", "value": 0.0},
+        "constraints": {
+            "min_policy": {"threshold": -1e9, "violate_action": {"tactic": "drop_row"}},
+            "max_policy": {"threshold": 1e6, "violate_action": {"tactic": "fill_value", "value": 1e6}},
+        },
+    },
+    "int": {
+        "dtype": "int",
+        "on_null": {"tactic": "fill_value", "value": 0},
+        "constraints": {"max_policy": {"threshold": 2**62, "violate_action": {"tactic": "fail"}}},
+    },
+    "string": {
+        "dtype": "string",
+        "trim": True,
+        "on_null": {"tactic": "fill_value", "value": "unknown"},
+        "constraints": {"allowed_values": {"values": VOCAB + ["unknown"], "violate_action": {"tactic": "fill_value", "value": "unknown"}}},
+    },
+}
+
+
+def wide_frame(rows: int, columns: int, seed: int = 42, null_rate: float = 0.05, dirty_rate: float = 0.01) -> pl.DataFrame:
+    """A `columns`-wide text frame cycling through the float, int and string columns of `generate`."""
+    base = generate(rows, seed=seed, null_rate=null_rate, dirty_rate=dirty_rate).select(
+        pl.col("float_1").cast(pl.Utf8).alias("float"),
+        pl.col("int_0").cast(pl.Utf8).alias("int"),
+        pl.col("string_2").alias("string"),
+    )
+    kinds = list(RULES)
+    return pl.DataFrame([base[kinds[i % len(kinds)]].alias(f"c{i}") for i in range(columns)])
+
+
+def wide_contract(columns: int) -> dict:
+    kinds = list(RULES)
+    return {"columns": {f"c{i}": RULES[kinds[i % len(kinds)]] for i in range(columns)}}
+
+
+def _wide_case(columns: int, frame: pl.DataFrame) -> Callable[[], object]:
+    contract = wide_contract(columns)
+
+    def run() -> pl.DataFrame:
+        # Parsing the contract is part of the cost of a wide table
+        out = Processor(Config(contract)).execute(MemorySource(frame.lazy()))
+        return out.collect() if isinstance(out, pl.LazyFrame) else out
+    return run
+
+
+def cases(
+    rows: int,
+    seed: int = 42,
+    null_rate: float = 0.05,
+    dirty_rate: float = 0.01,
+    columns: Sequence[int] = COLUMN_COUNTS,
+) -> List[Case]:
+    """Builds one end-to-end case per column count."""
+    rows = min(rows, MAX_ROWS)
+    return [
+        (f"{n}_columns", "wide", _wide_case(n, wide_frame(rows, n, seed=seed, null_rate=null_rate, dirty_rate=dirty_rate)))
+        for n in columns
+    ]
@@ -0,0 +1,191 @@
+import copy
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import yaml
+from pydantic import BaseModel, ValidationError
+
+from detl.config import Config
+from detl.connectors.database.pool import POOL, configure_pool
+from detl.connectors.factory import make_source, make_sink
+from detl.core import Processor
+from detl.exceptions import ConfigError
+from detl.schema.batch import BatchDef, ConnectorDef, JobDef
+
+class JobResult(BaseModel):
+    name: str
+    ok: bool
+    seconds: float = 0.0
+    error: Optional[str] = None
+    pid: Optional[int] = None
+    threads: Optional[int] = None
+    # Database connections the job opened; jobs run by one worker share its connection pool
+    connects: int = 0
+
+# Contracts compiled once in the parent and installed into every worker by `_init_worker`
+_CONTRACTS: Dict[str, Config] = {}
+
+def load_batch(path: Union[str, Path]) -> BatchDef:
+    """Parses a jobs file. Relative contract and file paths are resolved against the jobs file's directory."""
+    path = Path(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        raise ConfigError(f"Failed to parse YAML syntax in '{path}': {e}")
+    if not isinstance(data, dict):
+        raise ConfigError(f"Jobs file '{path}' must resolve to a mapping with a 'jobs' list.")
+    try:
+        batch = BatchDef.model_validate(data)
+    except ValidationError as e:
+        raise ConfigError(f"Invalid jobs file '{path}':\n{e}")
+
+    base = path.parent
+    for job in batch.jobs:
+        job.config = _resolve(base, job.config)
+        for connector in (job.source, job.sink):
+            if connector.is_file:
+                connector.uri = str(_resolve(base, Path(connector.uri)))
+    return batch
+
+def plan_workers(job_count: int, max_workers: int | None = None, threads_per_worker: int | None = None) -> tuple[int, int]:
+    """Splits the machine between worker processes so that workers x Polars threads never exceeds the core count.
+
+    Returns:
+        tuple: (worker processes, Polars threads per worker).
+    """
+    cores = os.cpu_count() or 1
+    workers = max(1, min(max_workers or cores, job_count))
+    threads = threads_per_worker or max(1, cores // workers)
+    return workers, threads
+
+def run_many(
+    jobs: Union[BatchDef, Iterable[Union[JobDef, Dict[str, Any]]]],
+    max_workers: int | None = None,
+    threads_per_worker: int | None = None,
+    on_result: Callable[[JobResult], None] | None = None,
+    pool_size: int | None = None,
+) -> List[JobResult]:
+    """Runs many contract/source/sink jobs across a pool of worker processes.
+
+    Higher `priority` jobs are dispatched first. Each worker's Polars thread pool is capped so the
+    pool as a whole saturates the machine without oversubscribing it. Contracts are parsed and
+    validated once up front and shared with the workers. A failing job does not stop the others.
+
+    Args:
+        jobs: A parsed jobs file or an iterable of job specifications.
+        max_workers: Concurrent worker processes. Defaults to the jobs file setting, else one per core.
+        threads_per_worker: Polars threads per worker. Defaults to the jobs file setting, else cores / workers.
+        on_result: Called with each JobResult as soon as its job finishes.
+        pool_size: Database connections each worker keeps open per database. Defaults to the jobs file setting.
+
+    Returns:
+        List[JobResult]: One result per job, in dispatch order.
+    """
+    if isinstance(jobs, BatchDef):
+        max_workers = max_workers or jobs.max_workers
+        threads_per_worker = threads_per_worker or jobs.threads_per_worker
+        pool_size = pool_size or jobs.pool_size
+        jobs = jobs.jobs
+    jobs = [j if isinstance(j, JobDef) else JobDef.model_validate(j) for j in jobs]
+    jobs = sorted(jobs, key=lambda j: -j.priority)
+    if not jobs:
+        return []
+
+    results: Dict[str, JobResult] = {}
+    contracts: Dict[str, Config] = {}
+    broken: Dict[str, str] = {}
+    runnable = []
+    for job in jobs:
+        key = str(job.config)
+        if key not in contracts and key not in broken:
+            try:
+                contracts[key] = Config(job.config)
+            except (OSError, ConfigError) as e:
+                broken[key] = f"{type(e).__name__}: {e}"
+        if key in broken:
+            results[job.name] = JobResult(name=job.name, ok=False, error=broken[key])
+            if on_result:
+                on_result(results[job.name])
+        else:
+            runnable.append(job)
+
+    if runnable:
+        workers, threads = plan_workers(len(runnable), max_workers, threads_per_worker)
+        # Spawned workers inherit the environment, so the Polars thread cap is in place before polars is imported there
+        with _environ(POLARS_MAX_THREADS=str(threads)):
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(contracts, pool_size)) as pool:
+                futures = {pool.submit(_run_job, job): job for job in runnable}
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The worker itself died (e.g. killed by the OOM killer); the job still gets a result
+                        result = JobResult(name=job.name, ok=False, error=f"{type(e).__name__}: {e}")
+                    results[job.name] = result
+                    if on_result:
+                        on_result(result)
+
+    return [results[job.name] for job in jobs]
+
+def _init_worker(contracts: Dict[str, Config], pool_size: int | None = None) -> None:
+    _CONTRACTS.update(contracts)
+    if pool_size:
+        configure_pool(size=pool_size)
+
+def _connects() -> int:
+    return sum(m.connects for m in POOL.metrics().values())
+
+def _run_job(job: JobDef) -> JobResult:
+    import polars as pl
+
+    start = time.perf_counter()
+    result = JobResult(name=job.name, ok=True, pid=os.getpid(), threads=pl.thread_pool_size())
+    connects = _connects()
+    try:
+        # The Processor hydrates defaults and inferred columns into the manifest, so every job gets its own copy
+        config = copy.deepcopy(_CONTRACTS[str(job.config)])
+        Processor(config, max_memory=job.max_memory).execute(_build_source(job.source), _build_sink(job.sink))
+    except Exception as e:
+        result.ok = False
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - start
+    result.connects = _connects() - connects
+    return result
+
+def _build_source(spec: ConnectorDef):
+    return make_source(spec.type, spec.uri, query=spec.query, batch_size=spec.batch_size, format=spec.format, endpoint_url=spec.endpoint_url)
+
+def _build_sink(spec: ConnectorDef):
+    return make_sink(
+        spec.type, spec.uri,
+        table=spec.table,
+        if_table_exists=spec.if_table_exists,
+        batch_size=spec.batch_size,
+        format=spec.format,
+        endpoint_url=spec.endpoint_url,
+        key_columns=spec.key_columns,
+    )
+
+def _resolve(base: Path, path: Path) -> Path:
+    return path if path.is_absolute() else base / path
+
+@contextmanager
+def _environ(**values: str) -> Iterator[None]:
+    previous = {k: os.environ.get(k) for k in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for k, v in previous.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
@@ -0,0 +1,185 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterator, List
+
+import polars as pl
+from pydantic import BaseModel
+
+from detl.connectors.base import Sink
+from detl.constants import NullTactic
+from detl.engine.checks import row_base
+from detl.exceptions import ConfigError
+
+# Tactics that depend on row order across the whole dataset; applied per batch they would silently change results.
+# Statistic fills and deduplication are batch-safe: `execute_batches()` computes statistics over all batches first
+# and tracks seen keys in a run-wide index.
+GLOBAL_NULL_TACTICS = {NullTactic.FFILL, NullTactic.BFILL}
+GLOBAL_PIPELINE_STAGES = {"sort"}
+
+_DONE = object()
+
+class StageMetrics(BaseModel):
+    """Time one pipeline stage spent working versus waiting on its neighbours."""
+    name: str
+    batches: int = 0
+    rows: int = 0
+    busy: float = 0.0
+    waiting_input: float = 0.0
+    waiting_output: float = 0.0
+
+    def utilization(self, wall: float) -> float:
+        return self.busy / wall if wall > 0 else 0.0
+
+class PipelineMetrics(BaseModel):
+    wall: float = 0.0
+    queue_depth: int
+    stages: List[StageMetrics]
+
+    @property
+    def bottleneck(self) -> str:
+        """The busiest stage, which bounds the pipeline's throughput."""
+        return max(self.stages, key=lambda s: s.busy).name
+
+def _label(tactic: Any) -> str:
+    return getattr(tactic, "value", tactic)
+
+def batch_blockers(manifest) -> List[str]:
+    """Lists contract features that need the whole dataset at once and therefore cannot run batch by batch."""
+    blockers = []
+    for col_name, col_def in manifest.columns.items():
+        if col_def.on_null and col_def.on_null.tactic in GLOBAL_NULL_TACTICS:
+            blockers.append(f"columns.{col_name}.on_null tactic '{_label(col_def.on_null.tactic)}'")
+    for stage in manifest.pipeline or []:
+        blockers.extend(f"pipeline stage '{name}'" for name in stage if name in GLOBAL_PIPELINE_STAGES)
+    return blockers
+
+def run_pipeline(
+    batches: Iterator[pl.DataFrame],
+    transform: Callable[[pl.DataFrame], pl.DataFrame | pl.LazyFrame],
+    sink: Sink,
+    queue_depth: int = 2,
+    on_written: Callable[[int], None] | None = None,
+    resumed: bool = False,
+    first_row: int = 0,
+) -> PipelineMetrics:
+    """Overlaps reading, transforming and writing batches in three threads joined by bounded queues.
+
+    Each queue holds at most `queue_depth` batches, so a slow stage applies backpressure upstream and
+    memory stays bounded at roughly `2 * queue_depth + 3` batches in flight. The first failure in any
+    stage stops the others, aborts the sink's batched write and is re-raised here.
+
+    With `on_written`, the writer calls it with the 1-based number of each batch once the sink has it, and a
+    failure suspends the sink's write rather than aborting it, to be resumed later. `resumed` means the caller
+    already started the write with `sink.resume_batches()`; `first_row` is the stream position of the first row.
+    """
+    if queue_depth < 1:
+        raise ConfigError(f"queue_depth must be a positive integer, got: {queue_depth}")
+
+    read_q: queue.Queue = queue.Queue(maxsize=queue_depth)
+    write_q: queue.Queue = queue.Queue(maxsize=queue_depth)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    metrics = PipelineMetrics(queue_depth=queue_depth, stages=[StageMetrics(name=n) for n in ("read", "transform", "write")])
+    read_m, transform_m, write_m = metrics.stages
+
+    def put(q: queue.Queue, item, m: StageMetrics) -> bool:
+        start = time.perf_counter()
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                m.waiting_output += time.perf_counter() - start
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(q: queue.Queue, m: StageMetrics):
+        start = time.perf_counter()
+        while not stop.is_set():
+            try:
+                item = q.get(timeout=0.1)
+                m.waiting_input += time.perf_counter() - start
+                return item
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def guarded(fn: Callable[[], None]) -> Callable[[], None]:
+        def run() -> None:
+            try:
+                fn()
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+        return run
+
+    def reader() -> None:
+        iterator = iter(batches)
+        while not stop.is_set():
+            start = time.perf_counter()
+            batch = next(iterator, _DONE)
+            read_m.busy += time.perf_counter() - start
+            if batch is _DONE:
+                break
+            read_m.batches += 1
+            read_m.rows += batch.height
+            if not put(read_q, batch, read_m):
+                return
+        put(read_q, _DONE, read_m)
+
+    def transformer() -> None:
+        offset = first_row
+        while True:
+            batch = get(read_q, transform_m)
+            if batch is _DONE:
+                break
+            start = time.perf_counter()
+            # Violations are reported at their position in the whole stream, not within the batch
+            with row_base(offset):
+                out = transform(batch)
+                if isinstance(out, pl.LazyFrame):
+                    out = out.collect()
+            offset += batch.height
+            transform_m.busy += time.perf_counter() - start
+            transform_m.batches += 1
+            transform_m.rows += out.height
+            if not put(write_q, out, transform_m):
+                return
+        put(write_q, _DONE, transform_m)
+
+    def writer() -> None:
+        while True:
+            batch = get(write_q, write_m)
+            if batch is _DONE:
+                break
+            start = time.perf_counter()
+            if batch.height:
+                sink.write_batch(batch)
+            write_m.busy += time.perf_counter() - start
+            write_m.batches += 1
+            write_m.rows += batch.height
+            if on_written is not None:
+                on_written(write_m.batches)
+
+    wall_start = time.perf_counter()
+    if not resumed:
+        sink.begin_batches()
+    threads = [threading.Thread(target=guarded(fn), name=f"detl-{fn.__name__}", daemon=True) for fn in (reader, transformer, writer)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        if on_written is not None:
+            sink.suspend_batches()
+        else:
+            sink.abort_batches()
+        raise errors[0]
+
+    start = time.perf_counter()
+    sink.commit_batches()
+    write_m.busy += time.perf_counter() - start
+    metrics.wall = time.perf_counter() - wall_start
+    return metrics
@@ -0,0 +1,103 @@
+import re
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+from detl.connectors.base import SizeEstimate
+from detl.exceptions import ConfigError, MemoryBudgetError
+
+# Peak memory of applying a contract to a whole frame, as a multiple of the decoded input:
+# the input, the frame being rebuilt by casts and fills, and the output
+WORKING_SET_FACTOR = 3.0
+# Rows per batch are never planned below this; a budget that small is reported instead
+MIN_BATCH_ROWS = 1_000
+
+_UNITS = {"": 1, "b": 1, "k": 2**10, "m": 2**20, "g": 2**30, "t": 2**40}
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?\s*$", re.IGNORECASE)
+
+def parse_memory(value: int | str) -> int:
+    """Bytes in a memory size given as a number of bytes or a string such as "512MB" or "4GiB" (binary units)."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        size = value
+    else:
+        match = _SIZE.match(str(value))
+        if match is None:
+            raise ConfigError(f"max_memory must be a byte count or a size like '512MB' or '4GB', got: {value!r}")
+        size = int(float(match.group(1)) * _UNITS[match.group(2).lower()])
+    if size <= 0:
+        raise ConfigError(f"max_memory must be positive, got: {value!r}")
+    return size
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+class ExecutionPlan(BaseModel):
+    """How a run fits into its memory budget.
+
+    Attributes:
+        strategy: `in_memory` materializes the input and transforms it whole; `streaming` hands the lazy plan
+            to a sink that runs it with Polars' streaming engine; `batched` runs `execute_batches`.
+        estimated_bytes: Decoded size of the input, when the source could estimate it.
+        batch_size: Rows per batch under the `batched` strategy.
+        reason: Why the strategy was chosen.
+    """
+    strategy: Literal["in_memory", "streaming", "batched"]
+    budget: int
+    estimated_bytes: int | None = None
+    batch_size: int | None = None
+    reason: str
+
+def plan_execution(
+    estimate: SizeEstimate | None,
+    budget: int,
+    can_stream: bool,
+    can_batch: bool,
+    blockers: List[str],
+    has_sink: bool = True,
+    queue_depth: int = 2,
+) -> ExecutionPlan:
+    """Picks the fastest strategy expected to stay within `budget` bytes.
+
+    In order of preference: in memory when the input times `WORKING_SET_FACTOR` fits; streaming when the
+    source is a lazy scan and the sink streams; batched when the sink writes batches incrementally, with batches sized so the
+    `2 * queue_depth + 3` in flight plus one transform working set fit. An input of unknown size takes the
+    safest strategy available.
+
+    Raises:
+        MemoryBudgetError: If the input is known not to fit and can neither stream nor run in batches.
+    """
+    size = estimate.bytes if estimate is not None else None
+    streamable = can_stream and estimate is not None and estimate.lazy and not blockers
+    batchable = can_batch and not blockers
+    plan = dict(budget=budget, estimated_bytes=size)
+
+    if size is not None and size * WORKING_SET_FACTOR <= budget:
+        return ExecutionPlan(strategy="in_memory", reason="the input fits in memory", **plan)
+    if streamable:
+        return ExecutionPlan(strategy="streaming", reason="the input is a lazy scan and the sink streams", **plan)
+    if batchable:
+        rows = estimate.rows if estimate is not None else None
+        if size is None or not rows:
+            return ExecutionPlan(strategy="batched", batch_size=100_000, reason="the input size is unknown", **plan)
+        batch_bytes = budget / (2 * queue_depth + 3 + WORKING_SET_FACTOR)
+        batch_size = int(batch_bytes / (size / rows))
+        if batch_size >= MIN_BATCH_ROWS:
+            return ExecutionPlan(strategy="batched", batch_size=batch_size, reason="the input exceeds the budget", **plan)
+        why = f"even batches of {MIN_BATCH_ROWS:,} rows exceed it"
+    elif size is None:
+        return ExecutionPlan(strategy="in_memory", reason="the input size is unknown and it can neither stream nor run in batches", **plan)
+    elif blockers:
+        why = "it cannot stream or run in batches because these features need the whole dataset at once: " + ", ".join(blockers)
+    elif not has_sink:
+        why = "without a sink the result has to be returned in memory"
+    else:
+        why = "the sink can neither write batches incrementally nor stream this source"
+    raise MemoryBudgetError(
+        f"The run needs about {format_bytes(size * WORKING_SET_FACTOR)} but max_memory is {format_bytes(budget)}, and {why}.",
+        estimated_bytes=size,
+        budget=budget,
+    )
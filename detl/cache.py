@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import polars as pl
+
+from detl.connectors.base import Source
+from detl.exceptions import ConfigError
+
+RESULT_FILE = "result.parquet"
+META_FILE = "meta.json"
+
+def detl_version() -> str:
+    try:
+        return metadata.version("detl")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+def contract_digest(manifest: Any) -> str:
+    """Hashes the normalized contract so that YAML formatting, key order and comments do not matter."""
+    normalized = json.dumps(manifest.model_dump(mode="json", warnings=False), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class CacheEntry:
+    """A stored contract output plus the fingerprints of every sink it has been written to."""
+    def __init__(self, path: Path):
+        self.path = path
+        self.result = path / RESULT_FILE
+        self._meta_path = path / META_FILE
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+
+    @property
+    def created_at(self) -> float:
+        return self.meta["created_at"]
+
+    @property
+    def size(self) -> int:
+        return self.meta["bytes"]
+
+    @property
+    def last_used(self) -> float:
+        return self._meta_path.stat().st_mtime
+
+    def scan(self) -> pl.LazyFrame:
+        return pl.scan_parquet(self.result)
+
+    def has_sink(self, fingerprint: str | None) -> bool:
+        return fingerprint is not None and fingerprint in self.meta["sinks"]
+
+    def record_sink(self, fingerprint: str | None) -> None:
+        if fingerprint is None or fingerprint in self.meta["sinks"]:
+            return
+        self.meta["sinks"].append(fingerprint)
+        _write_json(self._meta_path, self.meta)
+
+    def touch(self) -> None:
+        os.utime(self._meta_path)
+
+class ResultCache:
+    """
+    Content-addressed store of contract outputs.
+
+    The cache key combines the Source fingerprint (file size+mtime or content hash, query text, S3 ETags),
+    the normalized contract and the detl version. On a hit, the stored output is replayed instead of
+    re-running the contract, and the sink write is skipped entirely if the sink still holds what was
+    written last time.
+
+    Args:
+        directory: Where entries are stored.
+        max_age: Seconds after which an entry is evicted. None keeps entries forever.
+        max_bytes: Total size budget. Least recently used entries are evicted beyond it.
+        hash_content: Hash file contents instead of trusting size and modification time.
+    """
+    def __init__(self, directory: Union[str, Path], max_age: float | None = None, max_bytes: int | None = None, hash_content: bool = False):
+        if max_age is not None and max_age <= 0:
+            raise ConfigError(f"Cache max_age must be positive, got: {max_age}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ConfigError(f"Cache max_bytes must be positive, got: {max_bytes}")
+        self.directory = Path(directory).expanduser()
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+
+    def key(self, source: Source, manifest: Any, *extra: str) -> str | None:
+        """Returns the cache key for running `manifest` over `source`, or None if the source cannot be fingerprinted.
+
+        Any `extra` strings (e.g. the digest of fitted statistics) are folded into the key.
+        """
+        fingerprint = source.fingerprint(content=self.hash_content)
+        if fingerprint is None:
+            return None
+        parts = [fingerprint, contract_digest(manifest), detl_version(), *extra]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> CacheEntry | None:
+        path = self.directory / key
+        if not (path / META_FILE).exists() or not (path / RESULT_FILE).exists():
+            return None
+        entry = CacheEntry(path)
+        if self._expired(entry):
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        entry.touch()
+        return entry
+
+    def store(self, key: str, df: pl.DataFrame | pl.LazyFrame) -> CacheEntry:
+        """Materializes `df` into the cache. The entry is published atomically, so readers never see a partial result."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.directory, prefix=".tmp-"))
+        try:
+            result = staging / RESULT_FILE
+            if isinstance(df, pl.LazyFrame):
+                df.sink_parquet(result)
+            else:
+                df.write_parquet(result)
+            _write_json(staging / META_FILE, {
+                "created_at": time.time(),
+                "bytes": result.stat().st_size,
+                "detl_version": detl_version(),
+                "sinks": [],
+            })
+            target = self.directory / key
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.prune(keep=key)
+        return CacheEntry(target)
+
+    def entries(self) -> List[CacheEntry]:
+        if not self.directory.exists():
+            return []
+        entries = []
+        for path in self.directory.iterdir():
+            if path.name.startswith(".") or not (path / META_FILE).exists():
+                continue
+            try:
+                entries.append(CacheEntry(path))
+            except (OSError, json.JSONDecodeError):
+                # A concurrently evicted or half-deleted entry is simply not listed
+                continue
+        return entries
+
+    def prune(self, keep: str | None = None) -> None:
+        """Evicts entries older than `max_age`, then least recently used ones until the cache fits `max_bytes`.
+
+        Args:
+            keep: Key of an entry that must survive, e.g. the one just stored for the running job.
+        """
+        entries = []
+        for entry in self.entries():
+            if entry.path.name == keep:
+                continue
+            if self._expired(entry):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                entries.append(entry)
+
+        if self.max_bytes is None:
+            return
+        total = sum(e.size for e in entries)
+        if keep is not None and (self.directory / keep / META_FILE).exists():
+            total += CacheEntry(self.directory / keep).size
+        for entry in sorted(entries, key=lambda e: e.last_used):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry.path, ignore_errors=True)
+            total -= entry.size
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _expired(self, entry: CacheEntry) -> bool:
+        return self.max_age is not None and time.time() - entry.created_at > self.max_age
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
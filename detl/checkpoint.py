@@ -0,0 +1,97 @@
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import polars as pl
+from pydantic import BaseModel, ValidationError
+
+from detl.cache import _write_json
+from detl.exceptions import ConfigError
+from detl.fit import StatisticsArtifact
+from detl.schema.checkpoint import CheckpointDef
+
+CHECKPOINT_FORMAT = 1
+
+class Checkpoint(BaseModel):
+    """How far a batched run got: everything written up to and including batch `batches` is in the sink.
+
+    Attributes:
+        contract: Digest of the contract; a checkpoint only resumes the contract that wrote it.
+        source: `state_key()` of the source.
+        sink: Connector class of the sink.
+        rows: Source rows consumed by the finished batches.
+        key: With `conf.checkpoint.key`, the key column, and `after` its (encoded) highest value read.
+        statistics: The fill statistics the run uses, so a resumed run doesn't compute them again.
+        sink_state: The sink's `checkpoint_batches()` state.
+        key_index: Files under the checkpoint directory holding the keys each dedup index gained, per index.
+        seen_keys: Files holding the `seen_keys` of the rows written, committed to the store when the run ends.
+    """
+    format: int = CHECKPOINT_FORMAT
+    contract: str
+    source: str
+    sink: str
+    batches: int = 0
+    rows: int = 0
+    key: Optional[str] = None
+    after: Optional[Dict[str, Any]] = None
+    statistics: Optional[StatisticsArtifact] = None
+    sink_state: Dict[str, Any] = {}
+    key_index: Dict[str, List[str]] = {}
+    seen_keys: List[str] = []
+    updated_at: float = 0.0
+
+class CheckpointStore:
+    """The checkpoint of a contract's batched runs: a JSON file plus `<path>.d/` holding key files.
+
+    The JSON is replaced atomically after each batch and only references key files already written, so a crash
+    at any point leaves the last complete checkpoint readable.
+    """
+    def __init__(self, spec: CheckpointDef):
+        self.path = Path(spec.path).expanduser()
+        self.key = spec.key
+        self.directory = self.path.with_name(f"{self.path.name}.d")
+
+    def load(self) -> Checkpoint | None:
+        """The last saved checkpoint, or None if there is none.
+
+        Raises:
+            ConfigError: If the file is malformed or from a newer checkpoint format.
+        """
+        if not self.path.is_file():
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ConfigError(f"Cannot read checkpoint '{self.path}': {e}")
+        if isinstance(data, dict) and data.get("format", CHECKPOINT_FORMAT) > CHECKPOINT_FORMAT:
+            raise ConfigError(f"Checkpoint '{self.path}' uses format {data['format']}; this detl reads up to {CHECKPOINT_FORMAT}.")
+        try:
+            return Checkpoint.model_validate(data)
+        except ValidationError as e:
+            raise ConfigError(f"Invalid checkpoint '{self.path}':\n{e}")
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        checkpoint.updated_at = time.time()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json(self.path, checkpoint.model_dump(mode="json"))
+
+    def write_keys(self, batch: int, name: str, keys: pl.DataFrame) -> str:
+        """Stores the keys gained with `batch` for index (or store) `name`, returning the file name."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file = f"{hashlib.sha1(name.encode('utf-8')).hexdigest()[:12]}-{batch:08d}.parquet"
+        tmp = self.directory / f".{file}.tmp"
+        keys.write_parquet(tmp)
+        tmp.replace(self.directory / file)
+        return file
+
+    def read_keys(self, files: List[str]) -> pl.DataFrame:
+        return pl.read_parquet([self.directory / f for f in files])
+
+    def clear(self) -> None:
+        """Deletes the checkpoint once its run has finished, or before a run that doesn't resume."""
+        self.path.unlink(missing_ok=True)
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -4,21 +4,21 @@ import yaml
 from pathlib import Path
 import polars as pl
 from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
 from rich.theme import Theme
 from detl.config import Config
 from detl.core import Processor
-from detl.exceptions import DetlException, ConnectionConfigurationError
-
-from detl.connectors import (
-    Source, Sink,
-    CsvSource, CsvSink,
-    ParquetSource, ParquetSink,
-    ExcelSource, ExcelSink,
-    PostgresSource, PostgresSink,
-    MySQLSource, MySQLSink,
-    SQLiteSource, SQLiteSink,
-    S3Source, S3Sink
-)
+from detl.cache import ResultCache
+from detl.fit import StatisticsArtifact
+from detl.batch import JobResult, load_batch, plan_workers, run_many
+from detl.profile import profile_source
+from detl.budget import format_bytes
+from detl.exceptions import DetlException, ConnectionConfigurationError, DataViolationError, MemoryBudgetError
+
+from detl.connectors import Source, Sink
+from detl.connectors.database.pool import POOL
+from detl.connectors.factory import FILE_EXTENSIONS, make_source, make_sink
 
 custom_theme = Theme({
     "info": "cyan",
@@ -42,15 +42,10 @@ def build_source(args: argparse.Namespace) -> Source:
         ValueError: If an unsupported format or unknown source type is provided.
     """
     if args.input:
-        path = Path(args.input)
-        ext = path.suffix.lower()
-        if ext == ".csv":
-            return CsvSource(path)
-        if ext == ".parquet":
-            return ParquetSource(path)
-        if ext in (".xls", ".xlsx"):
-            return ExcelSource(path)
-        raise ValueError(f"Unsupported input format: {ext}")
+        ext = Path(args.input).suffix.lower()
+        if ext not in FILE_EXTENSIONS:
+            raise ValueError(f"Unsupported input format: {ext}")
+        return make_source(FILE_EXTENSIONS[ext], Path(args.input))
         
     stype = args.source_type
     if not stype or not args.source_uri:
@@ -62,21 +57,7 @@ def build_source(args: argparse.Namespace) -> Source:
     except ValueError:
         raise ValueError("source-batch-size must be an integer")
         
-    if stype == "postgres":
-        return PostgresSource(args.source_uri, args.source_query, batch_size=args.source_batch_size)
-    if stype == "mysql":
-        return MySQLSource(args.source_uri, args.source_query, batch_size=args.source_batch_size)
-    if stype == "sqlite":
-        return SQLiteSource(args.source_uri, args.source_query, batch_size=args.source_batch_size)
-    if stype == "csv":
-        return CsvSource(args.source_uri)
-    if stype == "parquet":
-        return ParquetSource(args.source_uri)
-    if stype == "excel":
-        return ExcelSource(args.source_uri)
-    if stype == "s3":
-        return S3Source(args.source_uri, endpoint_url=args.s3_endpoint_url)
-    raise ValueError(f"Unknown source type: {stype}")
+    return make_source(stype, args.source_uri, query=args.source_query, batch_size=args.source_batch_size, endpoint_url=args.s3_endpoint_url)
 
 def build_sink(args: argparse.Namespace) -> Sink:
     """Instantiate the appropriate Sink connector based on CLI arguments.
@@ -91,15 +72,10 @@ def build_sink(args: argparse.Namespace) -> Sink:
         ValueError: If an unsupported format or unknown sink type is provided.
     """
     if args.output:
-        path = Path(args.output)
-        ext = path.suffix.lower()
-        if ext == ".csv":
-            return CsvSink(path)
-        if ext == ".parquet":
-            return ParquetSink(path)
-        if ext in (".xls", ".xlsx"):
-            return ExcelSink(path)
-        raise ValueError(f"Unsupported output format: {ext}")
+        ext = Path(args.output).suffix.lower()
+        if ext not in FILE_EXTENSIONS:
+            raise ValueError(f"Unsupported output format: {ext}")
+        return make_sink(FILE_EXTENSIONS[ext], Path(args.output))
         
     stype = args.sink_type
     if not stype or not args.sink_uri:
@@ -111,32 +87,141 @@ def build_sink(args: argparse.Namespace) -> Sink:
     except ValueError:
         raise ValueError("sink-batch-size must be an integer")
         
-    db_kwargs = {"batch_size": args.sink_batch_size}
-    if args.sink_if_exists:
-        db_kwargs["if_table_exists"] = args.sink_if_exists
-        
-    if stype == "postgres":
-        return PostgresSink(args.sink_uri, args.sink_table, **db_kwargs)
-    if stype == "mysql":
-        return MySQLSink(args.sink_uri, args.sink_table, **db_kwargs)
-    if stype == "sqlite":
-        return SQLiteSink(args.sink_uri, args.sink_table, **db_kwargs)
-    if stype == "csv":
-        return CsvSink(args.sink_uri)
-    if stype == "parquet":
-        return ParquetSink(args.sink_uri)
-    if stype == "excel":
-        return ExcelSink(args.sink_uri)
-    if stype == "s3":
-        return S3Sink(args.sink_uri, endpoint_url=args.s3_endpoint_url)
-    raise ValueError(f"Unknown sink type: {stype}")
+    return make_sink(
+        stype, args.sink_uri,
+        table=args.sink_table,
+        if_table_exists=args.sink_if_exists,
+        batch_size=args.sink_batch_size,
+        key_columns=args.sink_key_columns.split(",") if args.sink_key_columns else None,
+        endpoint_url=args.s3_endpoint_url,
+    )
+
+def batch_main(argv: list[str]) -> None:
+    """Entrypoint for `detl batch jobs.yml`: runs every job of a jobs file across a process pool."""
+    parser = argparse.ArgumentParser(
+        prog="detl batch",
+        description="Run many contract/source/sink jobs in parallel worker processes."
+    )
+    parser.add_argument("jobs", type=Path, help="Path to the jobs file (YAML).")
+    parser.add_argument("--max-workers", type=int, required=False, help="Concurrent worker processes (default: jobs file setting, else one per core).")
+    parser.add_argument("--threads-per-worker", type=int, required=False, help="Polars threads per worker (default: jobs file setting, else cores / workers).")
+    parser.add_argument("--only", type=str, nargs="+", required=False, help="Run only the named jobs.")
+    parser.add_argument("--pool-size", type=int, required=False, help="Database connections each worker keeps open per database (default: jobs file setting, else 5).")
+    args = parser.parse_args(argv)
+
+    try:
+        batch = load_batch(args.jobs)
+    except FileNotFoundError as e:
+        console.print(f"[error]Error:[/error] {e}")
+        sys.exit(1)
+    except DetlException as e:
+        console.print(f"[error]Jobs file validation errors:[/error]\n{e}")
+        sys.exit(1)
+
+    if args.only:
+        unknown = set(args.only) - {job.name for job in batch.jobs}
+        if unknown:
+            console.print(f"[error]Unknown job(s):[/error] {', '.join(sorted(unknown))}")
+            sys.exit(1)
+        batch.jobs = [job for job in batch.jobs if job.name in args.only]
+
+    max_workers = args.max_workers or batch.max_workers
+    threads_per_worker = args.threads_per_worker or batch.threads_per_worker
+    workers, threads = plan_workers(len(batch.jobs), max_workers, threads_per_worker)
+    console.print(f"[info]Running {len(batch.jobs)} job(s) on {workers} worker(s) x {threads} Polars thread(s).[/info]")
+
+    def report(result: JobResult) -> None:
+        status = "[success]ok[/success]" if result.ok else "[error]failed[/error]"
+        console.print(f"  {escape(result.name)}: {status} ({result.seconds:.2f}s)")
+
+    results = run_many(batch, max_workers=max_workers, threads_per_worker=threads_per_worker, on_result=report, pool_size=args.pool_size)
+
+    table = Table(title="detl batch summary")
+    for column in ("job", "status", "seconds", "worker", "threads", "db connects", "error"):
+        table.add_column(column, justify="right" if column in ("seconds", "threads", "db connects") else "left")
+    for r in results:
+        table.add_row(
+            escape(r.name),
+            "[success]ok[/success]" if r.ok else "[error]failed[/error]",
+            f"{r.seconds:.2f}",
+            str(r.pid) if r.pid else "-",
+            str(r.threads) if r.threads else "-",
+            f"{r.connects:,}",
+            escape(" ".join(r.error.split())) if r.error else "",
+        )
+    console.print(table)
+
+    failed = sum(1 for r in results if not r.ok)
+    if failed:
+        console.print(f"[error]{failed} of {len(results)} job(s) failed.[/error]")
+        sys.exit(1)
+    console.print(f"[success]All {len(results)} job(s) succeeded.[/success]")
+
+def profile_main(argv: list[str]) -> None:
+    """Entrypoint for `detl profile`: streams a source once and drafts a contract from what it finds."""
+    parser = argparse.ArgumentParser(
+        prog="detl profile",
+        description="Profile a source in one streaming pass and write a starter YAML manifest."
+    )
+    parser.add_argument("-i", "--input", type=str, required=False, help="Input data file (.csv, .parquet, .xlsx).")
+    parser.add_argument("--source-type", type=str, required=False, help="Source connector type (postgres, mysql, sqlite, csv, parquet, excel, s3)")
+    parser.add_argument("--source-uri", type=str, required=False, help="Connection string or filepath for Source")
+    parser.add_argument("--source-query", type=str, required=False, help="SQL Query to execute for Database sources")
+    parser.add_argument("--source-batch-size", type=str, required=False, help="Optional batch size for chunked database reading")
+    parser.add_argument("--s3-endpoint-url", type=str, required=False, help="Optional Endpoint URL for S3/MinIO connections.")
+    parser.add_argument("-o", "--output", type=Path, required=False, help="Where to write the drafted manifest (default: print it).")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Rows profiled per batch (default: 100000).")
+    parser.add_argument("--max-categories", type=int, default=20, help="Largest distinct count for which a string column gets allowed_values (default: 20).")
+    args = parser.parse_args(argv)
+
+    try:
+        source = build_source(args)
+    except Exception as e:
+        console.print(f"[error]Connector Initialization Error:[/error] {e}")
+        sys.exit(1)
+
+    try:
+        profile = profile_source(source, batch_size=args.batch_size, max_categories=args.max_categories)
+    except DetlException as e:
+        console.print(f"[error]Source error:[/error]\n{e}")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[error]Critical profiling error:[/error]\n{e}")
+        sys.exit(1)
+
+    table = Table(title=f"Profile: {profile.rows:,} rows, {len(profile.columns)} columns")
+    for column in ("column", "dtype", "nulls", "distinct", "min", "max", "length", "top values"):
+        table.add_column(column, justify="right" if column in ("nulls", "distinct") else "left")
+    for s in profile.summary():
+        dtype = s["dtype"] + (f" ({s['format']})" if s["format"] else "")
+        length = f"{s['length'][0]}-{s['length'][1]}" if s["length"] else ""
+        top = ", ".join(f"{v} ({c})" for v, c in s["top"][:3])
+        table.add_row(
+            escape(s["column"]), escape(dtype), f"{s['null_rate']:.1%}", f"~{s['distinct']:,}",
+            escape(str(s["min"])), escape(str(s["max"])), length, escape(top),
+        )
+    console.print(table)
+
+    manifest = yaml.safe_dump(profile.manifest(), sort_keys=False, allow_unicode=True)
+    if args.output:
+        args.output.write_text(manifest, encoding="utf-8")
+        console.print(f"[success]Done! Starter manifest written to {escape(str(args.output))}; review it before use.[/success]")
+    else:
+        print(manifest)
 
 def main() -> None:
     """Main entrypoint for the detl CLI.
 
     Parses arguments, evaluates the declarative configuration, initializes connectors,
-    and executes the pipeline.
+    and executes the pipeline. `detl batch ...` is dispatched to `batch_main` and `detl profile ...` to `profile_main`.
     """
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        batch_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "profile":
+        profile_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="detl (Declarative ETL) - Strict, modular CLI utility for declarative data cleaning and transformation."
     )
@@ -155,11 +240,25 @@ def main() -> None:
     parser.add_argument("--sink-type", type=str, required=False, help="Sink connector type (postgres, mysql, sqlite, csv, parquet, excel, s3)")
     parser.add_argument("--sink-uri", type=str, required=False, help="Connection string or filepath for Sink")
     parser.add_argument("--sink-table", type=str, required=False, help="Target table name for Database sinks")
-    parser.add_argument("--sink-if-exists", type=str, choices=["replace", "append", "fail"], required=False, help="Database table collision strategy")
+    parser.add_argument("--sink-if-exists", type=str, choices=["replace", "append", "fail", "merge", "swap"], required=False, help="Database table collision strategy")
+    parser.add_argument("--sink-key-columns", type=str, required=False, help="Comma-separated key columns the merge strategy upserts on")
     parser.add_argument("--sink-batch-size", type=str, required=False, help="Optional batch size for chunked database writing")
     
     parser.add_argument("--s3-endpoint-url", type=str, required=False, help="Optional Endpoint URL for S3/MinIO connections.")
 
+    parser.add_argument("--batch-size", type=int, required=False, help="Run batch by batch, overlapping read, transform and write with at most this many rows per batch.")
+    parser.add_argument("--queue-depth", type=int, default=2, help="Batches buffered between pipeline stages in batched mode (default: 2).")
+    parser.add_argument("--resume", action="store_true", help="Continue a batched run from the checkpoint set by 'conf.checkpoint' instead of starting over.")
+    parser.add_argument("--max-memory", type=str, required=False, help="Memory budget such as 4GB: run in memory, streaming or batched depending on the estimated input size, and abort cleanly if it cannot fit.")
+
+    parser.add_argument("--fit-statistics", type=Path, required=False, help="Compute the contract's fill statistics over the source, save them to this file and exit. No sink is needed.")
+    parser.add_argument("--statistics", type=Path, required=False, help="Apply fill statistics from a file written by --fit-statistics instead of recomputing them.")
+
+    parser.add_argument("--cache-dir", type=Path, required=False, help="Enable the result cache: identical re-runs reuse the stored output and skip unchanged sinks.")
+    parser.add_argument("--cache-max-age", type=float, required=False, help="Evict cache entries older than this many seconds.")
+    parser.add_argument("--cache-max-size", type=float, required=False, help="Evict least recently used cache entries beyond this many megabytes.")
+    parser.add_argument("--cache-hash-content", action="store_true", help="Fingerprint input files by content instead of size and modification time.")
+
     args = parser.parse_args()
 
     try:
@@ -180,14 +279,40 @@ def main() -> None:
 
     try:
         source_connector = build_source(args)
-        sink_connector = build_sink(args)
+        sink_connector = None if args.fit_statistics else build_sink(args)
     except Exception as e:
         console.print(f"[error]Connector Initialization Error:[/error] {e}")
         sys.exit(1)
 
+    fitted = None
+    if args.statistics:
+        try:
+            fitted = StatisticsArtifact.load(args.statistics)
+        except DetlException as e:
+            console.print(f"[error]Statistics artifact error:[/error] {e}")
+            sys.exit(1)
+
+    cache = None
+    if args.cache_dir:
+        try:
+            cache = ResultCache(
+                args.cache_dir,
+                max_age=args.cache_max_age,
+                max_bytes=int(args.cache_max_size * 1024 * 1024) if args.cache_max_size else None,
+                hash_content=args.cache_hash_content,
+            )
+        except DetlException as e:
+            console.print(f"[error]Cache configuration error:[/error] {e}")
+            sys.exit(1)
+
     try:
-        processor = Processor(config)
-        processor.execute(source=source_connector, sink=sink_connector)
+        processor = Processor(config, cache=cache, fitted=fitted, max_memory=args.max_memory, resume=args.resume)
+        if args.fit_statistics:
+            artifact = processor.fit(source_connector, args.fit_statistics, batch_size=args.batch_size or 100_000)
+        elif args.batch_size:
+            processor.execute_batches(source_connector, sink_connector, batch_size=args.batch_size, queue_depth=args.queue_depth)
+        else:
+            processor.execute(source=source_connector, sink=sink_connector)
     except pl.exceptions.PolarsError as e:
         error_msg = str(e)
         if "Resolved plan until failure:" in error_msg:
@@ -197,13 +322,49 @@ def main() -> None:
     except ConnectionConfigurationError as e:
         console.print(f"[error]Source/Sink Connection Error:[/error]\n{e}")
         sys.exit(1)
+    except MemoryBudgetError as e:
+        console.print(f"[error]Memory budget exceeded, nothing was written:[/error]\n{e}")
+        sys.exit(1)
     except DetlException as e:
         console.print(f"[error]Data contract violation/config error:[/error]\n{e}")
+        if isinstance(e, DataViolationError) and e.sample is not None:
+            console.print(f"[warning]Offending rows (sample):[/warning]\n{escape(str(e.sample))}")
         sys.exit(1)
     except Exception as e:
         console.print(f"[error]Critical pipeline error:[/error]\n{e}")
         sys.exit(1)
 
+    if args.fit_statistics:
+        table = Table(title=f"Fitted statistics: {escape(str(args.fit_statistics))}")
+        for column in ("column", "statistic", "value"):
+            table.add_column(column)
+        for s in artifact.values():
+            table.add_row(escape(s["column"]), s["statistic"], escape(str(s["value"])))
+        console.print(table)
+        console.print("[success]Done! Statistics saved; apply them with --statistics.[/success]")
+        return
+
+    if processor.plan is not None:
+        p = processor.plan
+        size = format_bytes(p.estimated_bytes) if p.estimated_bytes is not None else "unknown size"
+        batches = f", {p.batch_size:,} rows per batch" if p.batch_size else ""
+        console.print(f"[info]Memory budget {format_bytes(p.budget)}, input {size}: ran {p.strategy.replace('_', ' ')}{batches} ({p.reason}).[/info]")
+    if processor.resumed is not None:
+        r = processor.resumed
+        console.print(f"[info]Resumed from checkpoint: {r.batches:,} batches ({r.rows:,} source rows) were already written.[/info]")
+    if processor.metrics is not None:
+        m = processor.metrics
+        table = Table(title=f"Pipelined execution: {m.wall:.2f}s, queue depth {m.queue_depth}")
+        for column in ("stage", "batches", "rows", "busy (s)", "utilization", "waiting in (s)", "waiting out (s)"):
+            table.add_column(column, justify="left" if column == "stage" else "right")
+        for s in m.stages:
+            table.add_row(s.name, f"{s.batches:,}", f"{s.rows:,}", f"{s.busy:.2f}", f"{s.utilization(m.wall):.0%}", f"{s.waiting_input:.2f}", f"{s.waiting_output:.2f}")
+        console.print(table)
+        console.print(f"[info]Bottleneck stage: {m.bottleneck}[/info]")
+    for uri, c in POOL.metrics().items():
+        console.print(f"[info]Database connections to {escape(uri)}: {c.connects:,} opened, {c.checkouts:,} checkouts, {c.invalidated:,} dropped as broken.[/info]")
+    if processor.cache_hit:
+        console.print("[info]Cache hit: contract and input are unchanged since a previous run; stored output reused.[/info]")
     console.print("[success]Done! Results successfully saved to output connector.[/success]")
 
 if __name__ == "__main__":
@@ -1,5 +1,47 @@
 import abc
+import asyncio
+from typing import Any, Dict, Iterator, List
 import polars as pl
+from pydantic import BaseModel
+from detl.exceptions import ConfigError
+
+def iter_frame_batches(df: pl.DataFrame | pl.LazyFrame, batch_size: int) -> Iterator[pl.DataFrame]:
+    """Splits a frame into DataFrames of at most `batch_size` rows. Lazy frames are streamed rather than collected whole."""
+    chunks = df.collect_batches(chunk_size=batch_size) if isinstance(df, pl.LazyFrame) else [df]
+    for chunk in chunks:
+        for batch in chunk.iter_slices(batch_size):
+            if batch.height:
+                yield batch
+
+class ColumnChunkStats(BaseModel):
+    """Footer statistics of one column in one row group. None where the writer did not record them."""
+    min: Any = None
+    max: Any = None
+    null_count: int | None = None
+
+class SizeEstimate(BaseModel):
+    """What a Source would read, estimated from metadata without reading the data. None where unknown.
+
+    Attributes:
+        rows: Number of rows.
+        bytes: Size of the decoded data in memory.
+        lazy: True when `read()` returns a scan that Polars can stream instead of materializing.
+    """
+    rows: int | None = None
+    bytes: int | None = None
+    lazy: bool = False
+
+class RowGroup(BaseModel):
+    """A row group of a Parquet file together with the per-column statistics kept in the file footer."""
+    file: str
+    index: int
+    num_rows: int
+    columns: Dict[str, ColumnChunkStats] = {}
+
+    def read(self, columns: List[str]) -> pl.DataFrame:
+        """Reads only `columns` of this row group."""
+        import pyarrow.parquet as pq
+        return pl.from_arrow(pq.ParquetFile(self.file).read_row_group(self.index, columns=columns))
 
 class Source(abc.ABC):
     """
@@ -14,6 +56,75 @@ class Source(abc.ABC):
         """
         pass
 
+    async def aread(self) -> pl.LazyFrame | pl.DataFrame:
+        """
+        Asynchronous `read()`. The default offloads `read()` to a worker thread so the event loop stays free;
+        connectors with a native async client override this.
+        """
+        return await asyncio.to_thread(self.read)
+
+    def iter_batches(self, batch_size: int) -> Iterator[pl.DataFrame]:
+        """
+        Yields the dataset as DataFrames of at most `batch_size` rows, for pipelined batch execution.
+        The default streams lazy scans and slices eager frames; connectors with a cursor override this.
+        """
+        yield from iter_frame_batches(self.read(), batch_size)
+
+    def resume_batches(self, batch_size: int, rows: int, key: str | None = None, after: Any = None) -> Iterator[pl.DataFrame]:
+        """
+        Yields what `iter_batches()` would yield after a checkpoint: the rows past `key` value `after` when a key is
+        given (the batches must then come in `key` order), else the rows past the first `rows`.
+        The default filters or slices `read()`, which lazy scans push down; connectors with a cursor override this.
+        """
+        df = self.read_since(key, after) if key is not None else self.read().slice(rows)
+        yield from iter_frame_batches(df, batch_size)
+
+    def read_since(self, column: str, watermark: Any) -> pl.LazyFrame | pl.DataFrame:
+        """
+        Reads only rows where `column` is strictly greater than `watermark`.
+        The default filters after `read()`; connectors able to push the predicate down override this.
+        """
+        return self.read().filter(pl.col(column) > watermark)
+
+    def discover(self) -> List[str]:
+        """
+        Lists the files currently backing this Source, for incremental `files` mode.
+        """
+        raise ConfigError(f"{type(self).__name__} does not support incremental 'files' mode.")
+
+    def read_files(self, files: List[str]) -> pl.LazyFrame | pl.DataFrame:
+        """
+        Reads a subset of the files returned by `discover()`.
+        """
+        raise ConfigError(f"{type(self).__name__} does not support incremental 'files' mode.")
+
+    def row_groups(self) -> List[RowGroup] | None:
+        """
+        Footer statistics of the row groups backing this Source, used to prove rules without reading data.
+        Returns None when the format keeps no such statistics.
+        """
+        return None
+
+    def estimate_size(self) -> SizeEstimate | None:
+        """
+        Estimates the size of the data from metadata (file sizes, footers, row counts), for the memory budget.
+        Returns None when the size cannot be estimated cheaply.
+        """
+        return None
+
+    def state_key(self) -> str:
+        """
+        Stable identifier used to namespace persisted run state (watermarks, processed files).
+        """
+        return type(self).__name__
+
+    def fingerprint(self, content: bool = False) -> str | None:
+        """
+        Identifies the exact input this Source would read, for the result cache.
+        Returns None when the input cannot be identified cheaply, which disables caching for the run.
+        """
+        return None
+
 class Sink(abc.ABC):
     """
     Abstract interface for all Load layer components.
@@ -26,3 +137,64 @@ class Sink(abc.ABC):
         Must raise `ConnectionConfigurationError` on destination issues.
         """
         pass
+
+    async def awrite(self, df: pl.DataFrame | pl.LazyFrame) -> None:
+        """
+        Asynchronous `write()`. The default offloads `write()` to a worker thread so the event loop stays free;
+        connectors with a native async client override this.
+        """
+        await asyncio.to_thread(self.write, df)
+
+    def streams(self) -> bool:
+        """
+        True when `write()` streams a LazyFrame to the destination with Polars' streaming engine
+        instead of collecting it in memory first.
+        """
+        return False
+
+    def begin_batches(self) -> None:
+        """
+        Starts a batched write. `write_batch()` is then called once per batch and `commit_batches()` once at the end,
+        or `abort_batches()` if the run fails. The default buffers every batch and issues a single `write()` on commit;
+        connectors able to append incrementally override all four methods.
+        """
+        self._pending_batches: List[pl.DataFrame] = []
+
+    def write_batch(self, df: pl.DataFrame) -> None:
+        self._pending_batches.append(df)
+
+    def commit_batches(self) -> None:
+        batches, self._pending_batches = self._pending_batches, []
+        if batches:
+            self.write(pl.concat(batches, how="vertical_relaxed"))
+
+    def abort_batches(self) -> None:
+        self._pending_batches = []
+
+    def checkpoint_batches(self) -> Dict[str, Any]:
+        """
+        JSON-serializable state of the batched write in progress, taken after each committed batch of a checkpointed
+        run. `resume_batches()` continues the write from it after a crash, keeping the batches written so far.
+        Connectors overriding it also override `resume_batches()` and `suspend_batches()`; others can't be resumed.
+        """
+        raise ConfigError(f"{type(self).__name__} cannot checkpoint a batched write.")
+
+    def resume_batches(self, state: Dict[str, Any]) -> None:
+        """
+        Starts a batched write where a `checkpoint_batches()` state left off, instead of `begin_batches()`.
+        Anything written after that checkpoint is discarded.
+        """
+        raise ConfigError(f"{type(self).__name__} cannot resume a batched write.")
+
+    def suspend_batches(self) -> None:
+        """
+        Stops a failed checkpointed write without discarding it, so a later run can resume it. Releases open handles.
+        """
+        self.abort_batches()
+
+    def fingerprint(self) -> str | None:
+        """
+        Identifies the current state of the destination so the result cache can tell whether an earlier
+        write is still in place. Returns None when the destination cannot be inspected, which forces a write.
+        """
+        return None
@@ -1,10 +1,21 @@
+import hashlib
 import io
+import tempfile
 import boto3
 import polars as pl
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, List
 from urllib.parse import urlparse
-from detl.connectors.base import Source, Sink
+from detl.connectors.base import SizeEstimate, Source, Sink
+from detl.connectors.file.csv import CsvSink
+from detl.connectors.file.parquet import ParquetSink
+from detl.connectors.file.discovery import GLOB_CHARS
 from detl.exceptions import ConnectionConfigurationError
 
+# Decoded size per stored byte: Parquet objects are compressed, CSV text decodes to about its own size
+DECODED_RATIOS = {"parquet": 5.0, "csv": 1.0}
+
 class S3Source(Source):
     def __init__(self, s3_uri: str, format: str = "parquet", aws_access_key_id: str | None = None, aws_secret_access_key: str | None = None, endpoint_url: str | None = None):
         self.s3_uri = s3_uri
@@ -21,36 +32,128 @@ class S3Source(Source):
             aws_secret_access_key=self.aws_secret_access_key
         )
         
-    def read(self) -> pl.DataFrame | pl.LazyFrame:
-        if not self.s3_uri.startswith("s3://"):
+    def _split_uri(self, uri: str) -> tuple[str, str]:
+        if not uri.startswith("s3://"):
             raise ConnectionConfigurationError("S3 URI must start with s3://")
-            
-        parsed = urlparse(self.s3_uri)
-        bucket = parsed.netloc
-        key = parsed.path.lstrip('/')
-        
+        parsed = urlparse(uri)
+        return parsed.netloc, parsed.path.lstrip('/')
+
+    def _is_multi_object(self, key: str) -> bool:
+        return key == "" or key.endswith("/") or any(ch in key for ch in GLOB_CHARS)
+
+    def _read_object(self, s3, bucket: str, key: str) -> pl.DataFrame:
+        # We strictly use boto3 to bypass any specific storage_option rust implementations
+        obj = s3.get_object(Bucket=bucket, Key=key)
+        return self._parse(obj['Body'].read())
+
+    def _parse(self, data: bytes) -> pl.DataFrame:
+        if self.format == "parquet":
+            return pl.read_parquet(io.BytesIO(data))
+        elif self.format == "csv":
+            return pl.read_csv(io.BytesIO(data))
+        else:
+            raise ConnectionConfigurationError(f"Unsupported S3 format: {self.format}")
+
+    def read(self) -> pl.DataFrame | pl.LazyFrame:
+        bucket, key = self._split_uri(self.s3_uri)
+        if self._is_multi_object(key):
+            files = self.discover()
+            if not files:
+                raise ConnectionConfigurationError(f"No S3 objects match '{self.s3_uri}'.")
+            return self.read_files(files)
+
         s3 = self._get_client()
         try:
-            # We strictly use boto3 to bypass any specific storage_option rust implementations
-            obj = s3.get_object(Bucket=bucket, Key=key)
-            data = obj['Body'].read()
-            if self.format == "parquet":
-                return pl.read_parquet(io.BytesIO(data))
-            elif self.format == "csv":
-                return pl.read_csv(io.BytesIO(data))
-            else:
-                raise ConnectionConfigurationError(f"Unsupported S3 format: {self.format}")
+            return self._read_object(s3, bucket, key)
         except Exception as e:
             raise ConnectionConfigurationError(f"Failed to read from S3 via boto3 ({self.s3_uri}): {e}")
 
+    def _list_prefix(self, key: str) -> str:
+        glob_at = min((key.index(ch) for ch in GLOB_CHARS if ch in key), default=len(key))
+        return key[:glob_at]
+
+    def _filter_objects(self, key: str, objects: Dict[str, str]) -> Dict[str, str]:
+        if self._list_prefix(key) != key:
+            return {k: etag for k, etag in objects.items() if fnmatch(k, key)}
+        return {k: etag for k, etag in objects.items() if k.lower().endswith(f".{self.format}")}
+
+    def _list_objects(self, bucket: str, key: str) -> Dict[str, str]:
+        """Maps every object key under the prefix/glob `key` to its ETag."""
+        s3 = self._get_client()
+        try:
+            objects = {}
+            for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=self._list_prefix(key)):
+                objects.update((obj["Key"], obj["ETag"]) for obj in page.get("Contents", []))
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to list S3 objects via boto3 ({self.s3_uri}): {e}")
+        return self._filter_objects(key, objects)
+
+    def estimate_size(self) -> SizeEstimate | None:
+        """Scales the total object size by the format's typical decoded-to-stored ratio."""
+        bucket, key = self._split_uri(self.s3_uri)
+        s3 = self._get_client()
+        try:
+            if self._is_multi_object(key):
+                sizes = {}
+                for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=self._list_prefix(key)):
+                    sizes.update((obj["Key"], obj["Size"]) for obj in page.get("Contents", []))
+                stored = sum(sizes[k] for k in self._filter_objects(key, sizes))
+            else:
+                stored = s3.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        except Exception:
+            return None
+        return SizeEstimate(bytes=int(stored * DECODED_RATIOS.get(self.format, 1.0)))
+
+    def discover(self) -> List[str]:
+        """Lists objects under a prefix (`s3://bucket/dir/`) or matching a glob (`s3://bucket/dir/*.parquet`)."""
+        bucket, key = self._split_uri(self.s3_uri)
+        if not self._is_multi_object(key):
+            return [self.s3_uri]
+        return sorted(f"s3://{bucket}/{k}" for k in self._list_objects(bucket, key))
+
+    def read_files(self, files: List[str]) -> pl.DataFrame:
+        s3 = self._get_client()
+        frames = []
+        for uri in files:
+            bucket, key = self._split_uri(uri)
+            try:
+                frames.append(self._read_object(s3, bucket, key))
+            except Exception as e:
+                raise ConnectionConfigurationError(f"Failed to read from S3 via boto3 ({uri}): {e}")
+        return pl.concat(frames, how="vertical_relaxed")
+
+    def state_key(self) -> str:
+        return f"s3:{self.s3_uri}"
+
+    def fingerprint(self, content: bool = False) -> str | None:
+        # ETags change whenever an object is rewritten, so they stand in for content hashes without a download
+        bucket, key = self._split_uri(self.s3_uri)
+        if self._is_multi_object(key):
+            objects = self._list_objects(bucket, key)
+        else:
+            try:
+                objects = {key: self._get_client().head_object(Bucket=bucket, Key=key)["ETag"]}
+            except Exception:
+                return None
+        if not objects:
+            return None
+        listing = "\n".join(f"{k}={etag}" for k, etag in sorted(objects.items()))
+        return f"s3:{bucket}:{self.format}:{hashlib.sha256(listing.encode('utf-8')).hexdigest()}"
+
 class S3Sink(Sink):
-    def __init__(self, s3_uri: str, format: str = "parquet", aws_access_key_id: str | None = None, aws_secret_access_key: str | None = None, endpoint_url: str | None = None, streaming: bool = True):
+    """Writes one object to S3.
+
+    Batched writes are spooled to a local file under `spool_dir` (default: the system temp dir) and uploaded when
+    the last batch is in, so memory stays at one batch and a checkpointed run can resume the spool after a crash.
+    """
+    def __init__(self, s3_uri: str, format: str = "parquet", aws_access_key_id: str | None = None, aws_secret_access_key: str | None = None, endpoint_url: str | None = None, streaming: bool = True, spool_dir: str | Path | None = None):
         self.s3_uri = s3_uri
         self.format = format.lower()
         self.aws_access_key_id = aws_access_key_id
         self.aws_secret_access_key = aws_secret_access_key
         self.endpoint_url = endpoint_url
         self.streaming = streaming
+        self.spool_dir = spool_dir
 
     def _get_client(self):
         return boto3.client(
@@ -69,19 +172,77 @@ class S3Sink(Sink):
         key = parsed.path.lstrip('/')
         
         s3 = self._get_client()
-        out = io.BytesIO()
         try:
             if isinstance(df, pl.LazyFrame):
                 df = df.collect()
-                
-            if self.format == "parquet":
-                df.write_parquet(out)
-            elif self.format == "csv":
-                df.write_csv(out)
-            else:
-                raise ConnectionConfigurationError(f"Unsupported S3 format: {self.format}")
-                
-            out.seek(0)
+            out = self._serialize(df)
             s3.upload_fileobj(out, bucket, key)
         except Exception as e:
             raise ConnectionConfigurationError(f"Failed to write to S3 via boto3 ({self.s3_uri}): {e}")
+
+    def _spool(self, path: Path | None = None) -> CsvSink | ParquetSink:
+        if path is None:
+            # Named after the destination, so concurrent runs to different objects never share a spool
+            digest = hashlib.sha1(self.s3_uri.encode("utf-8")).hexdigest()[:12]
+            path = Path(self.spool_dir or tempfile.gettempdir()) / f"detl-s3-spool-{digest}.{self.format}"
+        if self.format == "parquet":
+            return ParquetSink(path)
+        if self.format == "csv":
+            return CsvSink(path)
+        raise ConnectionConfigurationError(f"Unsupported S3 format: {self.format}")
+
+    def begin_batches(self) -> None:
+        self._spooler = self._spool()
+        self._spooler.begin_batches()
+
+    def write_batch(self, df: pl.DataFrame) -> None:
+        self._spooler.write_batch(df)
+
+    def commit_batches(self) -> None:
+        self._spooler.commit_batches()
+        path = self._spooler.path
+        if not path.is_file():
+            # No batches: an existing object is left untouched, as with file sinks
+            return
+        parsed = urlparse(self.s3_uri)
+        try:
+            # upload_file switches to a multipart upload for large spools
+            self._get_client().upload_file(str(path), parsed.netloc, parsed.path.lstrip('/'))
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to write to S3 via boto3 ({self.s3_uri}): {e}")
+        finally:
+            path.unlink(missing_ok=True)
+
+    def abort_batches(self) -> None:
+        self._spooler.abort_batches()
+
+    def checkpoint_batches(self) -> Dict[str, Any]:
+        return {"spool": str(self._spooler.path), **self._spooler.checkpoint_batches()}
+
+    def resume_batches(self, state: Dict[str, Any]) -> None:
+        self._spooler = self._spool(Path(state["spool"]))
+        self._spooler.resume_batches(state)
+
+    def suspend_batches(self) -> None:
+        self._spooler.suspend_batches()
+
+    def _serialize(self, df: pl.DataFrame) -> io.BytesIO:
+        out = io.BytesIO()
+        if self.format == "parquet":
+            df.write_parquet(out)
+        elif self.format == "csv":
+            df.write_csv(out)
+        else:
+            raise ConnectionConfigurationError(f"Unsupported S3 format: {self.format}")
+        out.seek(0)
+        return out
+
+    def fingerprint(self) -> str | None:
+        if not self.s3_uri.startswith("s3://"):
+            return None
+        parsed = urlparse(self.s3_uri)
+        try:
+            etag = self._get_client().head_object(Bucket=parsed.netloc, Key=parsed.path.lstrip('/'))["ETag"]
+        except Exception:
+            return None
+        return f"{self.s3_uri}:{etag}"
@@ -1,7 +1,27 @@
+import hashlib
+from datetime import date, datetime
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
 import polars as pl
-from detl.connectors.base import Source, Sink
+from detl.connectors.base import SizeEstimate, Source, Sink
+from detl.connectors.database.pool import POOL, _redact_uri
 from detl.exceptions import ConnectionConfigurationError
 
+# Rows fetched to measure the average row width when estimating the query's result size
+WIDTH_SAMPLE_ROWS = 1_000
+
+def _sql_literal(value: Any) -> str:
+    """Renders a watermark as a SQL literal. Strings are quoted with standard '' escaping."""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime):
+        return f"'{value.isoformat(sep=' ')}'"
+    if isinstance(value, date):
+        return f"'{value.isoformat()}'"
+    return "'" + str(value).replace("'", "''") + "'"
+
 class DatabaseSource(Source):
     def __init__(self, connection_uri: str, query: str, batch_size: int | None = None):
         self.connection_uri = connection_uri
@@ -16,33 +36,295 @@ class DatabaseSource(Source):
         except Exception as e:
             raise ConnectionConfigurationError(f"Failed to execute database query. Error: {e}")
 
+    def _quote_identifier(self, name: str) -> str:
+        if self.connection_uri.startswith("mysql"):
+            return "`" + name.replace("`", "``") + "`"
+        return '"' + name.replace('"', '""') + '"'
+
+    def read_since(self, column: str, watermark: Any) -> pl.DataFrame:
+        """Wraps the configured query so the database only returns rows past the watermark."""
+        query = (
+            f"SELECT * FROM ({self.query.rstrip().rstrip(';')}) AS detl_incremental "
+            f"WHERE {self._quote_identifier(column)} > {_sql_literal(watermark)}"
+        )
+        try:
+            return pl.read_database_uri(query, self.connection_uri, engine="connectorx")
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to execute incremental database query. Error: {e}")
+
+    def estimate_size(self) -> SizeEstimate | None:
+        """Runs `COUNT(*)` over the query and scales the width of a small sample of its rows."""
+        query = self.query.rstrip().rstrip(';')
+        try:
+            # Two small queries: a pooled connection is cheaper than the handshakes of two fresh ones
+            engine = POOL.engine(self.connection_uri)
+            rows = pl.read_database(f"SELECT COUNT(*) AS n FROM ({query}) AS detl_count", engine)[0, 0]
+            sample = pl.read_database(f"SELECT * FROM ({query}) AS detl_sample LIMIT {WIDTH_SAMPLE_ROWS}", engine)
+        except Exception:
+            # Dialects without LIMIT (or restricted permissions) simply leave the size unknown
+            return None
+        width = sample.estimated_size() / sample.height if sample.height else 0
+        return SizeEstimate(rows=int(rows), bytes=int(rows * width))
+
+    def iter_batches(self, batch_size: int | None = None) -> Iterator[pl.DataFrame]:
+        """Streams the query result through a DB-API cursor in chunks of `batch_size` (default: the connector's `batch_size`)."""
+        yield from self._stream(self.query, batch_size)
+
+    def resume_batches(self, batch_size: int, rows: int, key: str | None = None, after: Any = None) -> Iterator[pl.DataFrame]:
+        """Streams the rest of the query after a checkpoint. The database skips the finished rows, so they aren't sent again.
+
+        Past `key` value `after`, the query needs an `ORDER BY` on `key`; past `rows`, it needs a deterministic order.
+        """
+        query = self.query.rstrip().rstrip(';')
+        if key is not None:
+            query = f"SELECT * FROM ({query}) AS detl_resume WHERE {self._quote_identifier(key)} > {_sql_literal(after)}"
+        elif self.connection_uri.startswith("mysql"):
+            # MySQL and SQLite only take OFFSET after a LIMIT
+            query = f"SELECT * FROM ({query}) AS detl_resume LIMIT 18446744073709551615 OFFSET {int(rows)}"
+        elif self.connection_uri.startswith("sqlite"):
+            query = f"SELECT * FROM ({query}) AS detl_resume LIMIT -1 OFFSET {int(rows)}"
+        else:
+            query = f"SELECT * FROM ({query}) AS detl_resume OFFSET {int(rows)}"
+        yield from self._stream(query, batch_size)
+
+    def _stream(self, query: str, batch_size: int | None) -> Iterator[pl.DataFrame]:
+        batch_size = batch_size or self.batch_size or 100_000
+        try:
+            connection = POOL.engine(self.connection_uri).raw_connection()
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to connect to the database for batched reading. Error: {e}")
+        try:
+            # The raw DB-API connection streams via fetchmany without requiring SQLAlchemy's async extras
+            yield from pl.read_database(query, connection.driver_connection, iter_batches=True, batch_size=batch_size)
+        except ConnectionConfigurationError:
+            raise
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to execute batched database query. Error: {e}")
+        finally:
+            # Returns the connection to the pool
+            connection.close()
+
+    def state_key(self) -> str:
+        digest = hashlib.sha1(self.query.encode("utf-8")).hexdigest()[:12]
+        return f"{type(self).__name__}:{_redact_uri(self.connection_uri)}:{digest}"
+
+    def fingerprint(self, content: bool = False) -> str | None:
+        # Table contents are not inspected: the cache treats the query text as the identity of the input
+        digest = hashlib.sha256(self.query.encode("utf-8")).hexdigest()
+        return f"{type(self).__name__}:{_redact_uri(self.connection_uri)}:{digest}"
+
+# `if_table_exists` strategies. merge and swap load into a helper table first and publish it in one statement
+WRITE_MODES = ("replace", "append", "fail", "merge", "swap")
+STAGE_SUFFIX = "__detl_stage"
+SHADOW_SUFFIX = "__detl_shadow"
+RETIRED_SUFFIX = "__detl_old"
+
+def _dialect(uri: str) -> str:
+    for dialect in ("postgres", "mysql", "sqlite"):
+        if uri.startswith(dialect):
+            return dialect
+    return "other"
+
 class DatabaseSink(Sink):
-    def __init__(self, connection_uri: str, table_name: str, if_table_exists: str = "replace", batch_size: int | None = None):
+    """Writes to a database table.
+
+    Besides Polars' `replace`, `append` and `fail`, `if_table_exists` accepts:
+
+    - `merge`: rows are loaded into a staging table, then upserted into the target in one set-based statement
+      (`INSERT ... ON CONFLICT` on Postgres and SQLite, `ON DUPLICATE KEY UPDATE` on MySQL) keyed on
+      `key_columns`, which need a unique index or primary key on the target. A missing target is created with one.
+    - `swap`: rows are loaded into a shadow table that replaces the target with an atomic rename once complete,
+      so readers see either the old or the new table, never a partial one.
+    """
+    def __init__(
+        self,
+        connection_uri: str,
+        table_name: str,
+        if_table_exists: str = "replace",
+        batch_size: int | None = None,
+        key_columns: List[str] | None = None,
+    ):
         if connection_uri.startswith("mysql://"):
             connection_uri = connection_uri.replace("mysql://", "mysql+pymysql://")
             
         self.connection_uri = connection_uri
         self.table_name = table_name
+        if if_table_exists not in WRITE_MODES:
+            raise ConnectionConfigurationError(f"if_table_exists must be one of {WRITE_MODES}, got: '{if_table_exists}'")
+        if if_table_exists == "merge" and not key_columns:
+            raise ConnectionConfigurationError("if_table_exists='merge' requires key_columns.")
         self.if_table_exists = if_table_exists
+        self.key_columns = list(key_columns or [])
         
         if batch_size is not None and (not isinstance(batch_size, int) or batch_size <= 0):
             raise ConnectionConfigurationError(f"batch_size must be a positive integer, got: {batch_size}")
         self.batch_size = batch_size
+
+    @property
+    def dialect(self) -> str:
+        return _dialect(self.connection_uri)
+
+    @property
+    def load_table(self) -> str:
+        """Table the rows are written to: the target itself, or the staging/shadow table of merge and swap."""
+        suffix = {"merge": STAGE_SUFFIX, "swap": SHADOW_SUFFIX}.get(self.if_table_exists, "")
+        return self.table_name + suffix
+
+    @property
+    def load_mode(self) -> str:
+        """`if_table_exists` for the first write to `load_table`."""
+        return "replace" if self.if_table_exists in ("merge", "swap") else self.if_table_exists
         
     def write(self, df: pl.DataFrame | pl.LazyFrame) -> None:
+        if self.load_table == self.table_name:
+            return self._write(df, self.if_table_exists)
+        self.begin_batches()
+        try:
+            self.write_batch(df.collect() if isinstance(df, pl.LazyFrame) else df)
+        except BaseException:
+            self.abort_batches()
+            raise
+        self.commit_batches()
+
+    def _write(self, df: pl.DataFrame | pl.LazyFrame, if_table_exists: str, table_name: str | None = None) -> None:
+        table_name = table_name or self.table_name
         try:
             if isinstance(df, pl.LazyFrame):
                 df = df.collect()
             
             # Use SQLAlchemy or ADBC depending on dialect support, defaulting to SQLAlchemy 
             # for generic DBs like MySQL which lack primary ADBC python inserts.
-            engine = "adbc" if "sqlite" in self.connection_uri or "postgres" in self.connection_uri else "sqlalchemy"
-            
-            df.write_database(
-                table_name=self.table_name,
-                connection=self.connection_uri,
-                if_table_exists=self.if_table_exists,
-                engine=engine
+            # Both take their connection from the process-wide pool rather than opening one per write
+            if "sqlite" in self.connection_uri or "postgres" in self.connection_uri:
+                with POOL.adbc(self.connection_uri) as connection:
+                    df.write_database(table_name=table_name, connection=connection, if_table_exists=if_table_exists, engine="adbc")
+            else:
+                df.write_database(
+                    table_name=table_name, connection=POOL.engine(self.connection_uri), if_table_exists=if_table_exists, engine="sqlalchemy"
+                )
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to write to database table '{table_name}'. Error: {e}")
+
+    def begin_batches(self) -> None:
+        self._batches_written = 0
+        self._rows_written = 0
+        self._columns: List[str] = []
+
+    def write_batch(self, df: pl.DataFrame) -> None:
+        # The first batch honours `if_table_exists` (e.g. replace); every later batch appends to it
+        self._write(df, "append" if self._batches_written else self.load_mode, self.load_table)
+        self._columns = self._columns or df.columns
+        self._batches_written += 1
+        self._rows_written += df.height
+
+    def commit_batches(self) -> None:
+        if self.load_table != self.table_name and self._batches_written:
+            self.publish(self._columns)
+
+    def abort_batches(self) -> None:
+        if self.load_table != self.table_name and self._batches_written:
+            with self._transaction() as conn:
+                conn.exec_driver_sql(f"DROP TABLE IF EXISTS {self._quote_table(self.load_table)}")
+
+    def checkpoint_batches(self) -> Dict[str, Any]:
+        # Every batch is committed by the database as it is written, so the counts are all there is to keep
+        return {"batches": self._batches_written, "rows": self._rows_written, "columns": self._columns}
+
+    def resume_batches(self, state: Dict[str, Any]) -> None:
+        self.begin_batches()
+        self._batches_written, self._rows_written, self._columns = state["batches"], state["rows"], state["columns"]
+        if not self._batches_written or self.load_mode == "append":
+            # Rows already in an appended-to table can't be told apart from this run's
+            return
+        with self._transaction() as conn:
+            rows = conn.exec_driver_sql(f"SELECT COUNT(*) FROM {self._quote_table(self.load_table)}").scalar()
+        if rows != self._rows_written:
+            raise ConnectionConfigurationError(
+                f"Table '{self.load_table}' holds {rows} rows but the checkpoint recorded {self._rows_written}; "
+                "it was changed after the checkpoint. Rerun without resuming."
             )
+
+    def suspend_batches(self) -> None:
+        pass
+
+    def publish(self, columns: List[str]) -> None:
+        """Merges or swaps the loaded `load_table` into the target, in one transaction where the database allows."""
+        missing = [k for k in self.key_columns if k not in columns]
+        if missing:
+            raise ConnectionConfigurationError(f"Key columns {missing} are not in the data written to '{self.table_name}'.")
+        try:
+            with self._transaction() as conn:
+                if not self._has_table(conn, self.table_name):
+                    self._rename(conn, self.load_table, self.table_name)
+                    if self.key_columns:
+                        conn.exec_driver_sql(self._unique_index_sql())
+                elif self.if_table_exists == "merge":
+                    conn.exec_driver_sql(self._merge_sql(columns))
+                    conn.exec_driver_sql(f"DROP TABLE {self._quote_table(self.load_table)}")
+                elif self.dialect == "mysql":
+                    retired = self._quote_table(self.table_name + RETIRED_SUFFIX)
+                    # One RENAME TABLE statement swaps both atomically
+                    conn.exec_driver_sql(
+                        f"RENAME TABLE {self._quote_table(self.table_name)} TO {retired}, "
+                        f"{self._quote_table(self.load_table)} TO {self._quote_table(self.table_name)}"
+                    )
+                    conn.exec_driver_sql(f"DROP TABLE {retired}")
+                else:
+                    # Postgres and SQLite run DDL inside the transaction, so the two renames commit together
+                    self._rename(conn, self.table_name, self.table_name + RETIRED_SUFFIX)
+                    self._rename(conn, self.load_table, self.table_name)
+                    conn.exec_driver_sql(f"DROP TABLE {self._quote_table(self.table_name + RETIRED_SUFFIX)}")
+        except ConnectionConfigurationError:
+            raise
         except Exception as e:
-            raise ConnectionConfigurationError(f"Failed to write to database table '{self.table_name}'. Error: {e}")
+            raise ConnectionConfigurationError(f"Failed to {self.if_table_exists} into database table '{self.table_name}'. Error: {e}")
+
+    def _merge_sql(self, columns: List[str]) -> str:
+        target, source = self._quote_table(self.table_name), self._quote_table(self.load_table)
+        names = ", ".join(self._quote(c) for c in columns)
+        updates = [c for c in columns if c not in self.key_columns]
+        if self.dialect == "mysql":
+            assignments = ", ".join(f"{self._quote(c)} = detl_new.{self._quote(c)}" for c in updates or self.key_columns[:1])
+            return (
+                f"INSERT INTO {target} ({names}) SELECT * FROM (SELECT {names} FROM {source}) AS detl_new "
+                f"ON DUPLICATE KEY UPDATE {assignments}"
+            )
+        keys = ", ".join(self._quote(k) for k in self.key_columns)
+        action = "DO UPDATE SET " + ", ".join(f"{self._quote(c)} = excluded.{self._quote(c)}" for c in updates) if updates else "DO NOTHING"
+        # SQLite needs a WHERE to tell the upsert's ON CONFLICT apart from a join constraint
+        return f"INSERT INTO {target} ({names}) SELECT {names} FROM {source} WHERE true ON CONFLICT ({keys}) {action}"
+
+    def _unique_index_sql(self) -> str:
+        schema, _, name = self.table_name.rpartition(".")
+        index = self._quote(name + "__detl_key")
+        keys = ", ".join(self._quote(k) for k in self.key_columns)
+        if self.dialect == "sqlite" and schema:
+            # SQLite qualifies the index rather than the table
+            return f"CREATE UNIQUE INDEX {self._quote(schema)}.{index} ON {self._quote(name)} ({keys})"
+        # Elsewhere the index lives in its table's schema
+        return f"CREATE UNIQUE INDEX {index} ON {self._quote_table(self.table_name)} ({keys})"
+
+    def _rename(self, conn: Any, old: str, new: str) -> None:
+        if self.dialect == "mysql":
+            conn.exec_driver_sql(f"RENAME TABLE {self._quote_table(old)} TO {self._quote_table(new)}")
+        else:
+            conn.exec_driver_sql(f"ALTER TABLE {self._quote_table(old)} RENAME TO {self._quote(new.split('.')[-1])}")
+
+    def _has_table(self, conn: Any, table: str) -> bool:
+        from sqlalchemy import inspect
+
+        schema, _, name = table.rpartition(".")
+        return inspect(conn).has_table(name, schema=schema or None)
+
+    def _quote(self, name: str) -> str:
+        if self.dialect == "mysql":
+            return "`" + name.replace("`", "``") + "`"
+        return '"' + name.replace('"', '""') + '"'
+
+    def _quote_table(self, table: str) -> str:
+        return ".".join(self._quote(part) for part in table.split("."))
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Any]:
+        with POOL.engine(self.connection_uri).begin() as conn:
+            yield conn
@@ -0,0 +1,174 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+from urllib.parse import urlparse
+
+from pydantic import BaseModel
+
+# Defaults of the process-wide pool: connections kept open per database, extra ones allowed under load, and the
+# age in seconds after which a connection is replaced, before servers or proxies drop it as idle
+POOL_SIZE = 5
+POOL_MAX_OVERFLOW = 10
+POOL_RECYCLE = 1800
+POOL_TIMEOUT = 30.0
+
+def _redact_uri(uri: str) -> str:
+    parsed = urlparse(uri)
+    if parsed.password:
+        return uri.replace(f":{parsed.password}@", ":***@", 1)
+    return uri
+
+def _sqlalchemy_uri(uri: str) -> str:
+    # connectorx and ADBC accept these spellings; SQLAlchemy needs the dialect (and driver) names
+    if uri.startswith("postgres://"):
+        return uri.replace("postgres://", "postgresql://", 1)
+    if uri.startswith("mysql://"):
+        return uri.replace("mysql://", "mysql+pymysql://", 1)
+    return uri
+
+def _adbc_connect(uri: str) -> Any:
+    if uri.startswith("sqlite"):
+        import adbc_driver_sqlite.dbapi
+
+        return adbc_driver_sqlite.dbapi.connect(uri.replace("sqlite:///", "", 1))
+    import adbc_driver_postgresql.dbapi
+
+    return adbc_driver_postgresql.dbapi.connect(uri)
+
+class PoolMetrics(BaseModel):
+    """Connection activity against one database since the pool was created."""
+    connects: int = 0
+    checkouts: int = 0
+    invalidated: int = 0
+
+class ConnectionPool:
+    """Database connections shared by every Database connector of the process, keyed by URI.
+
+    SQLAlchemy engines back the reads streamed in batches, MySQL writes and merge/swap statements; ADBC connections
+    back Postgres and SQLite writes. Both are pooled, so a batched run or a `detl batch` worker going through many
+    jobs opens a handful of connections instead of one per batch. Connections are checked with a cheap query when
+    taken from the pool and replaced if the server dropped them.
+
+    Args:
+        size: Connections kept open per database.
+        max_overflow: Extra connections opened under load, closed again when returned.
+        recycle: Seconds after which a connection is replaced.
+        timeout: Seconds to wait for a free connection before failing.
+    """
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        max_overflow: int = POOL_MAX_OVERFLOW,
+        recycle: int = POOL_RECYCLE,
+        timeout: float = POOL_TIMEOUT,
+    ):
+        self.size = size
+        self.max_overflow = max_overflow
+        self.recycle = recycle
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pools: Dict[Tuple[str, str], Any] = {}
+        self._metrics: Dict[str, PoolMetrics] = {}
+        self._pid = os.getpid()
+
+    def engine(self, uri: str) -> Any:
+        """The pooled SQLAlchemy engine of `uri`."""
+        return self._get("sqlalchemy", uri)
+
+    @contextmanager
+    def adbc(self, uri: str) -> Iterator[Any]:
+        """Borrows a pooled ADBC connection to a Postgres or SQLite `uri`."""
+        connection = self._get("adbc", uri).connect()
+        try:
+            yield connection.driver_connection
+        finally:
+            connection.close()
+
+    def metrics(self) -> Dict[str, PoolMetrics]:
+        """Per database (password redacted), the connections opened, handed out and discarded as broken."""
+        with self._lock:
+            return {uri: m.model_copy() for uri, m in self._metrics.items()}
+
+    def dispose(self) -> None:
+        """Closes every pooled connection. Metrics are kept."""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.dispose()
+
+    def _get(self, kind: str, uri: str) -> Any:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections can't be shared with a forked child; it starts its own pools
+                self._pools, self._pid = {}, os.getpid()
+            pool = self._pools.get((kind, uri))
+            if pool is None:
+                pool = self._pools[(kind, uri)] = self._create(kind, uri)
+            return pool
+
+    def _create(self, kind: str, uri: str) -> Any:
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.exc import DisconnectionError
+        from sqlalchemy.pool import QueuePool
+
+        metrics = self._metrics.setdefault(_redact_uri(uri), PoolMetrics())
+        if kind == "sqlalchemy":
+            pool = create_engine(
+                _sqlalchemy_uri(uri), poolclass=QueuePool, pool_pre_ping=True, pool_size=self.size,
+                max_overflow=self.max_overflow, pool_recycle=self.recycle, pool_timeout=self.timeout,
+            )
+            if uri.startswith("sqlite"):
+                # pysqlite only opens transactions before DML; take over so DDL (merge, swap) is transactional too
+                @event.listens_for(pool, "connect")
+                def _manual_transactions(dbapi_connection, _):
+                    dbapi_connection.isolation_level = None
+
+                @event.listens_for(pool, "begin")
+                def _begin(conn):
+                    conn.exec_driver_sql("BEGIN")
+            target = pool.pool
+        else:
+            pool = target = QueuePool(
+                lambda: _adbc_connect(uri), pool_size=self.size, max_overflow=self.max_overflow,
+                recycle=self.recycle, timeout=self.timeout,
+            )
+
+            # A bare pool has no dialect to ping with, so the health check is done by hand
+            @event.listens_for(target, "checkout")
+            def _ping(dbapi_connection, record, proxy):
+                try:
+                    with dbapi_connection.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                        cursor.fetchall()
+                except Exception as e:
+                    # Makes the pool discard this connection and hand out a fresh one
+                    raise DisconnectionError(str(e))
+
+        @event.listens_for(target, "connect")
+        def _count_connect(dbapi_connection, record):
+            metrics.connects += 1
+
+        @event.listens_for(target, "checkout")
+        def _count_checkout(dbapi_connection, record, proxy):
+            metrics.checkouts += 1
+
+        @event.listens_for(target, "invalidate")
+        def _count_invalidated(dbapi_connection, record, exception):
+            metrics.invalidated += 1
+
+        return pool
+
+# The pool every Database connector uses
+POOL = ConnectionPool()
+
+def configure_pool(
+    size: int = POOL_SIZE,
+    max_overflow: int = POOL_MAX_OVERFLOW,
+    recycle: int = POOL_RECYCLE,
+    timeout: float = POOL_TIMEOUT,
+) -> ConnectionPool:
+    """Changes the limits of the process-wide pool. Open connections are closed and reopened under the new limits."""
+    POOL.dispose()
+    POOL.size, POOL.max_overflow, POOL.recycle, POOL.timeout = size, max_overflow, recycle, timeout
+    return POOL
@@ -1,6 +1,174 @@
+from typing import Any, Dict, List, Tuple
+import polars as pl
+from detl.connectors.base import iter_frame_batches
 from detl.connectors.database.base import DatabaseSource, DatabaseSink
+from detl.exceptions import ConnectionConfigurationError
+
+# Connection settings for bulk loads. synchronous=OFF trades durability during the load for speed: a crash
+# mid-load can corrupt the file, which suits a local staging store but not a system of record
+BULK_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "OFF",
+    "cache_size": -256 * 1024,  # KiB
+    "temp_store": "MEMORY",
+}
+# Rows per transaction in bulk mode when `batch_size` is not set
+BULK_BATCH_ROWS = 500_000
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
 
 class SQLiteSource(DatabaseSource):
     pass
+
 class SQLiteSink(DatabaseSink):
-    pass
+    """SQLite sink with an optional bulk-load mode.
+
+    With `bulk=True`, rows are ingested from Arrow over one ADBC connection tuned by `pragmas` (merged over
+    `BULK_PRAGMAS`), committing every `batch_size` rows. The target's indexes are kept, even on replace; with
+    `defer_indexes`, they are dropped for the load and rebuilt once at the end, which is several times faster
+    than updating them row by row.
+    """
+    def __init__(
+        self,
+        connection_uri: str,
+        table_name: str,
+        if_table_exists: str = "replace",
+        batch_size: int | None = None,
+        bulk: bool = False,
+        pragmas: Dict[str, Any] | None = None,
+        defer_indexes: bool = True,
+        key_columns: List[str] | None = None,
+    ):
+        super().__init__(
+            connection_uri, table_name, if_table_exists=if_table_exists, batch_size=batch_size, key_columns=key_columns
+        )
+        self.bulk = bulk
+        self.pragmas = {**BULK_PRAGMAS, **(pragmas or {})}
+        self.defer_indexes = defer_indexes
+
+    def write(self, df: pl.DataFrame | pl.LazyFrame) -> None:
+        if not self.bulk:
+            return super().write(df)
+        self.begin_batches()
+        try:
+            for batch in iter_frame_batches(df, self.batch_size or BULK_BATCH_ROWS):
+                self.write_batch(batch)
+            if not self._batches_written:
+                # An empty result still replaces (or creates) the table
+                self.write_batch(pl.DataFrame(schema=df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema))
+        except BaseException:
+            self.abort_batches()
+            raise
+        self.commit_batches()
+
+    def begin_batches(self) -> None:
+        super().begin_batches()
+        if not self.bulk:
+            return
+        import adbc_driver_sqlite.dbapi
+
+        try:
+            # Autocommit makes every ingest call its own transaction
+            self._connection = adbc_driver_sqlite.dbapi.connect(self.connection_uri.replace("sqlite:///", "", 1), autocommit=True)
+            self._cursor = self._connection.cursor()
+            for name, value in self.pragmas.items():
+                self._execute(f"PRAGMA {name}={value}")
+        except Exception as e:
+            self._close()
+            raise ConnectionConfigurationError(f"Failed to open SQLite database for bulk load. Error: {e}")
+        self._indexes: List[Tuple[str, str]] = []
+
+    def write_batch(self, df: pl.DataFrame) -> None:
+        if not self.bulk:
+            return super().write_batch(df)
+        try:
+            if not self._batches_written:
+                self._start_load()
+            mode = "replace" if not self._batches_written and self.load_mode == "replace" else "create_append"
+            self._cursor.adbc_ingest(self.load_table, df.to_arrow(), mode=mode)
+            if mode == "replace" and not self.defer_indexes:
+                self._restore_indexes()
+        except ConnectionConfigurationError:
+            raise
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to write to database table '{self.load_table}'. Error: {e}")
+        self._columns = self._columns or df.columns
+        self._batches_written += 1
+        self._rows_written += df.height
+
+    def _start_load(self) -> None:
+        rows = self._execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.load_table,))
+        if rows and self.load_mode == "fail":
+            raise ConnectionConfigurationError(f"Table '{self.table_name}' already exists.")
+        indexes = self._indexes_of_load_table()
+        if self.defer_indexes:
+            self._defer(indexes)
+        elif self.load_mode == "replace":
+            # Dropped with the old table; rebuilt right after the first batch creates the new one
+            self._indexes = indexes
+
+    def _indexes_of_load_table(self) -> List[Tuple[str, str]]:
+        # Indexes created by UNIQUE/PRIMARY KEY constraints have no SQL of their own and stay with the table
+        return self._execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (self.load_table,),
+        )
+
+    def _defer(self, indexes: List[Tuple[str, str]]) -> None:
+        for name, _ in indexes:
+            self._execute(f"DROP INDEX {_quote(name)}")
+        self._indexes = indexes
+
+    def _restore_indexes(self) -> None:
+        indexes, self._indexes = self._indexes, []
+        for _, sql in indexes:
+            self._execute(sql)
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> list:
+        self._cursor.execute(sql, parameters)
+        return self._cursor.fetchall() if self._cursor.description else []
+
+    def _close(self) -> None:
+        for handle in (getattr(self, "_cursor", None), getattr(self, "_connection", None)):
+            if handle is not None:
+                handle.close()
+        self._cursor = self._connection = None
+
+    def commit_batches(self) -> None:
+        if not self.bulk:
+            return super().commit_batches()
+        try:
+            self._restore_indexes()
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to rebuild indexes of table '{self.load_table}'. Error: {e}")
+        finally:
+            self._close()
+        # The ADBC connection is closed first so the merge or swap doesn't wait on its lock
+        super().commit_batches()
+
+    def abort_batches(self) -> None:
+        if not self.bulk:
+            return super().abort_batches()
+        try:
+            # Committed batches stay, as in the non-bulk mode (merge and swap drop their staging table); the table gets
+            # its indexes back either way
+            self._restore_indexes()
+        finally:
+            self._close()
+        super().abort_batches()
+
+    def resume_batches(self, state: Dict[str, Any]) -> None:
+        super().resume_batches(state)
+        if self.bulk and self.defer_indexes and self._batches_written:
+            # The suspended load got its indexes back; they are deferred again until the commit
+            self._defer(self._indexes_of_load_table())
+
+    def suspend_batches(self) -> None:
+        if not self.bulk:
+            return
+        try:
+            # Rebuilt so the table is usable in the meantime, even if the load is never resumed
+            self._restore_indexes()
+        finally:
+            self._close()
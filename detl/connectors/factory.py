@@ -0,0 +1,127 @@
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+from detl.connectors.base import Source, Sink
+from detl.connectors.file.csv import CsvSource, CsvSink
+from detl.connectors.file.parquet import ParquetSource, ParquetSink
+from detl.connectors.file.excel import ExcelSource, ExcelSink
+from detl.connectors.database.postgres import PostgresSource, PostgresSink
+from detl.connectors.database.mysql import MySQLSource, MySQLSink
+from detl.connectors.database.sqlite import SQLiteSource, SQLiteSink
+from detl.connectors.cloud.s3 import S3Source, S3Sink
+
+CONNECTOR_TYPES = ("postgres", "mysql", "sqlite", "csv", "parquet", "excel", "s3")
+
+FILE_EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".xls": "excel",
+    ".xlsx": "excel",
+}
+
+def infer_type(uri: Union[str, Path]) -> str:
+    """Guesses the connector type of a file path or S3 URI from its extension."""
+    if str(uri).startswith("s3://"):
+        return "s3"
+    ext = Path(uri).suffix.lower()
+    if ext not in FILE_EXTENSIONS:
+        raise ValueError(f"Unsupported file format: {ext}")
+    return FILE_EXTENSIONS[ext]
+
+def make_source(
+    stype: str | None,
+    uri: Union[str, Path],
+    query: str | None = None,
+    batch_size: int | None = None,
+    format: str | None = None,
+    endpoint_url: str | None = None,
+) -> Source:
+    """Instantiate a Source connector from flat settings, as used by the CLI and batch job files.
+
+    Args:
+        stype (str, optional): Connector type. Inferred from the extension of `uri` when omitted.
+        uri (str | Path): Connection string, file path, or S3 URI.
+        query (str, optional): SQL query for database sources.
+        batch_size (int, optional): Chunk size for database reads.
+        format (str, optional): Object format for S3 sources.
+        endpoint_url (str, optional): S3/MinIO endpoint.
+
+    Returns:
+        Source: A configured Source connector instance.
+
+    Raises:
+        ValueError: If the type is unknown or cannot be inferred.
+    """
+    stype = stype or infer_type(uri)
+    if stype == "postgres":
+        return PostgresSource(str(uri), query, batch_size=batch_size)
+    if stype == "mysql":
+        return MySQLSource(str(uri), query, batch_size=batch_size)
+    if stype == "sqlite":
+        return SQLiteSource(str(uri), query, batch_size=batch_size)
+    if stype == "csv":
+        return CsvSource(uri)
+    if stype == "parquet":
+        return ParquetSource(uri)
+    if stype == "excel":
+        return ExcelSource(uri)
+    if stype == "s3":
+        s3_kwargs: Dict[str, Any] = {"endpoint_url": endpoint_url}
+        if format:
+            s3_kwargs["format"] = format
+        return S3Source(str(uri), **s3_kwargs)
+    raise ValueError(f"Unknown source type: {stype}")
+
+def make_sink(
+    stype: str | None,
+    uri: Union[str, Path],
+    table: str | None = None,
+    if_table_exists: str | None = None,
+    batch_size: int | None = None,
+    format: str | None = None,
+    endpoint_url: str | None = None,
+    key_columns: List[str] | None = None,
+) -> Sink:
+    """Instantiate a Sink connector from flat settings, as used by the CLI and batch job files.
+
+    Args:
+        stype (str, optional): Connector type. Inferred from the extension of `uri` when omitted.
+        uri (str | Path): Connection string, file path, or S3 URI.
+        table (str, optional): Target table for database sinks.
+        if_table_exists (str, optional): Table collision strategy for database sinks.
+        batch_size (int, optional): Chunk size for database writes.
+        format (str, optional): Object format for S3 sinks.
+        endpoint_url (str, optional): S3/MinIO endpoint.
+        key_columns (List[str], optional): Columns the `merge` strategy of database sinks upserts on.
+
+    Returns:
+        Sink: A configured Sink connector instance.
+
+    Raises:
+        ValueError: If the type is unknown or cannot be inferred.
+    """
+    stype = stype or infer_type(uri)
+    db_kwargs: Dict[str, Any] = {"batch_size": batch_size}
+    if if_table_exists:
+        db_kwargs["if_table_exists"] = if_table_exists
+    if key_columns:
+        db_kwargs["key_columns"] = key_columns
+
+    if stype == "postgres":
+        return PostgresSink(str(uri), table, **db_kwargs)
+    if stype == "mysql":
+        return MySQLSink(str(uri), table, **db_kwargs)
+    if stype == "sqlite":
+        return SQLiteSink(str(uri), table, **db_kwargs)
+    if stype == "csv":
+        return CsvSink(uri)
+    if stype == "parquet":
+        return ParquetSink(uri)
+    if stype == "excel":
+        return ExcelSink(uri)
+    if stype == "s3":
+        s3_kwargs: Dict[str, Any] = {"endpoint_url": endpoint_url}
+        if format:
+            s3_kwargs["format"] = format
+        return S3Sink(str(uri), **s3_kwargs)
+    raise ValueError(f"Unknown sink type: {stype}")
@@ -1,22 +1,52 @@
+import os
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, List, Union
 import polars as pl
-from detl.connectors.base import Source, Sink
+from detl.connectors.base import SizeEstimate, Source, Sink
+from detl.connectors.file.discovery import fingerprint_files, is_multi_file, resolve_files
 from detl.exceptions import ConnectionConfigurationError
 
+# Decoded Arrow data takes about as much memory as the CSV text it was parsed from
+CSV_DECODED_RATIO = 1.0
+
 class CsvSource(Source):
     def __init__(self, path: Union[str, Path], separator: str = ","):
         self.path = Path(path)
         self.separator = separator
         
     def read(self) -> pl.LazyFrame:
-        if not self.path.exists():
-            raise ConnectionConfigurationError(f"CSV source file '{self.path}' not found.")
+        if not is_multi_file(self.path):
+            if not self.path.exists():
+                raise ConnectionConfigurationError(f"CSV source file '{self.path}' not found.")
+            return self.read_files([str(self.path)])
+
+        files = self.discover()
+        if not files:
+            raise ConnectionConfigurationError(f"No CSV files match '{self.path}'.")
+        return self.read_files(files)
+
+    def discover(self) -> List[str]:
+        return resolve_files(self.path, (".csv",))
+
+    def read_files(self, files: List[str]) -> pl.LazyFrame:
         try:
-            return pl.scan_csv(self.path, separator=self.separator)
+            return pl.scan_csv(files if len(files) > 1 else files[0], separator=self.separator)
         except Exception as e:
             raise ConnectionConfigurationError(f"Failed to scan CSV at '{self.path}': {e}")
 
+    def estimate_size(self) -> SizeEstimate | None:
+        files = self.discover()
+        if not files:
+            return None
+        return SizeEstimate(bytes=int(sum(os.path.getsize(f) for f in files) * CSV_DECODED_RATIO), lazy=True)
+
+    def state_key(self) -> str:
+        return f"csv:{self.path.absolute()}"
+
+    def fingerprint(self, content: bool = False) -> str | None:
+        files = self.discover()
+        return fingerprint_files(files, content) if files else None
+
 class CsvSink(Sink):
     def __init__(self, path: Union[str, Path], separator: str = ",", streaming: bool = True):
         self.path = Path(path)
@@ -26,12 +56,60 @@ class CsvSink(Sink):
     def write(self, df: pl.DataFrame | pl.LazyFrame) -> None:
         try:
             self.path.parent.mkdir(parents=True, exist_ok=True)
-            if isinstance(df, pl.LazyFrame):
-                try:
-                    df.collect(streaming=self.streaming).write_csv(self.path, separator=self.separator)
-                except Exception:
-                    df.sink_csv(self.path)
+            if isinstance(df, pl.LazyFrame) and self.streaming:
+                df.sink_csv(self.path, separator=self.separator)
+            elif isinstance(df, pl.LazyFrame):
+                df.collect().write_csv(self.path, separator=self.separator)
             else:
                 df.write_csv(self.path, separator=self.separator)
         except Exception as e:
             raise ConnectionConfigurationError(f"Failed to write CSV to '{self.path}': {e}")
+
+    def streams(self) -> bool:
+        return self.streaming
+
+    def begin_batches(self) -> None:
+        # Batches go to a sibling temp file so readers never observe a half-written CSV
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.detl-tmp")
+        self._handle = open(self._tmp_path, "wb")
+        self._header_written = False
+
+    def write_batch(self, df: pl.DataFrame) -> None:
+        try:
+            df.write_csv(self._handle, separator=self.separator, include_header=not self._header_written)
+            self._header_written = True
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to write CSV batch to '{self.path}': {e}")
+
+    def commit_batches(self) -> None:
+        self._handle.close()
+        if not self._header_written:
+            # No batches means no header to write; an existing output is left untouched
+            self._tmp_path.unlink(missing_ok=True)
+            return
+        os.replace(self._tmp_path, self.path)
+
+    def abort_batches(self) -> None:
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def checkpoint_batches(self) -> Dict[str, Any]:
+        self._handle.flush()
+        return {"tmp_path": str(self._tmp_path), "size": self._handle.tell(), "header_written": self._header_written}
+
+    def resume_batches(self, state: Dict[str, Any]) -> None:
+        self._tmp_path = Path(state["tmp_path"])
+        if not self._tmp_path.is_file() or self._tmp_path.stat().st_size < state["size"]:
+            raise ConnectionConfigurationError(f"The partial CSV '{self._tmp_path}' to resume is missing or shorter than checkpointed.")
+        self._handle = open(self._tmp_path, "r+b")
+        # Drops whatever was written after the checkpoint
+        self._handle.truncate(state["size"])
+        self._handle.seek(state["size"])
+        self._header_written = state["header_written"]
+
+    def suspend_batches(self) -> None:
+        self._handle.close()
+
+    def fingerprint(self) -> str | None:
+        return fingerprint_files([self.path]) if self.path.is_file() else None
@@ -0,0 +1,45 @@
+import glob
+import hashlib
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+GLOB_CHARS = ("*", "?", "[")
+
+def is_multi_file(path: Path) -> bool:
+    """True when the path names a directory or a glob pattern rather than a single file."""
+    return path.is_dir() or any(ch in str(path) for ch in GLOB_CHARS)
+
+def resolve_files(path: Path, suffixes: Sequence[str]) -> List[str]:
+    """Expands a file, directory or glob pattern into a sorted list of absolute file paths.
+
+    Directories are searched recursively for files carrying one of `suffixes`, so Hive-style
+    partitioned layouts (`events/date=2024-01-01/part-0.parquet`) are picked up as well.
+    """
+    if path.is_dir():
+        matches = [p for p in path.rglob("*") if p.is_file() and p.suffix.lower() in suffixes]
+    elif any(ch in str(path) for ch in GLOB_CHARS):
+        matches = [Path(p) for p in glob.glob(str(path), recursive=True) if Path(p).is_file()]
+    elif path.exists():
+        matches = [path]
+    else:
+        matches = []
+    return sorted(str(p.resolve()) for p in matches)
+
+def fingerprint_files(files: Iterable[str | Path], content: bool = False) -> str:
+    """Digest identifying the exact bytes behind `files`.
+
+    By default each file contributes its path, size and modification time, which is free to compute.
+    With `content=True` the file bytes are hashed instead, surviving touches and copies at the cost of a full read.
+    """
+    digest = hashlib.sha256()
+    for f in files:
+        path = Path(f)
+        stat = path.stat()
+        digest.update(f"{path.resolve()}\0{stat.st_size}\0".encode("utf-8"))
+        if content:
+            with open(path, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 20), b""):
+                    digest.update(chunk)
+        else:
+            digest.update(str(stat.st_mtime_ns).encode("utf-8"))
+    return digest.hexdigest()
@@ -1,32 +1,190 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Dict, List, Literal, Union
 import polars as pl
-from detl.connectors.base import Source, Sink
+from detl.connectors.base import SizeEstimate, Source, Sink, iter_frame_batches
+from detl.connectors.file.discovery import fingerprint_files
 from detl.exceptions import ConnectionConfigurationError
 
+# Workbooks are zipped XML; decoded they take about twice the file size
+EXCEL_DECODED_RATIO = 2.0
+# Rows per worksheet in .xlsx, header included
+EXCEL_MAX_ROWS = 1_048_576
+# Rows converted to Python values at a time while writing
+EXCEL_WRITE_BATCH = 50_000
+
 class ExcelSource(Source):
-    def __init__(self, path: Union[str, Path], sheet_name: str | None = None):
+    """Reads a workbook with the calamine engine.
+
+    Args:
+        path: The .xlsx/.xls file.
+        sheet_name: A single sheet to read; the first one when neither this nor `sheets` is set.
+        sheets: Several sheet names, or "all", read in parallel and unioned by column name.
+        sheet_column: With `sheets`, adds a column holding the sheet each row came from.
+    """
+    def __init__(
+        self,
+        path: Union[str, Path],
+        sheet_name: str | None = None,
+        sheets: List[str] | Literal["all"] | None = None,
+        sheet_column: str | None = None,
+    ):
+        if sheet_name is not None and sheets is not None:
+            raise ConnectionConfigurationError("ExcelSource takes either 'sheet_name' or 'sheets', not both.")
         self.path = Path(path)
         self.sheet_name = sheet_name
-        
+        self.sheets = sheets
+        self.sheet_column = sheet_column
+
     def read(self) -> pl.DataFrame:
-        if not self.path.exists():
-            raise ConnectionConfigurationError(f"Excel source file '{self.path}' not found.")
+        if self.sheets is None:
+            self._check_exists()
+            try:
+                return pl.read_excel(self.path, sheet_name=self.sheet_name, engine="calamine")
+            except Exception as e:
+                raise ConnectionConfigurationError(f"Failed to read Excel at '{self.path}': {e}")
+        frames = self.read_sheets()
+        if self.sheet_column is not None:
+            frames = {name: df.with_columns(pl.lit(name).alias(self.sheet_column)) for name, df in frames.items()}
+        # Sheets of one export rarely agree on every column; missing ones are filled with nulls
+        return pl.concat(list(frames.values()), how="diagonal_relaxed")
+
+    def read_sheets(self) -> Dict[str, pl.DataFrame]:
+        """Reads the selected sheets in parallel, one frame per sheet in workbook order."""
+        self._check_exists()
+        names = self.sheet_names() if self.sheets == "all" else list(self.sheets or [])
+        if not names:
+            raise ConnectionConfigurationError(f"No sheets selected in Excel at '{self.path}'.")
+
+        def load(name: str) -> pl.DataFrame:
+            # One reader per sheet: calamine releases the GIL while parsing, but a reader can't be shared
+            return pl.read_excel(self.path, sheet_name=name, engine="calamine")
+
         try:
-            return pl.read_excel(self.path, sheet_name=self.sheet_name)
+            with ThreadPoolExecutor(max_workers=min(len(names), os.cpu_count() or 1)) as pool:
+                return dict(zip(names, pool.map(load, names)))
         except Exception as e:
             raise ConnectionConfigurationError(f"Failed to read Excel at '{self.path}': {e}")
 
+    def sheet_names(self) -> List[str]:
+        self._check_exists()
+        import fastexcel
+
+        return fastexcel.read_excel(self.path).sheet_names
+
+    def _check_exists(self) -> None:
+        if not self.path.exists():
+            raise ConnectionConfigurationError(f"Excel source file '{self.path}' not found.")
+
+    def estimate_size(self) -> SizeEstimate | None:
+        if not self.path.is_file():
+            return None
+        return SizeEstimate(bytes=int(self.path.stat().st_size * EXCEL_DECODED_RATIO))
+
+    def fingerprint(self, content: bool = False) -> str | None:
+        if not self.path.is_file():
+            return None
+        selection = self.sheets if self.sheets is None or isinstance(self.sheets, str) else ",".join(self.sheets)
+        return f"{fingerprint_files([self.path], content)}:{self.sheet_name}:{selection}:{self.sheet_column}"
+
 class ExcelSink(Sink):
-    def __init__(self, path: Union[str, Path], sheet_name: str = "Sheet1"):
+    """Writes a workbook row by row in xlsxwriter's constant-memory mode.
+
+    Only the rows being converted are held in memory: lazy frames are streamed in batches, and each row is flushed
+    to disk once written. Data beyond a sheet's row limit continues on new sheets named `<sheet_name>_2`, `_3`...
+
+    Args:
+        path: The .xlsx file, replaced once the write completes.
+        sheet_name: Name of the first sheet.
+        max_rows_per_sheet: Data rows per sheet before starting the next one. Defaults to Excel's limit.
+    """
+    def __init__(self, path: Union[str, Path], sheet_name: str = "Sheet1", max_rows_per_sheet: int = EXCEL_MAX_ROWS - 1):
         self.path = Path(path)
         self.sheet_name = sheet_name
-        
+        self.max_rows_per_sheet = max_rows_per_sheet
+
     def write(self, df: pl.DataFrame | pl.LazyFrame) -> None:
+        self.begin_batches()
         try:
-            self.path.parent.mkdir(parents=True, exist_ok=True)
-            if isinstance(df, pl.LazyFrame):
-                df = df.collect()
-            df.write_excel(self.path, worksheet=self.sheet_name)
+            for batch in iter_frame_batches(df, EXCEL_WRITE_BATCH):
+                self.write_batch(batch)
+            if self._sheet is None:
+                # An empty result still gets its header row
+                self._columns = (df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema).names()
+                self._next_sheet()
+        except BaseException:
+            self.abort_batches()
+            raise
+        self.commit_batches()
+
+    def streams(self) -> bool:
+        return True
+
+    def begin_batches(self) -> None:
+        import xlsxwriter
+
+        # Written to a sibling temp file so readers never observe a half-written workbook
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.detl-tmp")
+        # Strings are always stored as text: a value such as "=1+1" must not turn into a formula (or a link)
+        self._workbook = xlsxwriter.Workbook(str(self._tmp_path), {
+            "constant_memory": True, "nan_inf_to_errors": True, "remove_timezone": True,
+            "strings_to_formulas": False, "strings_to_urls": False,
+        })
+        self._date_formats = {
+            pl.Date: self._workbook.add_format({"num_format": "yyyy-mm-dd"}),
+            pl.Datetime: self._workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"}),
+            pl.Time: self._workbook.add_format({"num_format": "hh:mm:ss"}),
+        }
+        self._sheet = None
+        self._sheets = 0
+        self._row = 0
+        self._columns: List[str] | None = None
+
+    def _next_sheet(self) -> None:
+        self._sheets += 1
+        name = self.sheet_name if self._sheets == 1 else f"{self.sheet_name}_{self._sheets}"
+        self._sheet = self._workbook.add_worksheet(name)
+        self._sheet.write_row(0, 0, self._columns)
+        self._row = 0
+
+    def write_batch(self, df: pl.DataFrame) -> None:
+        try:
+            if self._columns is None:
+                self._columns = df.columns
+            formats = [self._date_formats.get(dtype.base_type()) for dtype in df.dtypes]
+            start = 0
+            while start < df.height:
+                if self._sheet is None or self._row == self.max_rows_per_sheet:
+                    self._next_sheet()
+                chunk = df.slice(start, self.max_rows_per_sheet - self._row)
+                for row in chunk.iter_rows():
+                    self._row += 1
+                    for col, (value, fmt) in enumerate(zip(row, formats)):
+                        if value is not None:
+                            self._sheet.write(self._row, col, value, fmt)
+                start += chunk.height
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to write Excel batch to '{self.path}': {e}")
+
+    def commit_batches(self) -> None:
+        if self._sheet is None:
+            # No batches means no header to write; an existing output is left untouched
+            self.abort_batches()
+            return
+        try:
+            self._workbook.close()
         except Exception as e:
+            self._tmp_path.unlink(missing_ok=True)
             raise ConnectionConfigurationError(f"Failed to write Excel to '{self.path}': {e}")
+        os.replace(self._tmp_path, self.path)
+
+    def abort_batches(self) -> None:
+        try:
+            self._workbook.close()
+        finally:
+            self._tmp_path.unlink(missing_ok=True)
+
+    def fingerprint(self) -> str | None:
+        return fingerprint_files([self.path]) if self.path.is_file() else None
@@ -1,7 +1,9 @@
+import os
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, List, Union
 import polars as pl
-from detl.connectors.base import Source, Sink
+from detl.connectors.base import ColumnChunkStats, RowGroup, SizeEstimate, Source, Sink
+from detl.connectors.file.discovery import fingerprint_files, is_multi_file, resolve_files
 from detl.exceptions import ConnectionConfigurationError
 
 class ParquetSource(Source):
@@ -9,13 +11,75 @@ class ParquetSource(Source):
         self.path = Path(path)
         
     def read(self) -> pl.LazyFrame:
-        if not self.path.exists():
-            raise ConnectionConfigurationError(f"Parquet source file '{self.path}' not found.")
+        if not is_multi_file(self.path):
+            if not self.path.exists():
+                raise ConnectionConfigurationError(f"Parquet source file '{self.path}' not found.")
+            return self.read_files([str(self.path)])
+
+        files = self.discover()
+        if not files:
+            raise ConnectionConfigurationError(f"No Parquet files match '{self.path}'.")
+        return self.read_files(files)
+
+    def discover(self) -> List[str]:
+        return resolve_files(self.path, (".parquet",))
+
+    def read_files(self, files: List[str]) -> pl.LazyFrame:
         try:
-            return pl.scan_parquet(self.path)
+            return pl.scan_parquet(files if len(files) > 1 else files[0])
         except Exception as e:
             raise ConnectionConfigurationError(f"Failed to scan Parquet at '{self.path}': {e}")
 
+    def row_groups(self) -> List[RowGroup] | None:
+        import pyarrow.parquet as pq
+        files = [str(self.path)] if not is_multi_file(self.path) else self.discover()
+        groups = []
+        try:
+            for file in files:
+                meta = pq.ParquetFile(file).metadata
+                top_level = set(meta.schema.to_arrow_schema().names)
+                for i in range(meta.num_row_groups):
+                    rg = meta.row_group(i)
+                    columns = {}
+                    for j in range(rg.num_columns):
+                        chunk = rg.column(j)
+                        # Nested fields have dotted paths; only flat columns can be matched to contract columns
+                        if chunk.path_in_schema not in top_level:
+                            continue
+                        stats = chunk.statistics
+                        columns[chunk.path_in_schema] = ColumnChunkStats(
+                            min=stats.min if stats is not None and stats.has_min_max else None,
+                            max=stats.max if stats is not None and stats.has_min_max else None,
+                            null_count=stats.null_count if stats is not None and stats.has_null_count else None,
+                        )
+                    groups.append(RowGroup(file=file, index=i, num_rows=rg.num_rows, columns=columns))
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to read Parquet footer at '{self.path}': {e}")
+        return groups
+
+    def estimate_size(self) -> SizeEstimate | None:
+        """Row count and uncompressed size of every row group, from the file footers."""
+        import pyarrow.parquet as pq
+        files = self.discover()
+        if not files:
+            return None
+        rows = size = 0
+        try:
+            for file in files:
+                meta = pq.ParquetFile(file).metadata
+                rows += meta.num_rows
+                size += sum(meta.row_group(i).total_byte_size for i in range(meta.num_row_groups))
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to read Parquet footer at '{self.path}': {e}")
+        return SizeEstimate(rows=rows, bytes=size, lazy=True)
+
+    def state_key(self) -> str:
+        return f"parquet:{self.path.absolute()}"
+
+    def fingerprint(self, content: bool = False) -> str | None:
+        files = self.discover()
+        return fingerprint_files(files, content) if files else None
+
 class ParquetSink(Sink):
     def __init__(self, path: Union[str, Path], streaming: bool = True):
         self.path = Path(path)
@@ -24,9 +88,99 @@ class ParquetSink(Sink):
     def write(self, df: pl.DataFrame | pl.LazyFrame) -> None:
         try:
             self.path.parent.mkdir(parents=True, exist_ok=True)
-            if isinstance(df, pl.LazyFrame):
+            if isinstance(df, pl.LazyFrame) and self.streaming:
                 df.sink_parquet(self.path)
+            elif isinstance(df, pl.LazyFrame):
+                df.collect().write_parquet(self.path)
             else:
                 df.write_parquet(self.path)
         except Exception as e:
             raise ConnectionConfigurationError(f"Failed to write Parquet to '{self.path}': {e}")
+
+    def streams(self) -> bool:
+        return self.streaming
+
+    def begin_batches(self) -> None:
+        # Each batch becomes a row group of a single file, published atomically on commit
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.detl-tmp")
+        self._writer = None
+        # Closed files of a checkpointed write; their row groups are copied into one file on commit
+        self._parts: List[Path] = []
+        self._schema = None
+
+    def write_batch(self, df: pl.DataFrame) -> None:
+        import pyarrow.parquet as pq
+        try:
+            table = df.to_arrow()
+            if self._schema is None:
+                self._schema = table.schema
+            elif table.schema != self._schema:
+                table = table.cast(self._schema)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self._tmp_path, self._schema)
+            self._writer.write_table(table)
+        except Exception as e:
+            raise ConnectionConfigurationError(f"Failed to write Parquet batch to '{self.path}': {e}")
+
+    def commit_batches(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._parts.append(self._tmp_path)
+        if not self._parts:
+            # No batches means no schema to write; an existing output is left untouched
+            return
+        if len(self._parts) == 1:
+            os.replace(self._parts[0], self.path)
+            return
+        import pyarrow.parquet as pq
+        merged = self.path.with_name(f".{self.path.name}.detl-merge")
+        try:
+            # Row group by row group, so memory stays at one batch however many parts there are
+            with pq.ParquetWriter(merged, self._schema) as writer:
+                for part in self._parts:
+                    source = pq.ParquetFile(part)
+                    for i in range(source.num_row_groups):
+                        writer.write_table(source.read_row_group(i))
+        except Exception as e:
+            merged.unlink(missing_ok=True)
+            raise ConnectionConfigurationError(f"Failed to write Parquet to '{self.path}': {e}")
+        os.replace(merged, self.path)
+        for part in self._parts:
+            part.unlink(missing_ok=True)
+
+    def abort_batches(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+        for part in self._parts:
+            part.unlink(missing_ok=True)
+
+    def checkpoint_batches(self) -> Dict[str, Any]:
+        # A Parquet file can't be reopened for appending, so each checkpoint closes the current file as a part
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._parts.append(self._tmp_path)
+            self._tmp_path = self.path.with_name(f".{self.path.name}.detl-tmp{len(self._parts)}")
+        return {"parts": [str(p) for p in self._parts]}
+
+    def resume_batches(self, state: Dict[str, Any]) -> None:
+        import pyarrow.parquet as pq
+        self.begin_batches()
+        self._parts = [Path(p) for p in state["parts"]]
+        missing = [str(p) for p in self._parts if not p.is_file()]
+        if missing:
+            raise ConnectionConfigurationError(f"Parquet parts to resume are missing: {missing}")
+        if self._parts:
+            self._schema = pq.read_schema(self._parts[0])
+        self._tmp_path = self.path.with_name(f".{self.path.name}.detl-tmp{len(self._parts)}")
+
+    def suspend_batches(self) -> None:
+        # The open file holds only batches written after the last checkpoint, which the resumed run redoes
+        if self._writer is not None:
+            self._writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def fingerprint(self) -> str | None:
+        return fingerprint_files([self.path]) if self.path.is_file() else None
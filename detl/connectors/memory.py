@@ -1,5 +1,5 @@
 import polars as pl
-from detl.connectors.base import Source, Sink
+from detl.connectors.base import SizeEstimate, Source, Sink
 
 class MemorySource(Source):
     """A simple connector that yields a predefined Polars Frame from memory. Useful for testing."""
@@ -9,6 +9,11 @@ class MemorySource(Source):
     def read(self) -> pl.DataFrame | pl.LazyFrame:
         return self._df
 
+    def estimate_size(self) -> SizeEstimate:
+        if isinstance(self._df, pl.LazyFrame):
+            return SizeEstimate(lazy=True)
+        return SizeEstimate(rows=self._df.height, bytes=self._df.estimated_size())
+
 class MemorySink(Sink):
     """A simple connector that traps the output Frame in memory. Useful for testing."""
     def __init__(self):
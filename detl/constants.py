@@ -7,6 +7,23 @@ class DType(str, Enum):
     BOOLEAN = "boolean"
     DATE = "date"
     DATETIME = "datetime"
+    # Compact storage types
+    INT8 = "int8"
+    INT16 = "int16"
+    INT32 = "int32"
+    UINT8 = "uint8"
+    UINT16 = "uint16"
+    UINT32 = "uint32"
+    UINT64 = "uint64"
+    FLOAT32 = "float32"
+    CATEGORY = "category"
+    ENUM = "enum"
+
+INTEGER_DTYPES = {DType.INT, DType.INT8, DType.INT16, DType.INT32, DType.UINT8, DType.UINT16, DType.UINT32, DType.UINT64}
+FLOAT_DTYPES = {DType.FLOAT, DType.FLOAT32}
+NUMERIC_DTYPES = INTEGER_DTYPES | FLOAT_DTYPES
+# Text columns; `category` and `enum` are validated as strings and only stored compactly afterwards
+STRING_DTYPES = {DType.STRING, DType.CATEGORY, DType.ENUM}
 
 class NullTactic(str, Enum):
     DROP_ROW = "drop_row"
@@ -1,3 +1,7 @@
+import asyncio
+import itertools
+from contextlib import ExitStack
+from pathlib import Path
 import polars as pl
 from detl.constants import DType
 from detl.config import Config
@@ -5,30 +9,570 @@ from detl.connectors.base import Source, Sink
 from detl.engine.types import apply_types
 from detl.engine.nulls import handle_nulls
 from detl.engine.constraints import apply_constraints
+from detl.engine.compact import apply_storage, declared_storage, downcast_storage
 from detl.engine.pipeline import apply_pipeline
-from detl.exceptions import DuplicateRowError, ConfigError
+from detl.engine.staging import StagedFrame
+from detl.incremental import IncrementalExtractor
+from detl.cache import CacheEntry, ResultCache, contract_digest
+from detl.fit import StatisticsArtifact
+from detl.batching import PipelineMetrics, batch_blockers, run_pipeline
+from detl.budget import WORKING_SET_FACTOR, ExecutionPlan, format_bytes, parse_memory, plan_execution
+from detl.connectors.base import iter_frame_batches
+from detl.stats import StatsSession, resolve_statistics, take_rows, uses_statistics
+from detl.dedup import KeySession, cross_batch_index, drop_seen, first_repeats
+from detl.engine.checks import violation
+from detl.seen import SeenKeyStore
+from detl.proofs import assume, prove_rules
+from detl.ordering import RuleProfile
+from detl.checkpoint import Checkpoint, CheckpointStore
+from detl.incremental import decode_watermark, encode_watermark
+from detl.exceptions import DuplicateRowError, ConfigError, MemoryBudgetError
 
 class Processor:
     """
     Main execution engine that applies a Declarative ETL Data Contract (Config).
+
+    With `max_memory` (bytes, or a size such as "4GB"), `execute` and `aexecute` estimate the input size from
+    source metadata and run in memory, streaming or batched accordingly; see `detl.budget.plan_execution`.
+
+    With `resume`, a batched run of a contract setting `conf.checkpoint` continues from its last checkpoint.
     """
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        cache: ResultCache | None = None,
+        fitted: StatisticsArtifact | None = None,
+        max_memory: int | str | None = None,
+        resume: bool = False,
+    ):
         self.config = config
         self.manifest = config.manifest
+        self.cache = cache
+        self.fitted = fitted
+        self.max_memory = parse_memory(max_memory) if max_memory is not None else None
+        self.resume = resume
+        # The checkpoint the last batched run resumed from, if any
+        self.resumed: Checkpoint | None = None
+        self.plan: ExecutionPlan | None = None
+        # Taken before execution hydrates defaults and inferred columns into the manifest
+        self._contract = contract_digest(self.manifest)
+        self.cache_hit = False
         self.df: pl.DataFrame | pl.LazyFrame | None = None
+        self.metrics: PipelineMetrics | None = None
+        self.statistics: StatsSession | None = None
+        self.proven: frozenset = frozenset()
+        self._batched = False
+        self._keys: KeySession | None = None
+        order = self.manifest.conf.rule_order
+        self.rule_profile = RuleProfile(order.profile, order.sample_rows) if order is not None else None
+        self._seen_pending: list = []
+        self._incremental: IncrementalExtractor | None = None
 
     def execute(self, source: Source, sink: Sink | None = None) -> pl.DataFrame | pl.LazyFrame | None:
         """Executes the pipeline mapping source data to an optional sink.
 
+        When the contract declares an `incremental` section, only data past the persisted
+        watermark (or files not yet processed) is read, and the state only advances after the
+        sink has written successfully. If there is nothing new, the sink is not called.
+
+        With a `ResultCache`, a run whose source fingerprint and contract match a stored entry
+        replays the stored output instead, and skips the sink write if the sink is unchanged since.
+
         Args:
             source (Source): The configured data extraction connector.
             sink (Sink, optional): The configured data loading connector. Defaults to None.
 
         Returns:
             pl.DataFrame | pl.LazyFrame | None: Transformed dataframe if sink is not provided.
+
+        Raises:
+            MemoryBudgetError: Under `max_memory`, if the run cannot fit into the budget.
         """
-        df = source.read()
+        self.cache_hit = False
+        self._seen_pending = []
+        self.statistics = self._fitted_session()
+        cache_key = self._cache_key(source)
+        if cache_key is not None:
+            entry = self.cache.lookup(cache_key)
+            if entry is not None:
+                self.cache_hit = True
+                return self._replay(entry, sink)
+
+        plan = self._plan(source, sink)
+        if plan is not None and plan.strategy == "batched":
+            self.execute_batches(source, sink, batch_size=plan.batch_size)
+            return None
+        if self.resume:
+            raise ConfigError("Only batched runs write checkpoints; resume with a batch size.")
+
+        df = self._extract(source)
+        if df is None:
+            self.df = None
+            return None
+        if plan is not None and plan.strategy == "in_memory":
+            df = self._materialize(df)
+
+        self.proven = self._prove(source, df)
+        df = self._apply_contract(df)
+        entry = None
+        if cache_key is not None:
+            entry = self.cache.store(cache_key, df)
+            df = entry.scan()
+        self.df = df
         
+        if sink is not None:
+            sink.write(df)
+            self._finish_write(sink, entry)
+            return None
+            
+        return df
+
+    async def aexecute(self, source: Source, sink: Sink | None = None) -> pl.DataFrame | pl.LazyFrame | None:
+        """Asynchronous counterpart of `execute` for applications running an asyncio event loop.
+
+        Reading and writing go through `Source.aread()` and `Sink.awrite()`, so many concurrent runs
+        overlap their network I/O. The transform, cache and state bookkeeping run in worker threads
+        and never block the loop. Use one Processor per concurrent run.
+
+        Args:
+            source (Source): The configured data extraction connector.
+            sink (Sink, optional): The configured data loading connector. Defaults to None.
+
+        Returns:
+            pl.DataFrame | pl.LazyFrame | None: Transformed dataframe if sink is not provided.
+        """
+        self.cache_hit = False
+        self._seen_pending = []
+        self.statistics = self._fitted_session()
+        cache_key = await asyncio.to_thread(self._cache_key, source)
+        if cache_key is not None:
+            entry = await asyncio.to_thread(self.cache.lookup, cache_key)
+            if entry is not None:
+                self.cache_hit = True
+                return await self._areplay(entry, sink)
+
+        # Estimates may query the source (COUNT(*), object listings), so planning stays off the event loop
+        plan = await asyncio.to_thread(self._plan, source, sink)
+        if plan is not None and plan.strategy == "batched":
+            await asyncio.to_thread(self.execute_batches, source, sink, plan.batch_size)
+            return None
+        if self.resume:
+            raise ConfigError("Only batched runs write checkpoints; resume with a batch size.")
+
+        if self.manifest.incremental is None:
+            self._incremental = None
+            df = await source.aread()
+        else:
+            df = await asyncio.to_thread(self._extract, source)
+        if df is None:
+            self.df = None
+            return None
+        if plan is not None and plan.strategy == "in_memory":
+            df = await asyncio.to_thread(self._materialize, df)
+
+        self.proven = await asyncio.to_thread(self._prove, source, df)
+        df = await asyncio.to_thread(self._apply_contract, df)
+        entry = None
+        if cache_key is not None:
+            entry = await asyncio.to_thread(self.cache.store, cache_key, df)
+            df = entry.scan()
+        self.df = df
+
+        if sink is not None:
+            await sink.awrite(df)
+            await asyncio.to_thread(self._finish_write, sink, entry)
+            return None
+
+        return df
+
+    def execute_batches(self, source: Source, sink: Sink, batch_size: int = 100_000, queue_depth: int = 2) -> PipelineMetrics:
+        """Executes the contract batch by batch, overlapping reading, transforming and writing.
+
+        A reader thread pulls batches from `source.iter_batches()`, a transform thread applies the contract
+        to each, and a writer thread hands them to the sink's batched-write protocol. Bounded queues of
+        `queue_depth` batches between the stages provide backpressure, so a database-to-database move runs
+        at the speed of its slowest leg and memory stays bounded. The result cache is not used in this mode.
+
+        Fills that use a column statistic (`fill_mean`, `fill_median`, `fill_most_frequent`, ...) get the
+        same dataset-wide value in every batch. Under `conf.statistics.strategy: two_pass` they are computed
+        by reading the source once more beforehand; `single_pass` estimates them from the first
+        `sample_rows` rows instead. With a `fitted` artifact, its values are used and no extra read happens.
+        The values used are kept on `self.statistics`.
+
+        `unique` constraints and `on_duplicate_rows` hold across the whole run: keys already seen in earlier
+        batches are tracked in a run-wide index configured by `conf.key_index` (exact with spill-to-disk, or
+        a Bloom filter). The first occurrence of a key is the one kept.
+
+        With `conf.checkpoint`, a checkpoint is saved after every batch the sink has written: the source position,
+        the sink's partial output, the statistics and the keys gained by the dedup indexes and `seen_keys`. When
+        the Processor was created with `resume`, the run continues from the last checkpoint: finished batches are
+        neither read again nor written again. The checkpoint is deleted once the run succeeds.
+
+        Args:
+            source (Source): The configured data extraction connector.
+            sink (Sink): The configured data loading connector.
+            batch_size (int): Maximum rows per batch.
+            queue_depth (int): Batches buffered between consecutive stages.
+
+        Returns:
+            PipelineMetrics: Wall time plus per-stage busy and waiting times, also kept on `self.metrics`.
+
+        Raises:
+            ConfigError: If the contract uses features that need the whole dataset at once, or checkpoints
+                to a sink that can't resume a batched write, or the checkpoint is from another contract,
+                source or sink.
+        """
+        if batch_size <= 0:
+            raise ConfigError(f"batch_size must be a positive integer, got: {batch_size}")
+        blockers = batch_blockers(self.manifest)
+        if blockers:
+            raise ConfigError(
+                "The contract cannot run in batches because these features need the whole dataset at once: "
+                + ", ".join(blockers)
+            )
+
+        store = self._checkpoint_store(sink)
+        checkpoint = self._load_checkpoint(store, source, sink)
+
+        self.cache_hit = False
+        self.df = None
+        self._seen_pending = []
+        self.statistics = self._fitted_session()
+        if checkpoint is not None and checkpoint.statistics is not None:
+            self.statistics = checkpoint.statistics.session(self.manifest.conf.statistics, self._contract)
+        make_batches, resume_batches = self._batch_readers(source, batch_size)
+        self._batched = True
+        try:
+            make_batches = self._fit_batch_statistics(make_batches)
+            self._reset_keys(journal=store is not None)
+            if store is None:
+                self.metrics = run_pipeline(make_batches(), self._apply_contract, sink, queue_depth=queue_depth)
+            else:
+                checkpoint = self._start_checkpoint(store, checkpoint, source, sink)
+                self._run_checkpointed(store, checkpoint, make_batches, resume_batches, sink, queue_depth)
+        finally:
+            self._batched = False
+            self._close_keys()
+        self.commit_state()
+        if store is not None:
+            store.clear()
+        return self.metrics
+
+    def _batch_readers(self, source: Source, batch_size: int):
+        """Functions reading the run's batches from the start and from a checkpoint; also proves what the input guarantees.
+
+        An incremental run extracts the rows past its watermark once, up front, and batches that frame.
+        """
+        if self.manifest.incremental is None:
+            self._incremental = None
+            self.proven = self._prove(source)
+
+            def make_batches():
+                return source.iter_batches(batch_size)
+
+            def resume_batches(c: Checkpoint):
+                return source.resume_batches(batch_size, c.rows, c.key, decode_watermark(c.after))
+            return make_batches, resume_batches
+
+        df = self._extract(source)
+        self.proven = self._prove(source, df) if df is not None else frozenset()
+
+        def make_batches():
+            return iter_frame_batches(df, batch_size) if df is not None else iter(())
+
+        def resume_batches(c: Checkpoint):
+            if df is None:
+                return iter(())
+            rest = df.filter(pl.col(c.key) > decode_watermark(c.after)) if c.key else df.slice(c.rows)
+            return iter_frame_batches(rest, batch_size)
+        return make_batches, resume_batches
+
+    def _fit_batch_statistics(self, make_batches):
+        """Computes the statistics the contract's fills use, unless fitted or checkpointed values are already set.
+
+        Returns the function reading the run's batches: under `single_pass`, the sampled batches are not read twice.
+        """
+        if self.statistics is not None or not uses_statistics(self.manifest):
+            return make_batches
+        spec = self.manifest.conf.statistics
+
+        def prepare(batch: pl.DataFrame) -> pl.DataFrame | pl.LazyFrame:
+            return self._apply_contract(batch, self._prepare)
+
+        def each_pass(batches_for_pass):
+            # Every statistics pass deduplicates from scratch, exactly like the final run will
+            def start():
+                self._reset_keys()
+                return batches_for_pass()
+            return start
+
+        if spec.strategy != "single_pass":
+            self.statistics = resolve_statistics(spec, each_pass(make_batches), prepare)
+            return make_batches
+        sample, rest = take_rows(make_batches(), spec.sample_rows)
+
+        def sampled():
+            return sample
+
+        def sampled_then_rest():
+            return itertools.chain(sample, rest)
+        self.statistics = resolve_statistics(spec, each_pass(sampled), prepare)
+        return sampled_then_rest
+
+    def _start_checkpoint(self, store: CheckpointStore, checkpoint: Checkpoint | None, source: Source, sink: Sink) -> Checkpoint:
+        """Saves the checkpoint a run starts from: the loaded one, or a fresh one, with the run's statistics."""
+        if checkpoint is None:
+            checkpoint = Checkpoint(contract=self._contract, source=source.state_key(), sink=type(sink).__name__, key=store.key)
+        if self.statistics is not None:
+            checkpoint.statistics = StatisticsArtifact.from_session(self.statistics, self._contract)
+        store.save(checkpoint)
+        return checkpoint
+
+    def _checkpoint_store(self, sink: Sink) -> CheckpointStore | None:
+        spec = self.manifest.conf.checkpoint
+        if spec is None:
+            if self.resume:
+                raise ConfigError("Resuming needs a contract with a 'conf.checkpoint' section.")
+            return None
+        if type(sink).checkpoint_batches is Sink.checkpoint_batches:
+            raise ConfigError(f"{type(sink).__name__} cannot resume a batched write, so it can't be used with 'conf.checkpoint'.")
+        return CheckpointStore(spec)
+
+    def _load_checkpoint(self, store: CheckpointStore | None, source: Source, sink: Sink) -> Checkpoint | None:
+        """The checkpoint to resume from. Without `resume`, any previous checkpoint is discarded."""
+        self.resumed = None
+        if store is None:
+            return None
+        if not self.resume:
+            store.clear()
+            return None
+        checkpoint = store.load()
+        if checkpoint is None:
+            return None
+        mismatches = [
+            name for name, saved, current in (
+                ("contract", checkpoint.contract, self._contract),
+                ("source", checkpoint.source, source.state_key()),
+                ("sink", checkpoint.sink, type(sink).__name__),
+                ("key", checkpoint.key, store.key),
+            ) if saved != current
+        ]
+        if mismatches:
+            raise ConfigError(
+                f"Checkpoint '{store.path}' was written with a different {', '.join(mismatches)}; rerun without resuming."
+            )
+        self.resumed = checkpoint.model_copy()
+        return checkpoint
+
+    def _run_checkpointed(self, store: CheckpointStore, checkpoint: Checkpoint, make_batches, resume_batches, sink: Sink, queue_depth: int) -> None:
+        """Runs the pipeline, saving `checkpoint` after each batch the sink has written."""
+        resumed = checkpoint.batches > 0
+        if resumed:
+            for name, files in checkpoint.key_index.items():
+                self._keys.restore(name, store.read_keys(files))
+            if checkpoint.seen_keys:
+                self._seen_pending.append(store.read_keys(checkpoint.seen_keys))
+            sink.resume_batches(checkpoint.sink_state)
+
+        # Filled by the transform thread per batch, consumed by the writer thread once the sink has the batch
+        progress: dict = {}
+        position = {"batch": checkpoint.batches, "rows": checkpoint.rows, "after": decode_watermark(checkpoint.after)}
+        seen_mark = len(self._seen_pending)
+
+        def transform(batch: pl.DataFrame) -> pl.DataFrame:
+            nonlocal seen_mark
+            out = self._apply_contract(batch)
+            if isinstance(out, pl.LazyFrame):
+                out = out.collect()
+            position["batch"] += 1
+            position["rows"] += batch.height
+            if checkpoint.key is not None:
+                if checkpoint.key not in batch.columns:
+                    raise ConfigError(f"Checkpoint key '{checkpoint.key}' is not a column of the source.")
+                top = batch.get_column(checkpoint.key).max()
+                if top is not None and (position["after"] is None or top > position["after"]):
+                    position["after"] = top
+            seen, seen_mark = self._seen_pending[seen_mark:], len(self._seen_pending)
+            progress[position["batch"]] = (dict(position), self._keys.drain(), seen)
+            return out
+
+        def on_written(_: int) -> None:
+            number = checkpoint.batches + 1
+            at, keys, seen = progress.pop(number)
+            for name, added in keys.items():
+                checkpoint.key_index.setdefault(name, []).append(store.write_keys(number, name, added))
+            if seen:
+                checkpoint.seen_keys.append(store.write_keys(number, "seen_keys", pl.concat([s.lazy() for s in seen]).collect()))
+            checkpoint.batches, checkpoint.rows = number, at["rows"]
+            checkpoint.after = encode_watermark(at["after"]) if at["after"] is not None else None
+            checkpoint.sink_state = sink.checkpoint_batches()
+            store.save(checkpoint)
+
+        batches = resume_batches(checkpoint) if resumed else make_batches()
+        self.metrics = run_pipeline(
+            batches, transform, sink, queue_depth=queue_depth,
+            on_written=on_written, resumed=resumed, first_row=checkpoint.rows,
+        )
+
+    def fit(self, source: Source, path: str | Path | None = None, batch_size: int = 100_000) -> StatisticsArtifact:
+        """Computes every statistic the contract's fill rules need and packages them as a reusable artifact.
+
+        The source is read batch by batch; statistics that depend on other fills take one more pass each.
+        Pass the artifact as `Processor(config, fitted=...)` to later runs: they inject the fitted values as
+        literals instead of recomputing them over whatever slice of data they see. Incremental state is
+        neither read nor advanced.
+
+        Args:
+            source (Source): The reference dataset.
+            path (str | Path, optional): Where to save the artifact as JSON.
+            batch_size (int): Maximum rows per batch.
+
+        Returns:
+            StatisticsArtifact: The fitted statistics, tied to this contract's digest.
+        """
+        if batch_size <= 0:
+            raise ConfigError(f"batch_size must be a positive integer, got: {batch_size}")
+        self._batched = True
+        try:
+            session = resolve_statistics(self.manifest.conf.statistics, lambda: source.iter_batches(batch_size), self._prepare)
+        finally:
+            self._batched = False
+        artifact = StatisticsArtifact.from_session(session, self._contract)
+        if path is not None:
+            artifact.save(path)
+        return artifact
+
+    def _plan(self, source: Source, sink: Sink | None) -> ExecutionPlan | None:
+        """Chooses how to run within `max_memory`, from the source's size estimate. None without a budget."""
+        self.plan = None
+        if self.max_memory is None:
+            return None
+        # The default batched write buffers every batch, so only sinks that append incrementally keep memory bounded
+        can_batch = sink is not None and type(sink).write_batch is not Sink.write_batch
+        self.plan = plan_execution(
+            source.estimate_size(),
+            self.max_memory,
+            # Recording seen keys materializes the output, so such runs never stream
+            can_stream=sink is not None and sink.streams() and self.manifest.conf.seen_keys is None,
+            can_batch=can_batch,
+            blockers=batch_blockers(self.manifest),
+            has_sink=sink is not None,
+        )
+        return self.plan
+
+    def _materialize(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame:
+        """Loads the input for an in-memory run, aborting before the transform if the estimate was too low."""
+        if isinstance(df, pl.LazyFrame):
+            df = df.collect()
+        if df.estimated_size() * WORKING_SET_FACTOR > self.max_memory:
+            raise MemoryBudgetError(
+                f"The input takes {format_bytes(df.estimated_size())} in memory, more than estimated; transforming it "
+                f"needs about {format_bytes(df.estimated_size() * WORKING_SET_FACTOR)} but max_memory is {format_bytes(self.max_memory)}.",
+                estimated_bytes=df.estimated_size(),
+                budget=self.max_memory,
+            )
+        return df
+
+    def _fitted_session(self) -> StatsSession | None:
+        if self.fitted is None:
+            return None
+        return self.fitted.session(self.manifest.conf.statistics, self._contract)
+
+    def _prove(self, source: Source, df: pl.DataFrame | pl.LazyFrame | None = None) -> frozenset:
+        """Fail rules the source's file statistics show cannot trigger; their checks are skipped this run."""
+        self._apply_global_defaults()
+        return prove_rules(self.manifest, source, df)
+
+    def _apply_contract(self, df: pl.DataFrame | pl.LazyFrame, step=None) -> pl.DataFrame | pl.LazyFrame:
+        """Runs `step` (default: the full transform) over `df` with the run's statistics, key indexes, proven rules and rule profile active."""
+        step = step or self._transform
+        with ExitStack() as stack:
+            stack.enter_context(assume(self.proven))
+            if self.statistics is not None:
+                stack.enter_context(self.statistics.activate())
+            if self._keys is not None:
+                stack.enter_context(self._keys.activate())
+            if self.rule_profile is not None:
+                stack.enter_context(self.rule_profile.activate())
+            return step(df)
+
+    def _reset_keys(self, journal: bool = False) -> None:
+        """Starts fresh run-wide key indexes for deduplication across batches."""
+        self._close_keys()
+        self._keys = KeySession(self.manifest.conf.key_index, journal=journal)
+
+    def _close_keys(self) -> None:
+        if self._keys is not None:
+            self._keys.close()
+            self._keys = None
+
+    def _finish_write(self, sink: Sink, entry: CacheEntry | None) -> None:
+        """Bookkeeping once a sink write has succeeded: advance incremental state and remember the sink in the cache."""
+        self.commit_state()
+        if entry is not None:
+            entry.record_sink(sink.fingerprint())
+
+    def commit_state(self) -> None:
+        """Persists the incremental state and the seen keys captured by the last `execute`.
+
+        Called automatically once a sink write succeeds. When `execute` is used without a sink,
+        call this after the returned frame has been durably stored.
+        """
+        if self._incremental is not None:
+            self._incremental.commit()
+        if self._seen_pending:
+            self._seen_store().append(pl.concat([keys.lazy() for keys in self._seen_pending]))
+            self._seen_pending = []
+
+    def _cache_key(self, source: Source) -> str | None:
+        # Incremental and seen-keys runs depend on persisted state rather than just the input, so they are never cached
+        if self.cache is None or self.manifest.incremental is not None or self.manifest.conf.seen_keys is not None:
+            return None
+        return self.cache.key(source, self.manifest, *([self.fitted.digest] if self.fitted else []))
+
+    def _replay(self, entry: CacheEntry, sink: Sink | None) -> pl.LazyFrame | None:
+        """Serves a run from the cache, rewriting the sink only if it no longer holds the cached output."""
+        df = entry.scan()
+        self.df = df
+        if sink is None:
+            return df
+        if not entry.has_sink(sink.fingerprint()):
+            sink.write(df)
+            entry.record_sink(sink.fingerprint())
+        return None
+
+    async def _areplay(self, entry: CacheEntry, sink: Sink | None) -> pl.LazyFrame | None:
+        df = entry.scan()
+        self.df = df
+        if sink is None:
+            return df
+        # Sink fingerprints may hit the network (S3 HEAD), so they stay off the event loop
+        if not entry.has_sink(await asyncio.to_thread(sink.fingerprint)):
+            await sink.awrite(df)
+            entry.record_sink(await asyncio.to_thread(sink.fingerprint))
+        return None
+
+    def _extract(self, source: Source) -> pl.DataFrame | pl.LazyFrame | None:
+        self._incremental = None
+        if self.manifest.incremental is None:
+            return source.read()
+
+        self._incremental = IncrementalExtractor(self.manifest.incremental, source)
+        return self._incremental.read()
+
+    def _transform(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+        """Applies the full Data Contract to an extracted frame."""
+        df = self._prepare(df)
+        df = self._handle_duplicates(df)
+        df = self._drop_seen_keys(df)
+        df = self._run_pipeline(df)
+        df = self._remember_seen_keys(df)
+        df = self._apply_outputs(df)
+        df = self._apply_storage(df)
+        return df
+
+    def _prepare(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+        """Applies the column rules: types, null tactics and constraints. Statistics passes stop here."""
         self._apply_global_defaults()
         self._infer_schema(df)
         self._validate_schema_vs_data(df)
@@ -37,16 +581,6 @@ class Processor:
         df = self._apply_types_and_date_formats(df)
         df = self._handle_nulls(df)
         df = self._apply_constraints(df)
-        df = self._handle_duplicates(df)
-        df = self._run_pipeline(df)
-        df = self._apply_outputs(df)
-        
-        self.df = df
-        
-        if sink is not None:
-            sink.write(df)
-            return None
-            
         return df
 
     def _apply_global_defaults(self) -> None:
@@ -107,7 +641,7 @@ class Processor:
         Raises:
             ConfigError: If a mapped column natively does not exist in the source schema.
         """
-        real_cols = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
+        real_cols = set(df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns)
 
         # Check duplicate configurations
         dup_subset = self.manifest.conf.on_duplicate_rows.subset
@@ -115,6 +649,10 @@ class Processor:
             for col in dup_subset:
                 if col not in real_cols:
                     raise ConfigError(f"Subset column '{col}' for duplicate rows check does not exist in the dataset.")
+        seen = self.manifest.conf.seen_keys
+        for col in (seen.subset or []) if seen else []:
+            if col not in real_cols:
+                raise ConfigError(f"Key column '{col}' for seen_keys does not exist in the dataset.")
 
         # Check explicit column mappings and renames
         for col_name, col_def in self.manifest.columns.items():
@@ -123,32 +661,49 @@ class Processor:
 
     def _drop_undefined_columns(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
         if self.manifest.conf.undefined_columns == "drop":
-            defined = list(self.manifest.columns.keys())
+            defined = self.manifest.columns.keys()
             df_cols = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
             keep_cols = [c for c in df_cols if c in defined]
             df = df.select(keep_cols)
         return df
 
-    def _apply_types_and_date_formats(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
-        df_cols = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
+    def _per_column(self, df: pl.DataFrame | pl.LazyFrame, step, wanted) -> pl.DataFrame | pl.LazyFrame:
+        """Applies `step(df, col_name, col_def)` to each present column `wanted` selects, as one staged plan.
+
+        Staging keeps the plan a few nodes deep however many columns the contract has (see `StagedFrame`).
+        """
+        staged = StagedFrame.wrap(df)
+        present = set(staged.columns)
         for col_name, col_def in self.manifest.columns.items():
-            if col_name in df_cols:
-                df = apply_types(df, col_name, col_def)
-        return df
+            if col_name in present and wanted(col_def):
+                staged = StagedFrame.wrap(step(staged, col_name, col_def))
+        return staged.resolve()
+
+    def _apply_types_and_date_formats(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+        return self._per_column(df, apply_types, lambda col_def: True)
 
     def _handle_nulls(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
-        df_cols = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
-        for col_name, col_def in self.manifest.columns.items():
-            if col_name in df_cols and col_def.on_null:
-                df = handle_nulls(df, col_name, col_def)
-        return df
+        return self._per_column(df, handle_nulls, lambda col_def: col_def.on_null)
 
     def _apply_constraints(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
-        df_cols = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
-        for col_name, col_def in self.manifest.columns.items():
-            if col_name in df_cols and col_def.constraints:
-                df = apply_constraints(df, col_name, col_def.constraints)
-        return df
+        return self._per_column(
+            df, lambda staged, col_name, col_def: apply_constraints(staged, col_name, col_def.constraints),
+            lambda col_def: col_def.constraints,
+        )
+
+    def _apply_storage(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+        """Stores compact dtypes (and, under `conf.auto_downcast`, the smallest safe type) as the very last step.
+
+        Dedup, `seen_keys` and the pipeline all work on the contract's logical types, so a narrowed column can't
+        overflow in a `mutate` or miss keys stored by earlier runs.
+        """
+        storage = declared_storage(self.manifest)
+        renames = {col_name: col_def.rename for col_name, col_def in self.manifest.columns.items() if col_def.rename}
+        if self.manifest.conf.auto_downcast:
+            # Batches must share one schema, so batched runs only use ranges the contract itself guarantees
+            named = df.rename({new: old for old, new in renames.items()}, strict=False) if renames else df
+            storage.update(downcast_storage(named, self.manifest, observe=not self._batched))
+        return apply_storage(df, {renames.get(name, name): dtype for name, dtype in storage.items()})
 
     def _handle_duplicates(self, df: pl.DataFrame) -> pl.DataFrame:
         dup_conf = self.manifest.conf.on_duplicate_rows
@@ -157,23 +712,47 @@ class Processor:
 
         if tactic == "keep":
             return df
-            
+
+        index = cross_batch_index("conf.on_duplicate_rows")
         if tactic == "drop_extras":
-            return df.unique(subset=subset, maintain_order=False)
+            return df.unique(subset=subset, maintain_order=False) if index is None else drop_seen(df, subset, index)
 
         if tactic == "fail":
-            dup_check_df = df.group_by(subset).agg(pl.len().alias("count")).filter(pl.col("count") > 1)
-            
-            if isinstance(dup_check_df, pl.LazyFrame):
-                has_duplicates = dup_check_df.select(pl.len() > 0).collect().item()
-            else:
-                has_duplicates = dup_check_df.height > 0
-                
-            if has_duplicates:
-                raise DuplicateRowError("Duplicate rows detected and 'fail' tactic is active.")
+            # Streams the frame and stops at the first repeated key instead of grouping the whole dataset
+            hits = first_repeats(df, subset, index)
+            if hits is not None:
+                raise violation(DuplicateRowError, "Duplicate rows detected and 'fail' tactic is active.", hits)
 
         return df
 
+    def _seen_store(self) -> SeenKeyStore:
+        spec = self.manifest.conf.seen_keys
+        return SeenKeyStore(spec.store, spec.subset or self.manifest.conf.on_duplicate_rows.subset, spec.compact_after)
+
+    def _drop_seen_keys(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+        """Drops rows loaded by previous runs."""
+        if self.manifest.conf.seen_keys is None:
+            return df
+        return self._seen_store().drop_seen(df)
+
+    def _remember_seen_keys(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+        """Remembers the keys of the rows to be written until `commit_state`.
+
+        Runs after the pipeline, so rows it filters out are not recorded and a corrected version of them still loads
+        later. The output is materialized once here: the keys committed are those of the frame the sink gets, not a
+        second scan of a source that may have changed since.
+        """
+        if self.manifest.conf.seen_keys is None:
+            return df
+        keys = self._seen_store().keys
+        if isinstance(df, pl.LazyFrame):
+            df = df.collect()
+        missing = [k for k in keys if k not in df.columns]
+        if missing:
+            raise ConfigError(f"seen_keys columns {missing} are not in the output of the pipeline.")
+        self._seen_pending.append(df.select(keys))
+        return df
+
     def _run_pipeline(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
         if self.manifest.pipeline:
             df = apply_pipeline(df, self.manifest.pipeline)
@@ -182,9 +761,13 @@ class Processor:
     def _apply_outputs(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
         """Applies explicit column renams and format overrides before sinking."""
         # Process structural outputs like Temporal stringifying
-        for col_name, col_def in self.manifest.columns.items():
-            if col_def.date_format and hasattr(col_def.date_format, "out_format") and col_def.date_format.out_format:
-                df = df.with_columns(pl.col(col_name).dt.to_string(col_def.date_format.out_format).alias(col_name))
+        out_formats = [
+            pl.col(col_name).dt.to_string(col_def.date_format.out_format).alias(col_name)
+            for col_name, col_def in self.manifest.columns.items()
+            if col_def.date_format and hasattr(col_def.date_format, "out_format") and col_def.date_format.out_format
+        ]
+        if out_formats:
+            df = df.with_columns(out_formats)
 
         # Process arbitrary column remaps natively
         renames = {old_name: col_def.rename for old_name, col_def in self.manifest.columns.items() if col_def.rename}
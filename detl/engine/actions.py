@@ -3,6 +3,8 @@ from typing import Callable, Union, Dict
 from detl.schema.common import StringViolateAction, NumericViolateAction
 from detl.constants import StringActionTactic, NumericActionTactic
 from detl.exceptions import ConstraintViolationError
+from detl.stats import note_filter, provisional, stat_expr
+from detl.engine.staging import check, declare_rowwise, run_handler
 
 ActionHandler = Callable[
     [pl.DataFrame, str, pl.Expr, Union[StringViolateAction, NumericViolateAction]],
@@ -11,33 +13,29 @@ ActionHandler = Callable[
 
 ACTION_REGISTRY: Dict[str, ActionHandler] = {}
 
-def register_action(tactic_name: str) -> Callable[[ActionHandler], ActionHandler]:
-    """Decorator to register a violation action handler."""
+def register_action(tactic_name: str, rowwise: bool = False) -> Callable[[ActionHandler], ActionHandler]:
+    """Decorator to register a violation action handler; `rowwise` as in `detl.engine.types.register_type`."""
     def decorator(func: ActionHandler) -> ActionHandler:
         ACTION_REGISTRY[tactic_name] = func
+        declare_rowwise(func, rowwise)
         return func
     return decorator
 
-@register_action(StringActionTactic.DROP_ROW)
-@register_action(NumericActionTactic.DROP_ROW)
+@register_action(StringActionTactic.DROP_ROW, rowwise=True)
+@register_action(NumericActionTactic.DROP_ROW, rowwise=True)
 def _handle_drop_row(df: pl.DataFrame, col_name: str, mask: pl.Expr, action) -> pl.DataFrame:
+    note_filter(mask)
     return df.filter(~mask.fill_null(False))
 
-@register_action(StringActionTactic.FAIL)
-@register_action(NumericActionTactic.FAIL)
+@register_action(StringActionTactic.FAIL, rowwise=True)
+@register_action(NumericActionTactic.FAIL, rowwise=True)
 def _handle_fail(df: pl.DataFrame | pl.LazyFrame, col_name: str, mask: pl.Expr, action) -> pl.DataFrame | pl.LazyFrame:
-    checker = df.select(mask.fill_null(False))
-    if isinstance(checker, pl.LazyFrame):
-        has_failed = checker.collect().to_series().any()
-    else:
-        has_failed = checker.to_series().any()
-        
-    if has_failed:
-        raise ConstraintViolationError(f"Constraint failed on column '{col_name}'.")
-    return df
+    if provisional(mask):
+        return df
+    return check(df, mask, ConstraintViolationError, f"Constraint failed on column '{col_name}'.")
 
-@register_action(StringActionTactic.FILL_VALUE)
-@register_action(NumericActionTactic.FILL_VALUE)
+@register_action(StringActionTactic.FILL_VALUE, rowwise=True)
+@register_action(NumericActionTactic.FILL_VALUE, rowwise=True)
 def _handle_fill_value(df: pl.DataFrame, col_name: str, mask: pl.Expr, action) -> pl.DataFrame:
     if getattr(action, "value", None) is None:
         raise ConstraintViolationError(f"'fill_value' requires a 'value' parameter for '{col_name}'.")
@@ -48,25 +46,25 @@ def _handle_fill_value(df: pl.DataFrame, col_name: str, mask: pl.Expr, action) -
 @register_action(NumericActionTactic.FILL_MAX)
 def _handle_fill_max(df: pl.DataFrame, col_name: str, mask: pl.Expr, action) -> pl.DataFrame:
     return df.with_columns(
-        pl.when(mask).then(pl.col(col_name).max()).otherwise(pl.col(col_name)).alias(col_name)
+        pl.when(mask).then(stat_expr(df, col_name, "max")).otherwise(pl.col(col_name)).alias(col_name)
     )
 
 @register_action(NumericActionTactic.FILL_MIN)
 def _handle_fill_min(df: pl.DataFrame, col_name: str, mask: pl.Expr, action) -> pl.DataFrame:
     return df.with_columns(
-        pl.when(mask).then(pl.col(col_name).min()).otherwise(pl.col(col_name)).alias(col_name)
+        pl.when(mask).then(stat_expr(df, col_name, "min")).otherwise(pl.col(col_name)).alias(col_name)
     )
 
 @register_action(NumericActionTactic.FILL_MEAN)
 def _handle_fill_mean(df: pl.DataFrame, col_name: str, mask: pl.Expr, action) -> pl.DataFrame:
     return df.with_columns(
-        pl.when(mask).then(pl.col(col_name).mean()).otherwise(pl.col(col_name)).alias(col_name)
+        pl.when(mask).then(stat_expr(df, col_name, "mean")).otherwise(pl.col(col_name)).alias(col_name)
     )
 
 @register_action(NumericActionTactic.FILL_MEDIAN)
 def _handle_fill_median(df: pl.DataFrame, col_name: str, mask: pl.Expr, action) -> pl.DataFrame:
     return df.with_columns(
-        pl.when(mask).then(pl.col(col_name).median()).otherwise(pl.col(col_name)).alias(col_name)
+        pl.when(mask).then(stat_expr(df, col_name, "median")).otherwise(pl.col(col_name)).alias(col_name)
     )
 
 def apply_violate_action(
@@ -83,4 +81,4 @@ def apply_violate_action(
     if not handler:
         raise ConstraintViolationError(f"Tactic '{action.tactic}' is not supported for action mapping.")
     
-    return handler(df, col_name, mask, action)
+    return run_handler(handler, df, col_name, mask, action)
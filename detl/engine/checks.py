@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+from typing import Iterator, Type
+from contextvars import ContextVar
+
+import polars as pl
+
+from detl.connectors.base import iter_frame_batches
+from detl.exceptions import DataViolationError
+
+ROW_INDEX = "__detl_row"
+SAMPLE_ROWS = 5
+CHECK_BATCH_ROWS = 1_000_000
+
+_ROW_BASE: ContextVar[int] = ContextVar("detl_row_base", default=0)
+
+@contextmanager
+def row_base(offset: int) -> Iterator[None]:
+    """Offsets reported by checks inside this block start at `offset`, e.g. the position of a batch in its stream."""
+    token = _ROW_BASE.set(offset)
+    try:
+        yield
+    finally:
+        _ROW_BASE.reset(token)
+
+def indexed_batches(df: pl.DataFrame | pl.LazyFrame) -> Iterator[pl.DataFrame]:
+    """Streams `df` in check-sized batches carrying each row's offset in `ROW_INDEX`."""
+    base = _ROW_BASE.get()
+    yield from iter_frame_batches(df.with_row_index(ROW_INDEX, offset=base), CHECK_BATCH_ROWS)
+
+def first_violations(df: pl.DataFrame | pl.LazyFrame, mask: pl.Expr, limit: int = SAMPLE_ROWS) -> pl.DataFrame | None:
+    """Finds the first rows matching `mask`, stopping at the first batch that has any.
+
+    A violation near the start of a large lazy frame therefore costs one batch, not a full scan.
+
+    Returns:
+        pl.DataFrame | None: Up to `limit` offending rows with their offsets in `ROW_INDEX`, or None.
+    """
+    for batch in indexed_batches(df):
+        hits = batch.filter(mask.fill_null(False))
+        if hits.height:
+            return hits.head(limit)
+    return None
+
+def violation(error: Type[DataViolationError], message: str, hits: pl.DataFrame) -> DataViolationError:
+    """Builds `error` for the offending rows found by a check."""
+    offset = hits[ROW_INDEX][0]
+    # Internal helper columns (row offsets, custom_expr's `__is_valid`) are not part of the sample
+    return error(f"{message} First offending row: {offset}.", row_offset=offset, sample=hits.select(pl.exclude("^__.*$")))
@@ -0,0 +1,101 @@
+from typing import Any, Dict, List
+
+import polars as pl
+
+from detl.constants import DType
+from detl.engine.constraints import load_allowed_values
+from detl.engine.types import COMPACT_NUMERIC_TYPES
+
+# Signed only: unsigned results wrap around on subtraction in later pipeline stages
+DOWNCAST_INTEGERS = [(pl.Int8, -2**7, 2**7 - 1), (pl.Int16, -2**15, 2**15 - 1), (pl.Int32, -2**31, 2**31 - 1)]
+
+def enum_categories(col_name: str, col_def: Any) -> List[str]:
+    """Categories of an enum column: its `allowed_values`, plus any string the column's rules may fill in."""
+    constraints = col_def.constraints
+    categories = list(load_allowed_values(col_name, constraints.allowed_values))
+    fills = [col_def.on_null.value] if col_def.on_null is not None else []
+    for name in ("regex", "min_length", "max_length", "allowed_values", "custom_expr"):
+        action = getattr(getattr(constraints, name), "violate_action", None)
+        if action is not None:
+            fills.append(action.value)
+    categories += [v for v in fills if isinstance(v, str)]
+    return list(dict.fromkeys(str(v) for v in categories))
+
+def declared_storage(manifest: Any) -> Dict[str, pl.DataType]:
+    """Storage types of the columns declared with a compact dtype."""
+    storage = {}
+    for col_name, col_def in manifest.columns.items():
+        if col_def.dtype in COMPACT_NUMERIC_TYPES:
+            storage[col_name] = COMPACT_NUMERIC_TYPES[col_def.dtype]
+        elif col_def.dtype == DType.CATEGORY:
+            storage[col_name] = pl.Categorical
+        elif col_def.dtype == DType.ENUM:
+            storage[col_name] = pl.Enum(enum_categories(col_name, col_def))
+    return storage
+
+def _declared_bounds(col_def: Any) -> tuple | None:
+    """Range that `min_policy` and `max_policy` guarantee for a column, counting the values they may fill in."""
+    constraints = col_def.constraints
+    if constraints is None or constraints.min_policy is None or constraints.max_policy is None:
+        return None
+    bounds = [constraints.min_policy.threshold, constraints.max_policy.threshold]
+    bounds += [p.violate_action.value for p in (constraints.min_policy, constraints.max_policy) if p.violate_action.value is not None]
+    if not all(isinstance(b, (int, float)) and not isinstance(b, bool) for b in bounds):
+        return None
+    return min(bounds), max(bounds)
+
+def _smallest_integer(low: Any, high: Any) -> pl.DataType | None:
+    for dtype, lo, hi in DOWNCAST_INTEGERS:
+        if lo <= low and high <= hi:
+            return dtype
+    return None
+
+def downcast_storage(df: pl.DataFrame | pl.LazyFrame, manifest: Any, observe: bool = True) -> Dict[str, pl.DataType]:
+    """Smallest safe storage for the `int`, `float` and `string` columns under `conf.auto_downcast`.
+
+    - `int`: the narrowest signed integer holding the range guaranteed by `min_policy`/`max_policy`, or
+      else (with `observe`) the observed min and max.
+    - `string`: `enum` of the `allowed_values` when declared; otherwise (with `observe`) `category` when
+      at most half the values are distinct.
+    - `float` (with `observe`): `float32` when every value survives the round trip unchanged.
+
+    Observing reads the frame once more. Batched runs pass `observe=False` so every batch gets the same schema.
+    """
+    schema = df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema
+    storage: Dict[str, pl.DataType] = {}
+    probes: List[pl.Expr] = []
+    for col_name, col_def in manifest.columns.items():
+        if col_name not in schema:
+            continue
+        col = pl.col(col_name)
+        if col_def.dtype == DType.INT and schema[col_name] == pl.Int64:
+            bounds = _declared_bounds(col_def)
+            if bounds is not None:
+                storage[col_name] = _smallest_integer(*bounds)
+            elif observe:
+                probes += [col.min().alias(f"{col_name}:min"), col.max().alias(f"{col_name}:max")]
+        elif col_def.dtype == DType.STRING and schema[col_name] == pl.String:
+            if col_def.constraints is not None and col_def.constraints.allowed_values is not None:
+                storage[col_name] = pl.Enum(enum_categories(col_name, col_def))
+            elif observe:
+                probes += [col.n_unique().alias(f"{col_name}:distinct"), col.len().alias(f"{col_name}:len")]
+        elif col_def.dtype == DType.FLOAT and schema[col_name] == pl.Float64 and observe:
+            probes.append((col.cast(pl.Float32).cast(pl.Float64) == col).all().alias(f"{col_name}:float32"))
+
+    if probes:
+        observed = df.lazy().select(probes).collect().row(0, named=True)
+        for col_name, col_def in manifest.columns.items():
+            if f"{col_name}:min" in observed and observed[f"{col_name}:min"] is not None:
+                storage[col_name] = _smallest_integer(observed[f"{col_name}:min"], observed[f"{col_name}:max"])
+            elif f"{col_name}:distinct" in observed and observed[f"{col_name}:distinct"] * 2 <= observed[f"{col_name}:len"]:
+                storage[col_name] = pl.Categorical
+            elif observed.get(f"{col_name}:float32"):
+                storage[col_name] = pl.Float32
+    return {name: dtype for name, dtype in storage.items() if dtype is not None}
+
+def apply_storage(df: pl.DataFrame | pl.LazyFrame, storage: Dict[str, pl.DataType]) -> pl.DataFrame | pl.LazyFrame:
+    """Casts columns to their compact storage types. Casts are strict: a value that does not fit is an error, never a silent null."""
+    if not storage:
+        return df
+    schema = df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema
+    return df.with_columns(pl.col(name).cast(dtype) for name, dtype in storage.items() if name in schema)
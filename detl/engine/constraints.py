@@ -8,55 +8,75 @@ from detl.schema.constraints import (
 )
 from detl.exceptions import ConstraintViolationError, DuplicateRowError
 from detl.engine.actions import apply_violate_action
+from detl.dedup import cross_batch_index, drop_seen, first_repeats
+from detl.engine.checks import violation
+from detl.engine.staging import column_dtype, declare_rowwise, run_handler
+from detl.proofs import proven
+from detl.patterns import pattern_mask
 
 ConstraintHandler = Callable[[pl.DataFrame, str, Any], pl.DataFrame]
 
 CONSTRAINT_REGISTRY: Dict[str, ConstraintHandler] = {}
 
-def register_constraint(constraint_name: str) -> Callable[[ConstraintHandler], ConstraintHandler]:
-    """Decorator to register a data quality constraint evaluator."""
+def register_constraint(constraint_name: str, rowwise: bool = False) -> Callable[[ConstraintHandler], ConstraintHandler]:
+    """Decorator to register a data quality constraint evaluator.
+
+    `rowwise` as in `detl.engine.types.register_type`; the violate action of the policy declares its own.
+    """
     def decorator(func: ConstraintHandler) -> ConstraintHandler:
         CONSTRAINT_REGISTRY[constraint_name] = func
+        declare_rowwise(func, rowwise)
         return func
     return decorator
 
-@register_constraint("min_policy")
+@register_constraint("min_policy", rowwise=True)
 def _apply_min_policy(df: pl.DataFrame, col_name: str, policy: MinPolicy) -> pl.DataFrame:
+    if policy.violate_action.tactic == "fail" and proven(f"columns.{col_name}.min_policy"):
+        return df
     return apply_violate_action(df, col_name, pl.col(col_name) < policy.threshold, policy.violate_action)
 
-@register_constraint("max_policy")
+@register_constraint("max_policy", rowwise=True)
 def _apply_max_policy(df: pl.DataFrame, col_name: str, policy: MaxPolicy) -> pl.DataFrame:
+    if policy.violate_action.tactic == "fail" and proven(f"columns.{col_name}.max_policy"):
+        return df
     return apply_violate_action(df, col_name, pl.col(col_name) > policy.threshold, policy.violate_action)
 
-@register_constraint("regex")
+@register_constraint("regex", rowwise=True)
 def _apply_regex(df: pl.DataFrame, col_name: str, policy: RegexPolicy) -> pl.DataFrame:
-    return apply_violate_action(df, col_name, ~pl.col(col_name).str.contains(policy.pattern), policy.violate_action)
+    mask = ~pattern_mask(pl.col(col_name), policy.patterns, policy.match)
+    return apply_violate_action(df, col_name, mask, policy.violate_action)
 
-@register_constraint("min_length")
+@register_constraint("min_length", rowwise=True)
 def _apply_min_length(df: pl.DataFrame, col_name: str, policy: StringLengthPolicy) -> pl.DataFrame:
     return apply_violate_action(df, col_name, pl.col(col_name).str.len_chars() < policy.length, policy.violate_action)
 
-@register_constraint("max_length")
+@register_constraint("max_length", rowwise=True)
 def _apply_max_length(df: pl.DataFrame, col_name: str, policy: StringLengthPolicy) -> pl.DataFrame:
     return apply_violate_action(df, col_name, pl.col(col_name).str.len_chars() > policy.length, policy.violate_action)
 
-@register_constraint("allowed_values")
-def _apply_allowed_values(df: pl.DataFrame, col_name: str, policy: AllowedValuesPolicy) -> pl.DataFrame:
-    valid_set = []
+def load_allowed_values(col_name: str, policy: AllowedValuesPolicy) -> list:
+    """The permitted values of an `allowed_values` policy, read from its `source` file when not inline."""
     if policy.values is not None:
-        valid_set = policy.values
-    elif policy.source is not None:
-        path = Path(policy.source)
-        if not path.exists():
-            raise ConstraintViolationError(f"Allowed values source '{path}' not found for column '{col_name}'.")
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            if path.suffix == ".csv" or policy.separator in content:
-                valid_set = [x.strip() for x in content.split(policy.separator) if x.strip()]
-            else:
-                valid_set = [line.strip() for line in content.splitlines() if line.strip()]
+        return policy.values
+    path = Path(policy.source)
+    if not path.exists():
+        raise ConstraintViolationError(f"Allowed values source '{path}' not found for column '{col_name}'.")
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read().strip()
+        if path.suffix == ".csv" or policy.separator in content:
+            return [x.strip() for x in content.split(policy.separator) if x.strip()]
+        return [line.strip() for line in content.splitlines() if line.strip()]
 
-    return apply_violate_action(df, col_name, ~pl.col(col_name).is_in(valid_set), policy.violate_action)
+@register_constraint("allowed_values", rowwise=True)
+def _apply_allowed_values(df: pl.DataFrame, col_name: str, policy: AllowedValuesPolicy) -> pl.DataFrame:
+    valid_set = load_allowed_values(col_name, policy)
+    col = pl.col(col_name)
+    if valid_set and all(isinstance(v, str) for v in valid_set) and column_dtype(df, col_name) == pl.String:
+        # Same outcome as `is_in`, but an Enum cast keeps Polars' streaming engine linear in the number of such columns
+        mask = col.cast(pl.Enum(list(dict.fromkeys(valid_set))), strict=False).is_null() & col.is_not_null()
+    else:
+        mask = ~col.is_in(valid_set)
+    return apply_violate_action(df, col_name, mask, policy.violate_action)
 
 @register_constraint("custom_expr")
 def _apply_custom_expr(df: pl.DataFrame | pl.LazyFrame, col_name: str, policy: CustomExprPolicy) -> pl.DataFrame | pl.LazyFrame:
@@ -70,17 +90,13 @@ def _apply_custom_expr(df: pl.DataFrame | pl.LazyFrame, col_name: str, policy: C
 
 @register_constraint("unique")
 def _apply_unique(df: pl.DataFrame | pl.LazyFrame, col_name: str, policy: UniqueConstraint) -> pl.DataFrame | pl.LazyFrame:
+    index = cross_batch_index(f"columns.{col_name}.unique")
     if policy.tactic == "drop_extras":
-        return df.unique(subset=[col_name], maintain_order=False)
+        return df.unique(subset=[col_name], maintain_order=False) if index is None else drop_seen(df, [col_name], index)
     if policy.tactic == "fail":
-        dup_check_df = df.group_by([col_name]).agg(pl.len().alias("count")).filter(pl.col("count") > 1)
-        if isinstance(dup_check_df, pl.LazyFrame):
-            has_duplicates = dup_check_df.select(pl.len() > 0).collect().item()
-        else:
-            has_duplicates = dup_check_df.height > 0
-            
-        if has_duplicates:
-            raise DuplicateRowError(f"Unique constraint failed on column '{col_name}'.")
+        hits = first_repeats(df, [col_name], index)
+        if hits is not None:
+            raise violation(DuplicateRowError, f"Unique constraint failed on column '{col_name}'.", hits)
     return df
 
 def apply_constraints(df: pl.DataFrame, col_name: str, constraints: ConstraintsDef) -> pl.DataFrame:
@@ -93,7 +109,7 @@ def apply_constraints(df: pl.DataFrame, col_name: str, constraints: ConstraintsD
         if policy is not None:
             handler = CONSTRAINT_REGISTRY.get(field_name)
             if handler:
-                df = handler(df, col_name, policy)
+                df = run_handler(handler, df, col_name, policy)
             else:
                 raise ConstraintViolationError(f"Constraint handler for '{field_name}' not implemented.")
     return df
@@ -4,35 +4,34 @@ from datetime import datetime
 from detl.schema import ColumnDef
 from detl.constants import NullTactic, DType
 from detl.exceptions import NullViolationError
+from detl.stats import note_filter, stat_expr
+from detl.engine.staging import check, declare_rowwise, run_handler
+from detl.proofs import proven
 
 NullHandler = Callable[[pl.DataFrame, str, ColumnDef], pl.DataFrame]
 
 NULL_REGISTRY: Dict[str, NullHandler] = {}
 
-def register_null_handler(tactic_name: str) -> Callable[[NullHandler], NullHandler]:
-    """Decorator to register a null imputation tactic."""
+def register_null_handler(tactic_name: str, rowwise: bool = False) -> Callable[[NullHandler], NullHandler]:
+    """Decorator to register a null imputation tactic; `rowwise` as in `detl.engine.types.register_type`."""
     def decorator(func: NullHandler) -> NullHandler:
         NULL_REGISTRY[tactic_name] = func
+        declare_rowwise(func, rowwise)
         return func
     return decorator
 
-@register_null_handler(NullTactic.DROP_ROW)
+@register_null_handler(NullTactic.DROP_ROW, rowwise=True)
 def _handle_drop_row(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
+    note_filter(pl.col(col_name))
     return df.filter(~pl.col(col_name).is_null())
 
-@register_null_handler(NullTactic.FAIL)
+@register_null_handler(NullTactic.FAIL, rowwise=True)
 def _handle_fail(df: pl.DataFrame | pl.LazyFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame | pl.LazyFrame:
-    checker = df.select(pl.col(col_name).is_null())
-    if isinstance(checker, pl.LazyFrame):
-        has_failed = checker.collect().to_series().any()
-    else:
-        has_failed = checker.to_series().any()
-        
-    if has_failed:
-        raise NullViolationError(f"Column '{col_name}' contains null values which is forbidden by 'fail' tactic.")
-    return df
+    if proven(f"columns.{col_name}.on_null"):
+        return df
+    return check(df, pl.col(col_name).is_null(), NullViolationError, f"Column '{col_name}' contains null values which is forbidden by 'fail' tactic.")
 
-@register_null_handler(NullTactic.FILL_VALUE)
+@register_null_handler(NullTactic.FILL_VALUE, rowwise=True)
 def _handle_fill_value(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
     if col_def.dtype in [DType.DATE, DType.DATETIME]:
         tgt_type = pl.Date if col_def.dtype == DType.DATE else pl.Datetime
@@ -43,7 +42,7 @@ def _handle_fill_value(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> p
             # We first evaluate strictly natively using datetime to find if the literal matches ANY designated format
             # This fails incredibly fast before Polars execution and allows dynamic fallback to out_format mapping
             
-            formats_to_try = [col_def.date_format.in_format]
+            formats_to_try = list(col_def.date_format.in_formats)
             if hasattr(col_def.date_format, "out_format") and col_def.date_format.out_format:
                 formats_to_try.append(col_def.date_format.out_format)
                 
@@ -58,7 +57,8 @@ def _handle_fill_value(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> p
                     pass
             
             if parsed_dt is None:
-                raise NullViolationError(f"Fallback value '{val}' for column '{col_name}' could not be parsed using input format '{formats_to_try[0]}' or output format '{formats_to_try[1] if len(formats_to_try)>1 else ''}'.")
+                inputs = "', '".join(col_def.date_format.in_formats)
+                raise NullViolationError(f"Fallback value '{val}' for column '{col_name}' could not be parsed using input format '{inputs}' or output format '{col_def.date_format.out_format or ''}'.")
                 
             fill_expr = pl.lit(parsed_dt)
         else:
@@ -70,23 +70,23 @@ def _handle_fill_value(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> p
 
 @register_null_handler(NullTactic.FILL_MEAN)
 def _handle_fill_mean(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
-    return df.with_columns(pl.col(col_name).fill_null(pl.col(col_name).mean()))
+    return df.with_columns(pl.col(col_name).fill_null(stat_expr(df, col_name, "mean")))
 
 @register_null_handler(NullTactic.FILL_MEDIAN)
 def _handle_fill_median(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
-    return df.with_columns(pl.col(col_name).fill_null(pl.col(col_name).median()))
+    return df.with_columns(pl.col(col_name).fill_null(stat_expr(df, col_name, "median")))
 
 @register_null_handler(NullTactic.FILL_MAX)
 def _handle_fill_max(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
-    return df.with_columns(pl.col(col_name).fill_null(pl.col(col_name).max()))
+    return df.with_columns(pl.col(col_name).fill_null(stat_expr(df, col_name, "max")))
 
 @register_null_handler(NullTactic.FILL_MIN)
 def _handle_fill_min(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
-    return df.with_columns(pl.col(col_name).fill_null(pl.col(col_name).min()))
+    return df.with_columns(pl.col(col_name).fill_null(stat_expr(df, col_name, "min")))
 
 @register_null_handler(NullTactic.FILL_MOST_FREQUENT)
 def _handle_fill_most_frequent(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
-    return df.with_columns(pl.col(col_name).fill_null(pl.col(col_name).mode().first()))
+    return df.with_columns(pl.col(col_name).fill_null(stat_expr(df, col_name, "mode")))
 
 @register_null_handler(NullTactic.FFILL)
 def _handle_ffill(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
@@ -103,4 +103,4 @@ def handle_nulls(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.Data
     handler = NULL_REGISTRY.get(col_def.on_null.tactic)
     if not handler:
         raise NullViolationError(f"Null tactic '{col_def.on_null.tactic}' mapping is missing.")
-    return handler(df, col_name, col_def)
+    return run_handler(handler, df, col_name, col_def)
@@ -0,0 +1,232 @@
+from typing import Any, Callable, Dict, List, Set, Tuple, Type
+
+import polars as pl
+
+from detl.engine.checks import ROW_INDEX, SAMPLE_ROWS, first_violations, indexed_batches, violation
+from detl.exceptions import DataViolationError
+from detl.ordering import active_profile
+
+CHECK_PREFIX = "__detl_check_"
+KEEP_PREFIX = "__detl_keep_"
+DROPPED = "__detl_dropped"
+
+# Helper column, error type, message, and how many of the stage's filters precede the check
+Check = Tuple[str, Type[DataViolationError], str, int]
+
+# Rule handlers registered with `rowwise=True` (see `run_handler`)
+ROWWISE_HANDLERS: Set[Callable[..., Any]] = set()
+
+def declare_rowwise(handler: Callable[..., Any], rowwise: bool) -> None:
+    """Records whether rule `handler` computes each row from that row alone, as its registry decorator declares."""
+    if rowwise:
+        ROWWISE_HANDLERS.add(handler)
+
+def run_handler(handler: Callable[..., Any], df: "pl.DataFrame | pl.LazyFrame | StagedFrame", *args: Any):
+    """Calls rule `handler` on `df`.
+
+    A row-wise handler gets the StagedFrame and its work is staged with the rest of the stage. Any other handler
+    gets the plain frame with the staged work applied, so an aggregate such as `fill_mean` only counts the rows
+    earlier rules kept.
+    """
+    if isinstance(df, StagedFrame) and handler not in ROWWISE_HANDLERS:
+        df = df.resolve()
+    return handler(df, *args)
+
+class StagedFrame:
+    """A frame that collects the per-column work of one contract stage into a handful of plan nodes.
+
+    Each column's handler adds its own `with_columns`, `filter` or check, so applied one by one a 10,000-column
+    contract builds a plan 10,000 nodes deep, which Polars optimizes in quadratic time and eventually overflows
+    the stack on. Instead, expressions are layered: each goes into the earliest `with_columns` layer after the ones
+    writing the columns it reads or writes, so a stage costs one node per rule applied to the same column.
+
+    - `filter` predicates are staged as helper columns of those layers and applied together at the end. Only handlers
+      registered as row-wise stage work (see `run_handler`), so whatever is staged after a filter gives the kept rows
+      the values it would give them after it.
+    - `check()` masks are staged the same way and all evaluated in one pass when the stage resolves, each over the
+      rows kept by the filters staged before it. The error raised, and its row offset, are still those of the first
+      failing check; its sample shows the offending rows as they leave the stage.
+    - With a rule profile active (`conf.rule_order`), filters whose columns no later expression rewrites, and that no
+      check depends on, are applied after the rest of the stage in the order the profile predicts is fastest.
+
+    Row-wise handlers get the frame back from every call (it is updated in place). It only offers the operations
+    above and the schema; `resolve()` applies the staged work and returns the plain frame.
+    """
+    def __init__(self, df: pl.DataFrame | pl.LazyFrame):
+        self._df = df
+        self._schema: pl.Schema | None = None
+        self._layers: List[Dict[str, pl.Expr]] = []
+        self._written: Dict[str, int] = {}
+        self._read: Dict[str, int] = {}
+        self._filters: List[str] = []
+        self._checks: List[Check] = []
+
+    @classmethod
+    def wrap(cls, df: "pl.DataFrame | pl.LazyFrame | StagedFrame") -> "StagedFrame":
+        return df if isinstance(df, cls) else cls(df)
+
+    @property
+    def schema(self) -> pl.Schema:
+        """Schema after the staged work; resolved once per flush rather than on every call."""
+        self.resolve()
+        return self._base_schema()
+
+    def collect_schema(self) -> pl.Schema:
+        return self.schema
+
+    @property
+    def columns(self) -> List[str]:
+        return self.schema.names()
+
+    def dtype(self, name: str) -> pl.DataType | None:
+        """Current type of column `name`; the staged work is only applied first if it rewrites that column."""
+        if name in self._written:
+            self.resolve()
+        return self._base_schema().get(name)
+
+    def _base_schema(self) -> pl.Schema:
+        if self._schema is None:
+            self._schema = self._df.collect_schema() if isinstance(self._df, pl.LazyFrame) else self._df.schema
+        return self._schema
+
+    def with_columns(self, *exprs: Any, **named: Any) -> "StagedFrame":
+        flat = [e for item in exprs for e in (item if isinstance(item, (list, tuple)) else [item])]
+        flat += [v.alias(k) if isinstance(v, pl.Expr) else pl.lit(v).alias(k) for k, v in named.items()]
+        if not all(isinstance(e, pl.Expr) and not e.meta.has_multiple_outputs() for e in flat):
+            self._df = self.resolve().with_columns(*exprs, **named)
+            self._schema = None
+            return self
+        for expr in flat:
+            self._stage(expr)
+        return self
+
+    def filter(self, *predicates: Any, **constraints: Any) -> "StagedFrame":
+        if constraints or not all(isinstance(p, pl.Expr) for p in predicates):
+            self._df = self.resolve().filter(*predicates, **constraints)
+            return self
+        for predicate in predicates:
+            name = f"{KEEP_PREFIX}{len(self._filters)}"
+            self._stage(predicate.fill_null(False).alias(name))
+            self._filters.append(name)
+        return self
+
+    def check(self, mask: pl.Expr, error: Type[DataViolationError], message: str) -> "StagedFrame":
+        """Stages a check raising `error` for the first rows matching `mask`."""
+        name = f"{CHECK_PREFIX}{len(self._checks)}"
+        self._stage(mask.fill_null(False).alias(name))
+        self._checks.append((name, error, message, len(self._filters)))
+        return self
+
+    def _stage(self, expr: pl.Expr) -> None:
+        out = expr.meta.output_name()
+        roots = expr.meta.root_names()
+        # After every layer writing a column it reads or writes, and never before a layer still reading the old value
+        layer = max([self._written.get(c, -1) + 1 for c in [*roots, out]] + [self._read.get(out, 0)])
+        if layer == len(self._layers):
+            self._layers.append({})
+        self._layers[layer][out] = expr
+        self._written[out] = layer
+        for c in roots:
+            self._read[c] = max(self._read.get(c, 0), layer)
+
+    def resolve(self) -> pl.DataFrame | pl.LazyFrame:
+        """Applies the staged work, raising the first failing check, and returns the underlying frame."""
+        if not self._layers:
+            return self._df
+        profile = active_profile()
+        deferred = self._defer_filters() if profile is not None else []
+        layers, self._layers, self._written, self._read = self._layers, [], {}, {}
+        for layer in layers:
+            if layer:
+                self._df = self._df.with_columns(list(layer.values()))
+        self._schema = None
+        filters, self._filters = self._filters, []
+        if self._checks:
+            checks, self._checks = self._checks, []
+            self._df = _evaluate_checks(self._df, checks, filters)
+        if filters:
+            self._df = self._df.filter(*[pl.col(name) for name in filters]).drop(filters)
+        if deferred:
+            self._df = profile.apply(self._df, deferred)
+        return self._df
+
+    def _defer_filters(self) -> List[pl.Expr]:
+        """Takes the predicates that may run after the rest of the stage out of their layers.
+
+        A predicate qualifies when none of the columns it reads is rewritten by a later layer, so it sees the same
+        values at the end of the stage, and no check is scoped after it, so every check sees the same rows.
+        """
+        first = max((scope for *_, scope in self._checks), default=0)
+        deferred = []
+        for name in self._filters[first:]:
+            layer = self._written[name]
+            if all(self._written.get(c, -1) < layer for c in self._layers[layer][name].meta.root_names()):
+                deferred.append(self._layers[layer].pop(name))
+                self._filters.remove(name)
+        return deferred
+
+def _evaluate_checks(df: pl.DataFrame | pl.LazyFrame, checks: List[Check], filters: List[str]) -> pl.DataFrame | pl.LazyFrame:
+    """Evaluates staged checks in one pass over the frame and drops their helper columns.
+
+    A check only sees the rows kept by the `filters` staged before it, and reports offsets counted among those
+    rows, as if the filters had run first. Like `first_violations`, the pass stops once the outcome is settled:
+    at the first batch where the first staged check fails, since a later check's failure is only reported when
+    no earlier one fails.
+    """
+    scopes = sorted({scope for *_, scope in checks if scope})
+    # How many of the filters up to each one drop a row; a check sees the rows where this is 0 at its scope
+    counts = [f"{DROPPED}{scope}" for scope in range(1, scopes[-1] + 1)] if scopes else []
+    if counts:
+        dropped = pl.cum_sum_horizontal(*[~pl.col(name) for name in filters[:len(counts)]])
+        dropped = dropped.struct.rename_fields(counts).alias(DROPPED)
+    kept = {scope: pl.col(counts[scope - 1]) == 0 for scope in scopes}
+    hit = [pl.col(name) & kept[scope] if scope else pl.col(name) for name, _, _, scope in checks]
+    # Rows each set of filters kept in earlier batches, counted from the offset of the first row
+    before: Dict[int, int] | None = None
+    failing, hits = len(checks), None
+    for batch in indexed_batches(df):
+        if before is None:
+            before = {scope: batch[ROW_INDEX][0] for scope in kept}
+        if counts:
+            batch = batch.with_columns(dropped).unnest(DROPPED)
+        found = batch.select(
+            [h.any() for h in hit[:failing]] + [k.sum().alias(f"{KEEP_PREFIX}{scope}") for scope, k in kept.items()]
+        ).row(0)
+        first = next((i for i, any_hit in enumerate(found[:failing]) if any_hit), None)
+        if first is not None:
+            scope = checks[first][3]
+            if scope:
+                offsets = before[scope] + kept[scope].cast(pl.Int64).cum_sum() - 1
+                batch = batch.with_columns(offsets.alias(ROW_INDEX))
+            failing, hits = first, batch.filter(hit[first]).head(SAMPLE_ROWS)
+        if failing == 0:
+            break
+        for scope, count in zip(kept, found[-len(kept):] if kept else []):
+            before[scope] += count
+    if hits is not None:
+        _, error, message, _ = checks[failing]
+        # The helper columns start with "__" and are left out of the sample
+        raise violation(error, message, hits)
+    return df.drop([name for name, *_ in checks])
+
+def resolve(df: "pl.DataFrame | pl.LazyFrame | StagedFrame") -> pl.DataFrame | pl.LazyFrame:
+    """The plain frame behind `df`, with any staged work applied."""
+    return df.resolve() if isinstance(df, StagedFrame) else df
+
+def column_dtype(df: "pl.DataFrame | pl.LazyFrame | StagedFrame", name: str) -> pl.DataType | None:
+    """Type of column `name`, without resolving a staged plan unless it rewrites that column."""
+    if isinstance(df, StagedFrame):
+        return df.dtype(name)
+    return (df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema).get(name)
+
+def check(df: "pl.DataFrame | pl.LazyFrame | StagedFrame", mask: pl.Expr, error: Type[DataViolationError], message: str):
+    """Raises `error` for the first rows matching `mask`, or returns `df` when there are none.
+
+    On a StagedFrame the check is deferred and evaluated in one pass with the other checks of its stage.
+    """
+    if isinstance(df, StagedFrame):
+        return df.check(mask, error, message)
+    hits = first_violations(df, mask)
+    if hits is not None:
+        raise violation(error, message, hits)
+    return df
@@ -3,60 +3,108 @@ from typing import Callable, Dict
 from detl.schema import ColumnDef
 from detl.constants import DType
 from detl.exceptions import TypeCastingError
+from detl.engine.staging import column_dtype, declare_rowwise, run_handler
 
 TypeCaster = Callable[[pl.DataFrame, str, ColumnDef], pl.DataFrame]
 
 TYPE_REGISTRY: Dict[str, TypeCaster] = {}
 
-def register_type(type_name: str) -> Callable[[TypeCaster], TypeCaster]:
-    """Decorator to register a specific dtype column caster."""
+def register_type(type_name: str, rowwise: bool = False) -> Callable[[TypeCaster], TypeCaster]:
+    """Decorator to register a specific dtype column caster.
+
+    `rowwise=True` declares that it computes each row from that row alone, so its work is staged with the other
+    columns' (see `detl.engine.staging.run_handler`).
+    """
     def decorator(func: TypeCaster) -> TypeCaster:
         TYPE_REGISTRY[type_name] = func
+        declare_rowwise(func, rowwise)
         return func
     return decorator
 
-@register_type(DType.STRING)
+@register_type(DType.STRING, rowwise=True)
 def _cast_string(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
     expr = pl.col(col_name).cast(pl.Utf8)
     if col_def.trim:
         expr = expr.str.strip_chars()
     return df.with_columns(expr)
 
-@register_type(DType.INT)
+@register_type(DType.INT, rowwise=True)
 def _cast_int(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
     return df.with_columns(pl.col(col_name).cast(pl.Int64, strict=False))
 
-@register_type(DType.FLOAT)
+@register_type(DType.FLOAT, rowwise=True)
 def _cast_float(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
     return df.with_columns(pl.col(col_name).cast(pl.Float64, strict=False))
 
-@register_type(DType.BOOLEAN)
+# Storage of the compact numeric dtypes. Values out of range become null, like unparseable ones, and go through `on_null`
+COMPACT_NUMERIC_TYPES = {
+    DType.INT8: pl.Int8, DType.INT16: pl.Int16, DType.INT32: pl.Int32,
+    DType.UINT8: pl.UInt8, DType.UINT16: pl.UInt16, DType.UINT32: pl.UInt32, DType.UINT64: pl.UInt64,
+    DType.FLOAT32: pl.Float32,
+}
+
+def _compact_numeric_caster(target) -> TypeCaster:
+    def cast(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
+        return df.with_columns(pl.col(col_name).cast(target, strict=False))
+    return cast
+
+for _dtype, _target in COMPACT_NUMERIC_TYPES.items():
+    register_type(_dtype, rowwise=True)(_compact_numeric_caster(_target))
+
+@register_type(DType.CATEGORY, rowwise=True)
+@register_type(DType.ENUM, rowwise=True)
+def _cast_compact_string(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
+    # Rules see plain strings; the column is stored as Categorical/Enum once they have run (see detl.engine.compact)
+    return _cast_string(df, col_name, col_def)
+
+@register_type(DType.BOOLEAN, rowwise=True)
 def _cast_boolean(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
     return df.with_columns(pl.col(col_name).cast(pl.Boolean, strict=False))
 
-@register_type(DType.DATE)
+@register_type(DType.DATE, rowwise=True)
 def _cast_date(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
     return _parse_temporal(df, col_name, col_def, pl.Date)
 
-@register_type(DType.DATETIME)
+@register_type(DType.DATETIME, rowwise=True)
 def _cast_datetime(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataFrame:
     return _parse_temporal(df, col_name, col_def, pl.Datetime)
 
+# Fixed-layout ISO-8601 formats: parsing them directly is cheaper than Polars' per-value cache lookup
+ISO_FORMATS = {
+    "%Y-%m-%d", "%F",
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%F %T", "%FT%T",
+    "%Y-%m-%d %H:%M:%S%.f", "%Y-%m-%dT%H:%M:%S%.f",
+}
+
+def _strptime(expr: pl.Expr, target_type, fmt: str, strict: bool) -> pl.Expr:
+    return expr.str.strptime(target_type, format=fmt, strict=strict, cache=fmt not in ISO_FORMATS)
+
 def _parse_temporal(df: pl.DataFrame, col_name: str, col_def: ColumnDef, target_type) -> pl.DataFrame:
-    """Helper method properly utilizing string format configuration."""
+    """Helper method properly utilizing string format configuration.
+
+    Several input formats are tried in order in the same pass: each value takes the first format that parses it.
+    """
     if col_def.date_format:
-        fmt = col_def.date_format.in_format
+        formats = col_def.date_format.in_formats
         error_tactic = col_def.date_format.on_parse_error.get("tactic", "drop_row")
         strict = (error_tactic == "fail")
-        
-        # If the dataframe column is entirely null, Polars types it as pl.Null, which crashes str.strptime
-        current_schema = df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema
-        if current_schema.get(col_name) == pl.Null:
+        source_type = column_dtype(df, col_name)
+
+        # If the dataframe column is entirely null, Polars types it as pl.Null, which crashes str.strptime.
+        # Already temporal columns (Parquet, databases) have nothing to parse
+        if source_type == pl.Null or source_type == pl.Date or isinstance(source_type, pl.Datetime):
             parsed = pl.col(col_name).cast(target_type)
         else:
             # Cast to Utf8 first to guarantee strptime behaves correctly even with mixed types
-            parsed = pl.col(col_name).cast(pl.Utf8).str.strptime(target_type, format=fmt, strict=strict)
-            
+            source = pl.col(col_name) if source_type == pl.String else pl.col(col_name).cast(pl.Utf8)
+            if len(formats) == 1:
+                parsed = _strptime(source, target_type, formats[0], strict)
+            else:
+                parsed = pl.coalesce([_strptime(source, target_type, fmt, False) for fmt in formats])
+                if strict:
+                    # Values no format parsed go through a strict parse of their own, which raises on them
+                    parsed = pl.coalesce(parsed, _strptime(pl.when(parsed.is_null()).then(source), target_type, formats[0], True))
+
         return df.with_columns(parsed.alias(col_name))
     
     return df.with_columns(pl.col(col_name).cast(target_type, strict=False))
@@ -68,4 +116,4 @@ def apply_types(df: pl.DataFrame, col_name: str, col_def: ColumnDef) -> pl.DataF
     handler = TYPE_REGISTRY.get(col_def.dtype)
     if not handler:
         raise TypeCastingError(f"Type mapping for '{col_def.dtype}' is currently unsupported.")
-    return handler(df, col_name, col_def)
+    return run_handler(handler, df, col_name, col_def)
@@ -2,15 +2,27 @@ class DetlException(Exception):
     """Base exception for all `detl` domain errors."""
     pass
 
-class ConstraintViolationError(DetlException):
+class DataViolationError(DetlException):
+    """Base for errors raised because the data broke a rule with tactic 'fail'.
+
+    Attributes:
+        row_offset: Offset of the first offending row among the rows the rule checked, when known.
+        sample: A few offending rows, when known.
+    """
+    def __init__(self, message: str, row_offset: int | None = None, sample=None):
+        super().__init__(message)
+        self.row_offset = row_offset
+        self.sample = sample
+
+class ConstraintViolationError(DataViolationError):
     """Raised when a data value violates a strict constraint policy configured with tactic 'fail'."""
     pass
 
-class NullViolationError(DetlException):
+class NullViolationError(DataViolationError):
     """Raised when a null/missing value is encountered but the column policy dictates tactic 'fail'."""
     pass
 
-class DuplicateRowError(DetlException):
+class DuplicateRowError(DataViolationError):
     """Raised when uniqueness checks fail and duplicate rows are detected under tactic 'fail'."""
     pass
 
@@ -25,3 +37,15 @@ class ConfigError(DetlException):
 class ConnectionConfigurationError(DetlException):
     """Raised when a Source or Sink Connector fails to establish a connection."""
     pass
+
+class MemoryBudgetError(DetlException):
+    """Raised before reading any data when a run cannot fit into the configured `max_memory`.
+
+    Attributes:
+        estimated_bytes: Estimated decoded size of the input, when known.
+        budget: The `max_memory` budget in bytes.
+    """
+    def __init__(self, message: str, estimated_bytes: int | None = None, budget: int | None = None):
+        super().__init__(message)
+        self.estimated_bytes = estimated_bytes
+        self.budget = budget
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, ValidationError
+
+from detl.cache import detl_version
+from detl.exceptions import ConfigError
+from detl.incremental import decode_watermark, encode_watermark
+from detl.schema.statistics import StatisticsDef
+from detl.stats import StatsSession
+
+ARTIFACT_FORMAT = 1
+
+class FittedStatistic(BaseModel):
+    column: str
+    statistic: str
+    value: Optional[Dict[str, Any]] = None
+
+class StatisticsArtifact(BaseModel):
+    """
+    Imputation and action statistics fitted once over a reference dataset, to be applied to many later runs.
+
+    The artifact records the digest of the contract it was fitted for. Statistics are matched to the
+    contract's fill rules by position, so applying it to any other contract is refused.
+    """
+    format: int = ARTIFACT_FORMAT
+    detl_version: str
+    contract: str
+    fitted_at: float
+    statistics: List[FittedStatistic]
+
+    @classmethod
+    def from_session(cls, session: StatsSession, contract: str) -> "StatisticsArtifact":
+        return cls(
+            detl_version=detl_version(),
+            contract=contract,
+            fitted_at=time.time(),
+            statistics=[
+                FittedStatistic(
+                    column=s["column"],
+                    statistic=s["statistic"],
+                    value=None if s["value"] is None else encode_watermark(s["value"]),
+                )
+                for s in session.values()
+            ],
+        )
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.model_dump_json().encode("utf-8")).hexdigest()
+
+    def values(self) -> List[Dict[str, Any]]:
+        return [{"column": s.column, "statistic": s.statistic, "value": decode_watermark(s.value)} for s in self.statistics]
+
+    def session(self, spec: StatisticsDef, contract: str) -> StatsSession:
+        """An applying session that injects the fitted values as literals.
+
+        Args:
+            spec: The contract's statistics settings.
+            contract: `contract_digest()` of the contract as written, before the Processor hydrates it.
+
+        Raises:
+            ConfigError: If the artifact was fitted for a different contract.
+        """
+        if self.contract != contract:
+            raise ConfigError("The statistics artifact was fitted for a different contract; run fit again.")
+        fitted = self.values()
+        session = StatsSession(spec, {i: s["value"] for i, s in enumerate(fitted)}, strict=True)
+        session.requests = {i: (s["column"], s["statistic"]) for i, s in enumerate(fitted)}
+        return session
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Writes the artifact as JSON. The file is replaced atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.model_dump(mode="json"), f, indent=2)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "StatisticsArtifact":
+        """Reads an artifact written by `save`.
+
+        Raises:
+            ConfigError: If the file is missing, malformed, or from a newer artifact format.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ConfigError(f"Cannot read statistics artifact '{path}': {e}")
+        if isinstance(data, dict) and data.get("format", ARTIFACT_FORMAT) > ARTIFACT_FORMAT:
+            raise ConfigError(f"Statistics artifact '{path}' uses format {data['format']}; this detl reads up to {ARTIFACT_FORMAT}.")
+        try:
+            return cls.model_validate(data)
+        except ValidationError as e:
+            raise ConfigError(f"Invalid statistics artifact '{path}':\n{e}")
@@ -0,0 +1,90 @@
+from datetime import date, datetime
+from typing import Any, Dict
+
+import polars as pl
+
+from detl.connectors.base import Source
+from detl.exceptions import ConfigError
+from detl.schema.incremental import IncrementalDef
+from detl.state import open_state_store
+
+def encode_watermark(value: Any) -> Dict[str, Any]:
+    """Serializes a watermark into a JSON-safe mapping that round-trips its Python type."""
+    if isinstance(value, bool):
+        return {"type": "boolean", "value": value}
+    if isinstance(value, int):
+        return {"type": "int", "value": value}
+    if isinstance(value, float):
+        return {"type": "float", "value": value}
+    # datetime must be checked before date since it is a subclass
+    if isinstance(value, datetime):
+        return {"type": "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {"type": "date", "value": value.isoformat()}
+    return {"type": "string", "value": str(value)}
+
+def decode_watermark(payload: Dict[str, Any] | None) -> Any:
+    if not payload:
+        return None
+    kind, value = payload.get("type"), payload.get("value")
+    if kind == "datetime":
+        return datetime.fromisoformat(value)
+    if kind == "date":
+        return date.fromisoformat(value)
+    return value
+
+class IncrementalExtractor:
+    """
+    Reads only the slice of a Source that previous runs have not committed yet.
+
+    - `watermark` mode pushes `column > last_watermark` down to the Source and remembers the new maximum.
+    - `files` mode asks the Source for its file listing and reads only files not seen before.
+
+    Nothing is persisted until `commit()` is called, which the Processor does after the sink succeeds.
+    """
+    def __init__(self, spec: IncrementalDef, source: Source):
+        self.spec = spec
+        self.source = source
+        self.store = open_state_store(spec.state)
+        self.key = spec.key or f"{source.state_key()}#{spec.column or 'files'}"
+        self._pending: Dict[str, Any] | None = None
+
+    def read(self) -> pl.DataFrame | pl.LazyFrame | None:
+        """Returns the unprocessed slice, or None if there is nothing new to process."""
+        state = self.store.get(self.key) or {}
+        if self.spec.mode == "files":
+            return self._read_files(state)
+        return self._read_watermark(state)
+
+    def _read_watermark(self, state: Dict[str, Any]) -> pl.DataFrame | pl.LazyFrame | None:
+        column = self.spec.column
+        watermark = decode_watermark(state.get("watermark"))
+        df = self.source.read() if watermark is None else self.source.read_since(column, watermark)
+
+        names = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
+        if column not in names:
+            raise ConfigError(f"Incremental watermark column '{column}' does not exist in the dataset.")
+
+        high = df.select(pl.col(column).max())
+        if isinstance(high, pl.LazyFrame):
+            high = high.collect()
+        new_watermark = high.item()
+        if new_watermark is None:
+            return None
+
+        self._pending = {"watermark": encode_watermark(new_watermark)}
+        return df
+
+    def _read_files(self, state: Dict[str, Any]) -> pl.DataFrame | pl.LazyFrame | None:
+        processed = set(state.get("files", []))
+        new_files = [f for f in self.source.discover() if f not in processed]
+        if not new_files:
+            return None
+
+        self._pending = {"files": sorted(processed.union(new_files))}
+        return self.source.read_files(new_files)
+
+    def commit(self) -> None:
+        if self._pending is not None:
+            self.store.put(self.key, self._pending)
+            self._pending = None
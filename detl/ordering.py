@@ -0,0 +1,128 @@
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import polars as pl
+from pydantic import BaseModel
+
+from detl.cache import _write_json
+
+# A mask at least this many times costlier than the costliest one of the current tier starts a new tier
+TIER_COST_RATIO = 4.0
+# Each tier adds two plan nodes, so rules beyond this many tiers share the last one
+MAX_TIERS = 4
+TIER_COLUMN = "__detl_tier"
+
+_PROFILE: ContextVar["RuleProfile | None"] = ContextVar("detl_rule_profile", default=None)
+
+class RuleStats(BaseModel):
+    """Measured behaviour of one drop rule.
+
+    Attributes:
+        rule: The rule's keep predicate, for reading the profile.
+        cost: Seconds to evaluate it over a million rows.
+        drop_rate: Fraction of the sampled rows it drops.
+        rows: Rows it was measured on.
+    """
+    rule: str
+    cost: float
+    drop_rate: float
+    rows: int
+
+    @property
+    def rank(self) -> float:
+        """Cost per dropped row; rules run in increasing rank."""
+        return self.cost / max(self.drop_rate, 1e-6)
+
+def rule_key(mask: pl.Expr) -> str:
+    """Identifies a rule by its predicate, so editing the rule makes it measured again."""
+    return hashlib.sha1(mask.meta.undo_aliases().meta.serialize()).hexdigest()
+
+def active_profile() -> "RuleProfile | None":
+    """The rule profile of the running contract, when it sets `conf.rule_order`."""
+    return _PROFILE.get()
+
+class RuleProfile:
+    """Cost and selectivity of a contract's drop rules, kept in a local JSON file across runs.
+
+    Rules not in the file yet are measured on the first `sample_rows` rows reaching them and added to it.
+    """
+    def __init__(self, path: Path | str, sample_rows: int = 100_000):
+        self.path = Path(path)
+        self.sample_rows = sample_rows
+        self.rules: Dict[str, RuleStats] = self._load()
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, RuleStats]:
+        if not self.path.exists():
+            return {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            return {key: RuleStats.model_validate(stats) for key, stats in json.load(f).get("rules", {}).items()}
+
+    @contextmanager
+    def activate(self) -> Iterator[None]:
+        token = _PROFILE.set(self)
+        try:
+            yield
+        finally:
+            _PROFILE.reset(token)
+
+    def measure(self, df: pl.DataFrame | pl.LazyFrame, masks: List[pl.Expr]) -> None:
+        """Times each of `masks` and counts the rows it drops on a sample of `df`, then saves the profile."""
+        sample = df.head(self.sample_rows)
+        sample = sample.collect() if isinstance(sample, pl.LazyFrame) else sample
+        for mask in masks:
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                kept = sample.select(mask.fill_null(False)).to_series()
+                timings.append(time.perf_counter() - start)
+            self.rules[rule_key(mask)] = RuleStats(
+                rule=str(mask.meta.undo_aliases()),
+                cost=min(timings) * 1e6 / max(sample.height, 1),
+                drop_rate=1 - kept.mean() if sample.height else 0.0,
+                rows=sample.height,
+            )
+        self.save()
+
+    def save(self) -> None:
+        # Another run may have profiled other rules meanwhile; keep them
+        on_disk = self._load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json(self.path, {"rules": {k: v.model_dump() for k, v in {**on_disk, **self.rules}.items()}})
+
+    def tiers(self, masks: List[pl.Expr]) -> List[List[pl.Expr]]:
+        """Groups `masks` into tiers run one after another, cheapest per dropped row first.
+
+        Rules of similar cost share a tier; a much costlier rule waits for a later tier, so it only sees the rows
+        the cheaper ones kept.
+        """
+        ordered = sorted(masks, key=lambda mask: self.rules[rule_key(mask)].rank)
+        tiers: List[List[pl.Expr]] = []
+        tier_cost = 0.0
+        for mask in ordered:
+            cost = self.rules[rule_key(mask)].cost
+            if not tiers or (cost > tier_cost * TIER_COST_RATIO and len(tiers) < MAX_TIERS):
+                tiers.append([])
+                tier_cost = 0.0
+            tiers[-1].append(mask)
+            tier_cost = max(tier_cost, cost)
+        return tiers
+
+    def apply(self, df: pl.DataFrame | pl.LazyFrame, masks: List[pl.Expr]) -> pl.DataFrame | pl.LazyFrame:
+        """Filters `df` by the keep predicates `masks`, in the order the profile predicts to be fastest."""
+        with self._lock:
+            missing = [mask for mask in masks if rule_key(mask) not in self.rules]
+            if missing:
+                self.measure(df, missing)
+            tiers = self.tiers(masks)
+        for tier in tiers:
+            # A filter on a plain predicate would be merged with the previous one and evaluated on every row;
+            # computing it as a column first keeps it after that filter
+            df = df.with_columns(pl.all_horizontal(tier).alias(TIER_COLUMN)).filter(pl.col(TIER_COLUMN)).drop(TIER_COLUMN)
+        return df
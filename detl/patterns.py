@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Literal
+
+import polars as pl
+
+# Characters with a meaning of their own in Polars' (Rust) regex syntax
+REGEX_META = set(".^$*+?()[]{}|\\")
+LITERAL_ESCAPES = REGEX_META | set("-/#&~")
+
+@dataclass(frozen=True)
+class LiteralPattern:
+    """A regex that only matches a fixed string, possibly anchored at the start and/or end of the value."""
+    text: str
+    anchored_start: bool
+    anchored_end: bool
+
+def validate_pattern(pattern: str) -> str:
+    """Compiles `pattern` with the regex engine constraints run on, raising ValueError if it is invalid."""
+    try:
+        pl.Series([""], dtype=pl.String).str.contains(pattern)
+    except pl.exceptions.ComputeError as e:
+        raise ValueError(f"Invalid regex pattern '{pattern}': {e}") from None
+    return pattern
+
+@lru_cache(maxsize=None)
+def literal_form(pattern: str) -> LiteralPattern | None:
+    """The fixed string `pattern` matches, or None when it uses any regex feature besides `^`, `$` and escaped punctuation."""
+    anchored_start = pattern.startswith("^")
+    body = pattern[1:] if anchored_start else pattern
+    text, anchored_end, i = [], False, 0
+    while i < len(body):
+        c = body[i]
+        if c == "\\":
+            # Escapes of other characters are classes or assertions, such as \d, \b or \<
+            if body[i + 1:i + 2] not in LITERAL_ESCAPES:
+                return None
+            text.append(body[i + 1])
+            i += 2
+            continue
+        if c == "$" and i == len(body) - 1:
+            anchored_end = True
+        elif c in REGEX_META:
+            return None
+        else:
+            text.append(c)
+        i += 1
+    return LiteralPattern("".join(text), anchored_start, anchored_end)
+
+def pattern_mask(column: pl.Expr, patterns: List[str], match: Literal["any", "all"] = "any") -> pl.Expr:
+    """True where `column` matches any (or all) of `patterns`, in as few passes over the strings as possible.
+
+    Patterns that only match a fixed string run on Polars' literal kernels (`==`, `starts_with`, `ends_with`,
+    `contains(literal=True)` and, for several with `any`, `contains_any`) instead of the regex engine. With `any`,
+    the remaining regexes are combined into one alternation, so each value is scanned once.
+    """
+    if match == "all":
+        return pl.all_horizontal([_single_mask(column, p) for p in patterns])
+    exact, substrings, other = [], [], []
+    for p in patterns:
+        form = literal_form(p)
+        if form is not None and form.anchored_start and form.anchored_end:
+            exact.append(form.text)
+        elif form is not None and not form.anchored_start and not form.anchored_end:
+            substrings.append(form.text)
+        else:
+            other.append(p)
+    masks = []
+    if exact:
+        masks.append(column == exact[0] if len(exact) == 1 else column.is_in(exact))
+    if len(substrings) > 1:
+        masks.append(column.str.contains_any(substrings))
+    elif substrings:
+        masks.append(column.str.contains(substrings[0], literal=True))
+    regexes = [p for p in other if literal_form(p) is None]
+    masks += [_single_mask(column, p) for p in other if literal_form(p) is not None]
+    if regexes:
+        masks.append(column.str.contains(regexes[0] if len(regexes) == 1 else "|".join(f"(?:{p})" for p in regexes)))
+    return masks[0] if len(masks) == 1 else pl.any_horizontal(masks)
+
+def _single_mask(column: pl.Expr, pattern: str) -> pl.Expr:
+    form = literal_form(pattern)
+    if form is None:
+        return column.str.contains(pattern)
+    if form.anchored_start and form.anchored_end:
+        return column == form.text
+    if form.anchored_start:
+        return column.str.starts_with(form.text)
+    if form.anchored_end:
+        return column.str.ends_with(form.text)
+    return column.str.contains(form.text, literal=True)
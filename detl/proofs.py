@@ -0,0 +1,143 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, FrozenSet, Iterator, List
+
+import polars as pl
+
+from detl.connectors.base import RowGroup, Source
+from detl.constants import DType, NUMERIC_DTYPES, STRING_DTYPES, NullTactic
+from detl.engine.types import COMPACT_NUMERIC_TYPES
+
+_PROVEN: ContextVar[FrozenSet[str]] = ContextVar("detl_proven_rules", default=frozenset())
+
+STORED_INTEGERS = {pl.Int8, pl.Int16, pl.Int32, pl.Int64, pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64}
+
+def proven(rule: str) -> bool:
+    """Whether `rule` (e.g. "columns.price.max_policy") was shown to hold for the whole source, so checking it can be skipped."""
+    return rule in _PROVEN.get()
+
+@contextmanager
+def assume(rules: FrozenSet[str]) -> Iterator[None]:
+    """Lets the fail checks of `rules` be skipped inside this block."""
+    token = _PROVEN.set(rules)
+    try:
+        yield
+    finally:
+        _PROVEN.reset(token)
+
+def _preserved(source_dtype: pl.DataType, col_def: Any) -> bool:
+    """Whether casting to the contract dtype keeps every value and null as stored, so stored statistics still apply."""
+    if col_def.date_format is not None:
+        # Parsing may turn unparseable values into nulls
+        return False
+    if col_def.dtype == DType.INT:
+        return source_dtype in STORED_INTEGERS and source_dtype != pl.UInt64
+    if col_def.dtype == DType.FLOAT:
+        return source_dtype in {pl.Float32, pl.Float64, pl.Int8, pl.Int16, pl.Int32, pl.UInt8, pl.UInt16, pl.UInt32}
+    if col_def.dtype in COMPACT_NUMERIC_TYPES:
+        return source_dtype == COMPACT_NUMERIC_TYPES[col_def.dtype]
+    if col_def.dtype == DType.DATETIME:
+        return isinstance(source_dtype, pl.Datetime)
+    if col_def.dtype in STRING_DTYPES:
+        return source_dtype == pl.String
+    return source_dtype == {DType.BOOLEAN: pl.Boolean, DType.DATE: pl.Date}[col_def.dtype]
+
+def _holds(groups: List[RowGroup], col_name: str, from_stats: Callable, violated: pl.Expr) -> bool:
+    """Whether no row has `violated`. `from_stats` settles a row group from its statistics (True/False) or returns None,
+    in which case that group's column is read and checked."""
+    for group in groups:
+        stats = group.columns.get(col_name)
+        verdict = from_stats(stats, group.num_rows) if stats is not None else None
+        if verdict is None:
+            verdict = not group.read([col_name]).select(violated.fill_null(False).any()).item()
+        if not verdict:
+            return False
+    return True
+
+def _no_nulls(stats, num_rows: int) -> bool | None:
+    return None if stats.null_count is None else stats.null_count == 0
+
+def _bound(threshold, lower: bool) -> Callable:
+    def verdict(stats, num_rows: int) -> bool | None:
+        # A group holding only nulls has no min/max but cannot break a bound
+        if stats.null_count == num_rows:
+            return True
+        edge = stats.min if lower else stats.max
+        if edge is None:
+            return None
+        return edge >= threshold if lower else edge <= threshold
+    return verdict
+
+def _unknown(stats, num_rows: int) -> None:
+    return None
+
+def prove_rules(manifest: Any, source: Source, frame: pl.DataFrame | pl.LazyFrame | None = None) -> FrozenSet[str]:
+    """Finds the `fail` rules that Parquet footer statistics show can never trigger for this source.
+
+    Covers `on_null: fail` (every null_count is zero) and `min_policy`/`max_policy` with tactic `fail` (every
+    row group's min/max lies within the threshold). Only row groups whose statistics are missing or
+    inconclusive are read, and only the one column. A column qualifies when the contract's cast keeps its
+    stored values unchanged and no earlier rule can write new values into it. Float `max_policy` is always
+    checked against the data: NaN counts as a violation but is left out of Parquet min/max statistics.
+
+    Args:
+        manifest: The contract.
+        source (Source): Where the data is read from; only sources exposing `row_groups()` can prove anything.
+        frame (pl.DataFrame | pl.LazyFrame, optional): The extracted frame, to read the stored dtypes from.
+
+    Returns:
+        FrozenSet[str]: Proven rules, named "columns.<column>.on_null", "columns.<column>.min_policy" or "columns.<column>.max_policy".
+    """
+    candidates = {}
+    for col_name, col_def in manifest.columns.items():
+        constraints = col_def.constraints
+        fails = [
+            name for name in ("min_policy", "max_policy")
+            if constraints is not None and getattr(constraints, name) is not None
+            and getattr(constraints, name).violate_action.tactic == "fail"
+        ]
+        if col_def.on_null is not None and col_def.on_null.tactic == NullTactic.FAIL:
+            fails.append("on_null")
+        if fails:
+            candidates[col_name] = fails
+    if not candidates:
+        return frozenset()
+
+    groups = source.row_groups()
+    if groups is None:
+        return frozenset()
+    schema = (frame if frame is not None else source.read()).collect_schema()
+
+    rules = set()
+    for col_name, fails in candidates.items():
+        col_def = manifest.columns[col_name]
+        if col_name not in schema or not _preserved(schema[col_name], col_def):
+            continue
+        col = pl.col(col_name)
+        filled = col_def.on_null is not None and col_def.on_null.tactic not in (NullTactic.FAIL, NullTactic.DROP_ROW)
+        if "on_null" in fails or filled:
+            null_free = _holds(groups, col_name, _no_nulls, col.is_null())
+            if "on_null" in fails and null_free:
+                rules.add(f"columns.{col_name}.on_null")
+            # Null fills run before constraints and may write any value, which stored bounds do not cover
+            if filled and not null_free:
+                continue
+        if col_def.dtype not in NUMERIC_DTYPES or col_def.constraints is None:
+            continue
+
+        min_policy, max_policy = col_def.constraints.min_policy, col_def.constraints.max_policy
+        # min_policy runs first; unless it only fails or drops rows, max_policy can be proven only if it never fires
+        min_writes = min_policy is not None and min_policy.violate_action.tactic not in ("fail", "drop_row")
+        min_ok = False
+        if min_policy is not None and _numeric(min_policy.threshold) and ("min_policy" in fails or ("max_policy" in fails and min_writes)):
+            min_ok = _holds(groups, col_name, _bound(min_policy.threshold, lower=True), col < min_policy.threshold)
+            if min_ok and "min_policy" in fails:
+                rules.add(f"columns.{col_name}.min_policy")
+        if "max_policy" in fails and _numeric(max_policy.threshold) and (min_ok or not min_writes):
+            from_stats = _bound(max_policy.threshold, lower=False) if schema[col_name] in STORED_INTEGERS else _unknown
+            if _holds(groups, col_name, from_stats, col > max_policy.threshold):
+                rules.add(f"columns.{col_name}.max_policy")
+    return frozenset(rules)
+
+def _numeric(threshold: Any) -> bool:
+    return isinstance(threshold, (int, float)) and not isinstance(threshold, bool)
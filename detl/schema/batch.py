@@ -0,0 +1,53 @@
+from typing import Optional, List, Literal, Union
+from pathlib import Path
+from pydantic import BaseModel, Field, PositiveInt, model_validator
+
+from detl.connectors.factory import CONNECTOR_TYPES, FILE_EXTENSIONS
+
+class ConnectorDef(BaseModel):
+    type: Optional[Literal[CONNECTOR_TYPES]] = None
+    uri: str
+    query: Optional[str] = None
+    table: Optional[str] = None
+    if_table_exists: Optional[Literal["replace", "append", "fail", "merge", "swap"]] = None
+    key_columns: Optional[List[str]] = None
+    batch_size: Optional[PositiveInt] = None
+    format: Optional[Literal["parquet", "csv"]] = None
+    endpoint_url: Optional[str] = None
+
+    @model_validator(mode='after')
+    def check_connector_logic(self) -> 'ConnectorDef':
+        if self.type is None and not self.uri.startswith("s3://") and Path(self.uri).suffix.lower() not in FILE_EXTENSIONS:
+            raise ValueError(f"Cannot infer the connector type of '{self.uri}'; set 'type' explicitly.")
+        if self.if_table_exists == "merge" and not self.key_columns:
+            raise ValueError("'if_table_exists: merge' requires 'key_columns'.")
+        return self
+
+    @property
+    def is_file(self) -> bool:
+        if self.type is not None:
+            return self.type in ("csv", "parquet", "excel")
+        return not self.uri.startswith("s3://")
+
+class JobDef(BaseModel):
+    name: str
+    config: Path
+    source: ConnectorDef
+    sink: ConnectorDef
+    priority: int = 0
+    max_memory: Optional[Union[int, str]] = None
+
+class BatchDef(BaseModel):
+    max_workers: Optional[PositiveInt] = None
+    threads_per_worker: Optional[PositiveInt] = None
+    pool_size: Optional[PositiveInt] = None
+    jobs: List[JobDef] = Field(min_length=1)
+
+    @model_validator(mode='after')
+    def check_unique_names(self) -> 'BatchDef':
+        seen = set()
+        for job in self.jobs:
+            if job.name in seen:
+                raise ValueError(f"Duplicate job name '{job.name}'.")
+            seen.add(job.name)
+        return self
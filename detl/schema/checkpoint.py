@@ -0,0 +1,7 @@
+from typing import Optional
+from pathlib import Path
+from pydantic import BaseModel
+
+class CheckpointDef(BaseModel):
+    path: Path
+    key: Optional[str] = None
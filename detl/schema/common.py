@@ -1,8 +1,10 @@
-from typing import Optional, Union, Dict, Literal, Any
+from typing import Optional, Union, Dict, List, Literal, Any
 from pydantic import BaseModel, Field, model_validator
 
 from detl.constants import (
     DType,
+    NUMERIC_DTYPES,
+    STRING_DTYPES,
     StringActionTactic,
     NumericActionTactic
 )
@@ -33,16 +35,27 @@ class NumericViolateAction(BaseModel):
         return self
 
 class DateFormatConfig(BaseModel):
-    in_format: str = Field(alias="input")
+    in_format: Union[str, List[str]] = Field(alias="input")
     out_format: str = Field(alias="output")
     on_parse_error: Dict[str, Literal["drop_row", "fail"]] = Field(default_factory=lambda: {"tactic": "drop_row"})
 
+    @model_validator(mode='after')
+    def check_formats(self) -> 'DateFormatConfig':
+        if not self.in_formats:
+            raise ValueError("Date format 'input' needs at least one format.")
+        return self
+
+    @property
+    def in_formats(self) -> List[str]:
+        """Input formats in the order they are tried."""
+        return [self.in_format] if isinstance(self.in_format, str) else self.in_format
+
 def validate_type_logic(dtype: DType, constraints: Optional[Any], on_null: Optional[Any], context: str) -> None:
     if constraints:
-        if dtype in ["string", "boolean"]:
+        if dtype in STRING_DTYPES or dtype == "boolean":
             if constraints.min_policy or constraints.max_policy:
                 raise ValueError(f"min/max policy {context}cannot be applied to '{dtype}' dtype. Use min_length/max_length for strings.")
-        if dtype in ["int", "float", "boolean", "date", "datetime"]:
+        if dtype not in STRING_DTYPES:
             if getattr(constraints, 'regex', None):
                 raise ValueError(f"Regex constraints {context}can only be applied to 'string' dtype.")
             if getattr(constraints, 'min_length', None) or getattr(constraints, 'max_length', None):
@@ -52,7 +65,7 @@ def validate_type_logic(dtype: DType, constraints: Optional[Any], on_null: Optio
         compute_tactics = ["fill_mean", "fill_median", "fill_min", "fill_max"]
         tactic = getattr(on_null, 'tactic', None)
         if tactic in compute_tactics:
-            if dtype not in ["int", "float"]:
+            if dtype not in NUMERIC_DTYPES:
                 if dtype in ["date", "datetime"] and tactic in ["fill_max", "fill_min"]:
                     pass
                 else:
@@ -60,10 +73,10 @@ def validate_type_logic(dtype: DType, constraints: Optional[Any], on_null: Optio
         elif tactic == "fill_value":
             val = getattr(on_null, 'value', None)
             if val is not None:
-                if dtype in ["int", "float"] and not isinstance(val, (int, float)):
+                if dtype in NUMERIC_DTYPES and not isinstance(val, (int, float)):
                     raise ValueError(f"fill_value for numeric dtype '{dtype}' {context}must be a number. Got: {type(val).__name__}")
-                if dtype == "string" and not isinstance(val, str):
-                    raise ValueError(f"fill_value for dtype 'string' {context}must be a string. Got: {type(val).__name__}")
+                if dtype in STRING_DTYPES and not isinstance(val, str):
+                    raise ValueError(f"fill_value for dtype '{getattr(dtype, 'value', dtype)}' {context}must be a string. Got: {type(val).__name__}")
                 if dtype == "boolean" and not isinstance(val, bool):
                     raise ValueError(f"fill_value for dtype 'boolean' {context}must be a boolean. Got: {type(val).__name__}")
                 if dtype in ["date", "datetime"] and not isinstance(val, str):
@@ -1,9 +1,10 @@
-from typing import Optional, Union, List
-from pydantic import BaseModel, model_validator
+from typing import Optional, Union, List, Literal
+from pydantic import BaseModel, field_validator, model_validator
 from pathlib import Path
 
 from detl.constants import DupTactic
 from detl.schema.common import StringViolateAction, NumericViolateAction
+from detl.patterns import validate_pattern
 
 class UniqueConstraint(BaseModel):
     tactic: DupTactic
@@ -29,9 +30,24 @@ class MaxPolicy(BaseModel):
         return self
 
 class RegexPolicy(BaseModel):
-    pattern: str
+    pattern: Union[str, List[str]]
+    match: Literal["any", "all"] = "any"
     violate_action: StringViolateAction
 
+    @field_validator("pattern")
+    @classmethod
+    def check_patterns(cls, v: Union[str, List[str]]) -> Union[str, List[str]]:
+        patterns = [v] if isinstance(v, str) else v
+        if not patterns:
+            raise ValueError("regex needs at least one pattern.")
+        for pattern in patterns:
+            validate_pattern(pattern)
+        return v
+
+    @property
+    def patterns(self) -> List[str]:
+        return [self.pattern] if isinstance(self.pattern, str) else self.pattern
+
 class StringLengthPolicy(BaseModel):
     length: int
     violate_action: StringViolateAction
@@ -5,6 +5,12 @@ from detl.constants import DType, DupTactic
 from detl.schema.common import DateFormatConfig, validate_type_logic
 from detl.schema.nulls import NullPolicy
 from detl.schema.constraints import ConstraintsDef
+from detl.schema.incremental import IncrementalDef
+from detl.schema.statistics import StatisticsDef
+from detl.schema.key_index import KeyIndexDef
+from detl.schema.seen_keys import SeenKeysDef
+from detl.schema.rule_order import RuleOrderDef
+from detl.schema.checkpoint import CheckpointDef
 
 class ColumnDef(BaseModel):
     rename: Optional[str] = None
@@ -18,6 +24,8 @@ class ColumnDef(BaseModel):
     def check_column_logic(self) -> 'ColumnDef':
         if self.date_format is not None and self.dtype not in [DType.DATE, DType.DATETIME]:
             raise ValueError("Format configuration (format) can only be applied to 'date' or 'datetime' columns.")
+        if self.dtype == DType.ENUM and (self.constraints is None or self.constraints.allowed_values is None):
+            raise ValueError("dtype 'enum' takes its categories from 'constraints.allowed_values'; declare them.")
         validate_type_logic(self.dtype, self.constraints, self.on_null, context="")
         return self
 
@@ -40,6 +48,18 @@ class ConfDef(BaseModel):
     undefined_columns: Literal["drop", "keep"] = "drop"
     on_duplicate_rows: Annotated[DuplicateRowsConfig, BeforeValidator(coerce_dup_config)] = Field(default_factory=DuplicateRowsConfig)
     defaults: Optional[Dict[DType, DefaultPolicies]] = None
+    statistics: StatisticsDef = Field(default_factory=StatisticsDef)
+    key_index: KeyIndexDef = Field(default_factory=KeyIndexDef)
+    seen_keys: Optional[SeenKeysDef] = None
+    rule_order: Optional[RuleOrderDef] = None
+    checkpoint: Optional[CheckpointDef] = None
+    auto_downcast: bool = False
+
+    @model_validator(mode='after')
+    def check_seen_keys_logic(self) -> 'ConfDef':
+        if self.seen_keys is not None and not (self.seen_keys.subset or self.on_duplicate_rows.subset):
+            raise ValueError("seen_keys requires key columns: set 'seen_keys.subset' or 'on_duplicate_rows.subset'.")
+        return self
 
     @model_validator(mode='after')
     def check_defaults_logic(self) -> 'ConfDef':
@@ -55,5 +75,6 @@ class Manifesto(BaseModel):
     conf: ConfDef = Field(default_factory=ConfDef)
     columns: Dict[str, ColumnDef] = Field(default_factory=dict)
     pipeline: Optional[List[Dict[str, Any]]] = None
+    incremental: Optional[IncrementalDef] = None
 
 
@@ -0,0 +1,17 @@
+from typing import Optional, Literal
+from pathlib import Path
+from pydantic import BaseModel, model_validator
+
+class IncrementalDef(BaseModel):
+    mode: Literal["watermark", "files"] = "watermark"
+    column: Optional[str] = None
+    state: Path = Path(".detl_state.json")
+    key: Optional[str] = None
+
+    @model_validator(mode='after')
+    def check_mode_logic(self) -> 'IncrementalDef':
+        if self.mode == "watermark" and not self.column:
+            raise ValueError("Incremental mode 'watermark' requires a 'column' (e.g. 'updated_at').")
+        if self.mode == "files" and self.column:
+            raise ValueError("Parameter 'column' is forbidden for incremental mode 'files'.")
+        return self
@@ -0,0 +1,10 @@
+from typing import Literal, Optional
+from pathlib import Path
+from pydantic import BaseModel, Field
+
+class KeyIndexDef(BaseModel):
+    mode: Literal["exact", "bloom"] = "exact"
+    max_memory_keys: int = Field(20_000_000, gt=0)
+    spill_dir: Optional[Path] = None
+    capacity: int = Field(100_000_000, gt=0)
+    error_rate: float = Field(0.001, gt=0, lt=1)
@@ -0,0 +1,6 @@
+from pathlib import Path
+from pydantic import BaseModel, Field
+
+class RuleOrderDef(BaseModel):
+    profile: Path
+    sample_rows: int = Field(100_000, gt=0)
@@ -0,0 +1,8 @@
+from typing import List, Optional
+from pathlib import Path
+from pydantic import BaseModel, Field
+
+class SeenKeysDef(BaseModel):
+    store: Path
+    subset: Optional[List[str]] = None
+    compact_after: int = Field(16, gt=1)
@@ -0,0 +1,9 @@
+from typing import Literal
+from pydantic import BaseModel, Field
+
+class StatisticsDef(BaseModel):
+    strategy: Literal["two_pass", "single_pass"] = "two_pass"
+    precision: Literal["exact", "approximate"] = "exact"
+    sample_rows: int = Field(1_000_000, gt=0)
+    compression: int = Field(100, ge=10)
+    heavy_hitters: int = Field(1_000, gt=0)
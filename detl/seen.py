@@ -0,0 +1,86 @@
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import List, Union
+
+import polars as pl
+
+SEGMENT_GLOB = "keys-*.parquet"
+
+class SeenKeyStore:
+    """
+    Keys of rows loaded by previous runs, kept as Parquet segments in a local directory.
+
+    `drop_seen` removes already-loaded rows with an anti-join against the stored keys, streamed from disk.
+    `append` adds a new segment per run; once more than `compact_after` segments exist they are merged
+    into a single sorted, de-duplicated one. Segments are published by rename, so a crash never leaves
+    a partial file behind.
+
+    Args:
+        directory: Where segments are stored.
+        keys: Key columns identifying a row.
+        compact_after: Segment count that triggers compaction.
+    """
+    def __init__(self, directory: Union[str, Path], keys: List[str], compact_after: int = 16):
+        self.directory = Path(directory).expanduser()
+        self.keys = keys
+        self.compact_after = compact_after
+
+    def segments(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(SEGMENT_GLOB))
+
+    def scan(self, schema: pl.Schema | None = None) -> pl.LazyFrame | None:
+        """All stored keys, cast to the key dtypes in `schema` when given. None if nothing is stored yet."""
+        segments = self.segments()
+        if not segments:
+            return None
+        stored = pl.scan_parquet(segments).select(self.keys)
+        if schema is not None:
+            stored = stored.cast({k: schema[k] for k in self.keys})
+        return stored
+
+    def drop_seen(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+        """Removes rows whose keys were loaded by a previous run."""
+        schema = df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema
+        stored = self.scan(schema)
+        if stored is None:
+            return df
+        fresh = df.lazy().join(stored, on=self.keys, how="anti", nulls_equal=True)
+        return fresh if isinstance(df, pl.LazyFrame) else fresh.collect()
+
+    def append(self, keys: pl.DataFrame | pl.LazyFrame) -> None:
+        """Records the keys of newly loaded rows, compacting the store when it has grown too fragmented."""
+        keys = keys.lazy().select(self.keys).unique()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self._tmp_path()
+        keys.sink_parquet(tmp)
+        if pl.scan_parquet(tmp).select(pl.len()).collect().item() == 0:
+            tmp.unlink()
+        else:
+            os.replace(tmp, self._segment_path())
+        if len(self.segments()) > self.compact_after:
+            self.compact()
+
+    def compact(self) -> None:
+        """Merges all segments into one sorted segment without duplicate keys."""
+        segments = self.segments()
+        if len(segments) < 2:
+            return
+        tmp = self._tmp_path()
+        pl.scan_parquet(segments).select(self.keys).unique().sort(self.keys).sink_parquet(tmp)
+        os.replace(tmp, self._segment_path())
+        for old in segments:
+            old.unlink(missing_ok=True)
+
+    def count(self) -> int:
+        stored = self.scan()
+        return 0 if stored is None else stored.unique().select(pl.len()).collect().item()
+
+    def _segment_path(self) -> Path:
+        return self.directory / f"keys-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+
+    def _tmp_path(self) -> Path:
+        return self.directory / f".tmp-{uuid.uuid4().hex}.parquet"
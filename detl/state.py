@@ -0,0 +1,87 @@
+import abc
+import json
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Union
+
+from detl.exceptions import ConfigError
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+class StateStore(abc.ABC):
+    """
+    Small local key/value store persisting run state (watermarks, processed files) between executions.
+    Values are JSON-serializable dictionaries.
+    """
+    @abc.abstractmethod
+    def get(self, key: str) -> Dict[str, Any] | None:
+        pass
+
+    @abc.abstractmethod
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        pass
+
+class JsonStateStore(StateStore):
+    """Stores every key in a single JSON document, replaced atomically on each write."""
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            raise ConfigError(f"State file '{self.path}' is corrupt: {e}")
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        return self._load().get(key)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        data = self._load()
+        data[key] = {**value, "updated_at": datetime.now(timezone.utc).isoformat()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a crash mid-write never leaves a truncated state file behind
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+class SQLiteStateStore(StateStore):
+    """Stores each key as a row in a local SQLite file. Safer than JSON when many jobs share one store."""
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS detl_state (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at TEXT NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM detl_state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO detl_state (key, value, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                (key, json.dumps(value), datetime.now(timezone.utc).isoformat()),
+            )
+
+def open_state_store(path: Union[str, Path]) -> StateStore:
+    """Opens a SQLite-backed store for `.db`/`.sqlite`/`.sqlite3` paths and a JSON store otherwise."""
+    path = Path(path)
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        return SQLiteStateStore(path)
+    return JsonStateStore(path)
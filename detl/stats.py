@@ -0,0 +1,388 @@
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import polars as pl
+
+from detl.constants import NullTactic
+from detl.exceptions import ConfigError
+from detl.schema.statistics import StatisticsDef
+
+# Null tactics and violation actions whose fill value is a statistic over the whole column
+NULL_TACTIC_STATS = {
+    NullTactic.FILL_MEAN: "mean",
+    NullTactic.FILL_MEDIAN: "median",
+    NullTactic.FILL_MAX: "max",
+    NullTactic.FILL_MIN: "min",
+    NullTactic.FILL_MOST_FREQUENT: "mode",
+}
+ACTION_TACTIC_STATS = {"fill_mean": "mean", "fill_median": "median", "fill_max": "max", "fill_min": "min"}
+
+_SESSION: ContextVar[Optional["StatsSession"]] = ContextVar("detl_stats_session", default=None)
+
+def local_stat(col_name: str, kind: str) -> pl.Expr:
+    """The statistic computed over whatever frame the expression is evaluated on."""
+    if kind == "mode":
+        # As in `ValueCounts`: nulls are not a value, and ties resolve to the smallest value
+        return pl.col(col_name).drop_nulls().mode().min()
+    return getattr(pl.col(col_name), kind)()
+
+def stat_expr(df: pl.DataFrame | pl.LazyFrame, col_name: str, kind: str) -> pl.Expr:
+    """Expression for statistic `kind` ("mean", "median", "min", "max" or "mode") of a column.
+
+    Outside batched execution this is the plain aggregate over `df`. During `execute_batches()` it is
+    the dataset-wide value frozen by the statistics pass, so every batch is filled with the same value.
+    """
+    session = _SESSION.get()
+    if session is None:
+        return local_stat(col_name, kind)
+    return session.request(df, col_name, kind)
+
+def note_filter(mask: pl.Expr) -> None:
+    """Tells an active statistics pass that rows are being dropped by `mask`."""
+    session = _SESSION.get()
+    if session is not None:
+        session.filtered(mask)
+
+def provisional(mask: pl.Expr) -> bool:
+    """True while a statistics pass evaluates `mask` over values filled with a not-yet-known statistic.
+
+    Strict checks skip such masks: their outcome is only meaningful once the real statistic is in place.
+    """
+    session = _SESSION.get()
+    return session is not None and session.reads_provisional(mask)
+
+def uses_statistics(manifest: Any) -> bool:
+    """Whether any column rule (or type-level default) fills values with a column statistic."""
+    policies = list(manifest.columns.values()) + list((manifest.conf.defaults or {}).values())
+    for policy in policies:
+        if policy.on_null and policy.on_null.tactic in NULL_TACTIC_STATS:
+            return True
+        if not policy.constraints:
+            continue
+        for field_name in type(policy.constraints).model_fields:
+            action = getattr(getattr(policy.constraints, field_name), "violate_action", None)
+            if action is not None and getattr(action.tactic, "value", action.tactic) in ACTION_TACTIC_STATS:
+                return True
+    return False
+
+def _non_null(series: pl.Series) -> pl.Series:
+    series = series.drop_nulls()
+    return series.filter(~series.is_nan()) if series.dtype.is_float() else series
+
+class MeanStat:
+    def __init__(self):
+        self.total = 0.0
+        self.count = 0
+
+    def update(self, series: pl.Series) -> None:
+        series = series.drop_nulls()
+        if len(series):
+            self.total += float(series.sum())
+            self.count += len(series)
+
+    def merge(self, other: "MeanStat") -> None:
+        self.total += other.total
+        self.count += other.count
+
+    def result(self) -> Any:
+        return self.total / self.count if self.count else None
+
+class ExtremeStat:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.value = None
+
+    def update(self, series: pl.Series) -> None:
+        self._take(getattr(series, self.kind)())
+
+    def merge(self, other: "ExtremeStat") -> None:
+        self._take(other.value)
+
+    def _take(self, value: Any) -> None:
+        if value is None:
+            return
+        if self.value is None:
+            self.value = value
+        else:
+            self.value = min(self.value, value) if self.kind == "min" else max(self.value, value)
+
+    def result(self) -> Any:
+        return self.value
+
+class ValueCounts:
+    """Exact value histogram, mergeable across batches. Memory grows with the number of distinct values."""
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.counts: pl.DataFrame | None = None
+
+    def update(self, series: pl.Series) -> None:
+        vc = series.drop_nulls().value_counts()
+        self._merge(vc.rename({vc.columns[0]: "value"}))
+
+    def merge(self, other: "ValueCounts") -> None:
+        if other.counts is not None:
+            self._merge(other.counts)
+
+    def _merge(self, counts: pl.DataFrame) -> None:
+        if self.counts is not None:
+            counts = pl.concat([self.counts, counts]).group_by("value").agg(pl.col("count").sum())
+        self.counts = counts
+
+    def result(self) -> Any:
+        if self.counts is None or self.counts.height == 0:
+            return None
+        if self.kind == "mode":
+            # Ties resolve to the smallest value, so the result does not depend on batch order
+            return self.counts.sort(["count", "value"], descending=[True, False])["value"][0]
+        return _weighted_median(self.counts.sort("value"), "value", "count")
+
+class HeavyHitters:
+    """Misra-Gries summary keeping at most `capacity` candidate values for the most frequent one.
+
+    Any value occurring in more than 1/capacity of the rows is guaranteed to be retained. While `exact`
+    is True no value has been evicted yet, so `counts` is the full, exact histogram.
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: pl.DataFrame | None = None
+        self.exact = True
+
+    def update(self, series: pl.Series) -> None:
+        vc = series.drop_nulls().value_counts()
+        self._merge(vc.rename({vc.columns[0]: "value"}))
+
+    def merge(self, other: "HeavyHitters") -> None:
+        self.exact = self.exact and other.exact
+        if other.counts is not None:
+            self._merge(other.counts)
+
+    def _merge(self, counts: pl.DataFrame) -> None:
+        if self.counts is not None:
+            counts = pl.concat([self.counts, counts]).group_by("value").agg(pl.col("count").sum())
+        if counts.height > self.capacity:
+            cutoff = counts["count"].sort(descending=True)[self.capacity]
+            counts = counts.with_columns(pl.col("count") - cutoff).filter(pl.col("count") > 0)
+            self.exact = False
+        self.counts = counts
+
+    def result(self) -> Any:
+        if self.counts is None or self.counts.height == 0:
+            return None
+        return self.counts.sort(["count", "value"], descending=[True, False])["value"][0]
+
+class TDigest:
+    """Merging t-digest for approximate medians in bounded memory.
+
+    Centroids are small near the tails and large around the median, sized by the k1 scale function,
+    so `compression` centroids are enough for a median accurate to a fraction of a percentile.
+    """
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.centroids = pl.DataFrame(schema={"mean": pl.Float64, "weight": pl.Float64})
+        self.low: float | None = None
+        self.high: float | None = None
+
+    def update(self, series: pl.Series) -> None:
+        values = _non_null(series).cast(pl.Float64)
+        if not len(values):
+            return
+        self._bounds(values.min(), values.max())
+        self._compress(values.to_frame("mean").with_columns(pl.lit(1.0).alias("weight")))
+
+    def merge(self, other: "TDigest") -> None:
+        if other.low is not None:
+            self._bounds(other.low, other.high)
+            self._compress(other.centroids)
+
+    def _bounds(self, low: float, high: float) -> None:
+        self.low = low if self.low is None else min(self.low, low)
+        self.high = high if self.high is None else max(self.high, high)
+
+    def _compress(self, incoming: pl.DataFrame) -> None:
+        frame = pl.concat([self.centroids, incoming]).sort("mean")
+        total = frame["weight"].sum()
+        q = (pl.col("weight").cum_sum() - pl.col("weight") / 2) / total
+        k = self.compression / (2 * math.pi) * (2 * q - 1).arcsin() + self.compression / 4
+        self.centroids = (
+            frame.with_columns(k.floor().alias("bucket"))
+            .group_by("bucket")
+            .agg((pl.col("mean") * pl.col("weight")).sum() / pl.col("weight").sum(), pl.col("weight").sum())
+            .sort("mean")
+            .select("mean", "weight")
+        )
+
+    def quantile(self, q: float) -> float | None:
+        if self.low is None:
+            return None
+        means, weights = self.centroids["mean"].to_list(), self.centroids["weight"].to_list()
+        target = q * sum(weights)
+        # Interpolate between centroid centres; the tails interpolate towards the exact min and max
+        points = [(0.0, self.low)]
+        cumulative = 0.0
+        for mean, weight in zip(means, weights):
+            points.append((cumulative + weight / 2, mean))
+            cumulative += weight
+        points.append((cumulative, self.high))
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            if target <= x1:
+                return y0 if x1 == x0 else y0 + (y1 - y0) * (target - x0) / (x1 - x0)
+        return self.high
+
+    def result(self) -> Any:
+        return self.quantile(0.5)
+
+def _weighted_median(frame: pl.DataFrame, value: str, weight: str) -> Any:
+    """Median of a sorted histogram, averaging the two middle values like `Series.median()`."""
+    n = frame[weight].sum()
+    upper = frame.with_columns(pl.col(weight).cum_sum().alias("_cum"))
+    lo = upper.filter(pl.col("_cum") > (n - 1) // 2)[value][0]
+    hi = upper.filter(pl.col("_cum") > n // 2)[value][0]
+    return (lo + hi) / 2
+
+def make_accumulator(kind: str, spec: StatisticsDef):
+    if kind == "mean":
+        return MeanStat()
+    if kind in ("min", "max"):
+        return ExtremeStat(kind)
+    if spec.precision == "approximate":
+        return TDigest(spec.compression) if kind == "median" else HeavyHitters(spec.heavy_hitters)
+    return ValueCounts(kind)
+
+class StatsSession:
+    """
+    Makes fill handlers use dataset-wide statistics while a contract runs batch by batch.
+
+    Every `stat_expr()` call made while transforming a batch is a numbered request; the numbering is the
+    same for every batch because it only depends on the contract. A session is either *collecting*,
+    accumulating mergeable partial statistics for each request across all batches, or *applying*,
+    answering requests with the frozen values found by `resolve_statistics()`.
+
+    A statistic is only collected while its input cannot have been influenced by another statistic that
+    is still unknown. Anything downstream of an unknown fill is left for the next pass. A `strict` session
+    refuses to fall back to a frame-local statistic for a request it has no value for.
+    """
+    def __init__(self, spec: StatisticsDef, frozen: Dict[int, Any] | None = None, collect: bool = False, strict: bool = False):
+        self.spec = spec
+        self.frozen: Dict[int, Any] = dict(frozen or {})
+        self.collect = collect
+        self.strict = strict
+        self.requests: Dict[int, Tuple[str, str]] = {}
+        self.tainted: Set[int] = set()
+        self._accumulators: Dict[int, Any] = {}
+        self._ordinal = 0
+        self._dirty: Set[str] = set()
+        self._rows_tainted = False
+
+    @contextmanager
+    def activate(self) -> Iterator["StatsSession"]:
+        self._ordinal = 0
+        self._dirty = set()
+        self._rows_tainted = False
+        token = _SESSION.set(self)
+        try:
+            yield self
+        finally:
+            _SESSION.reset(token)
+
+    def run(self, fn: Callable[[pl.DataFrame], Any], df: pl.DataFrame) -> Any:
+        """Calls `fn(df)` with this session active in the calling thread."""
+        with self.activate():
+            return fn(df)
+
+    def request(self, df: pl.DataFrame | pl.LazyFrame, col_name: str, kind: str) -> pl.Expr:
+        ordinal = self._ordinal
+        self._ordinal += 1
+        if self.requests.setdefault(ordinal, (col_name, kind)) != (col_name, kind):
+            raise ConfigError("The contract requested different statistics for different batches.")
+        if ordinal in self.frozen:
+            return pl.lit(self.frozen[ordinal])
+        if self.strict:
+            raise ConfigError(f"No fitted '{kind}' statistic for column '{col_name}'; refit the statistics for this contract.")
+
+        if self.collect and not self._rows_tainted and col_name not in self._dirty:
+            series = df.select(pl.col(col_name))
+            if isinstance(series, pl.LazyFrame):
+                series = series.collect()
+            if ordinal not in self._accumulators:
+                self._accumulators[ordinal] = make_accumulator(kind, self.spec)
+            self._accumulators[ordinal].update(series.to_series())
+        else:
+            self.tainted.add(ordinal)
+        # The column is now filled with a batch-local value, so anything reading it later is provisional
+        self._dirty.add(col_name)
+        return local_stat(col_name, kind)
+
+    def filtered(self, mask: pl.Expr) -> None:
+        if self.reads_provisional(mask):
+            self._rows_tainted = True
+
+    def reads_provisional(self, mask: pl.Expr) -> bool:
+        if not self._dirty:
+            return False
+        # Helper columns such as custom_expr's `__is_valid` may be derived from any column
+        return any(name in self._dirty or name.startswith("__") for name in mask.meta.root_names())
+
+    def results(self) -> Dict[int, Any]:
+        """Final values of the statistics collected in this pass without interference."""
+        return {o: acc.result() for o, acc in self._accumulators.items() if o not in self.tainted}
+
+    def values(self) -> List[Dict[str, Any]]:
+        """The frozen statistics in request order, for reporting."""
+        return [
+            {"column": col, "statistic": kind, "value": self.frozen.get(o)}
+            for o, (col, kind) in sorted(self.requests.items())
+        ]
+
+def resolve_statistics(
+    spec: StatisticsDef,
+    batches: Callable[[], Iterable[pl.DataFrame]],
+    prepare: Callable[[pl.DataFrame], Any],
+) -> StatsSession:
+    """Runs statistics passes over the batches until every requested statistic is known.
+
+    Statistics that do not depend on each other (e.g. all `on_null` fills) are found in one pass; a
+    fill whose input depends on an earlier fill (e.g. a constraint on a column that was null-filled
+    first) needs one more pass per level of dependency.
+
+    Args:
+        spec: How statistics are computed.
+        batches: Returns a fresh iterable of batches on each call; it is called once per pass.
+        prepare: Applies the contract up to and including the rules that request statistics.
+
+    Returns:
+        StatsSession: An applying session holding the frozen statistics.
+    """
+    frozen: Dict[int, Any] = {}
+    while True:
+        session = StatsSession(spec, frozen, collect=True)
+        for batch in batches():
+            # Requests evaluate their partial statistics eagerly, so the prepared frame itself is not needed
+            session.run(prepare, batch)
+        pending = set(session.requests) - set(frozen)
+        if not pending:
+            break
+        resolved = session.results()
+        if not pending & set(resolved):
+            raise ConfigError("Could not resolve the statistics requested by the contract.")
+        frozen.update(resolved)
+        if not set(session.requests) - set(frozen):
+            break
+
+    applying = StatsSession(spec, frozen)
+    applying.requests = session.requests
+    return applying
+
+def take_rows(batches: Iterable[pl.DataFrame], rows: int) -> Tuple[List[pl.DataFrame], Iterator[pl.DataFrame]]:
+    """Buffers leading batches until at least `rows` rows are held. Returns the buffer and the rest."""
+    iterator = iter(batches)
+    buffered: List[pl.DataFrame] = []
+    held = 0
+    while held < rows:
+        batch = next(iterator, None)
+        if batch is None:
+            break
+        buffered.append(batch)
+        held += batch.height
+    return buffered, iterator
@@ -0,0 +1,68 @@
+import asyncio
+import time
+import boto3
+import polars as pl
+from moto import mock_aws
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors import CsvSource, ParquetSink, S3Source, S3Sink
+from detl.connectors.base import Source
+from detl.connectors.memory import MemorySink
+
+CONTRACT = {"columns": {"id": {"dtype": "int"}, "name": {"dtype": "string", "trim": True}}}
+
+class SlowSource(Source):
+    """Simulates a network-bound source whose latency should overlap across concurrent runs."""
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def read(self):
+        raise AssertionError("aexecute must use aread()")
+
+    async def aread(self):
+        await asyncio.sleep(self.delay)
+        return pl.DataFrame({"id": [1], "name": [" x "]})
+
+def test_aexecute_matches_execute(tmp_path):
+    src = tmp_path / "users.csv"
+    pl.DataFrame({"id": [1, 2], "name": [" a ", "b"]}).write_csv(src)
+
+    Processor(Config(CONTRACT)).execute(CsvSource(src), ParquetSink(tmp_path / "sync.parquet"))
+    asyncio.run(Processor(Config(CONTRACT)).aexecute(CsvSource(src), ParquetSink(tmp_path / "async.parquet")))
+    assert pl.read_parquet(tmp_path / "sync.parquet").equals(pl.read_parquet(tmp_path / "async.parquet"))
+
+def test_concurrent_runs_overlap_io():
+    async def main():
+        sinks = [MemorySink() for _ in range(5)]
+        start = time.perf_counter()
+        await asyncio.gather(*(Processor(Config(CONTRACT)).aexecute(SlowSource(0.3), sink) for sink in sinks))
+        return time.perf_counter() - start, sinks
+
+    elapsed, sinks = asyncio.run(main())
+    assert elapsed < 1.0
+    assert all(s.result.lazy().collect().get_column("name").to_list() == ["x"] for s in sinks)
+
+def test_aexecute_with_incremental_state(tmp_path):
+    src = tmp_path / "events.csv"
+    config = {**CONTRACT, "incremental": {"column": "id", "state": str(tmp_path / "state.json")}}
+    pl.DataFrame({"id": [1, 2], "name": ["a", "b"]}).write_csv(src)
+    asyncio.run(Processor(Config(config)).aexecute(CsvSource(src), MemorySink()))
+
+    pl.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]}).write_csv(src)
+    sink = MemorySink()
+    asyncio.run(Processor(Config(config)).aexecute(CsvSource(src), sink))
+    assert sink.result.lazy().collect().get_column("id").to_list() == [3]
+
+def test_s3_async_roundtrip(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        _s3_roundtrip()
+
+def _s3_roundtrip():
+    boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="lake")
+    asyncio.run(S3Sink("s3://lake/raw/part-0.parquet").awrite(pl.DataFrame({"id": [1], "name": [" a "]})))
+    asyncio.run(S3Sink("s3://lake/raw/part-1.parquet").awrite(pl.DataFrame({"id": [2], "name": ["b"]})))
+
+    out = asyncio.run(Processor(Config(CONTRACT)).aexecute(S3Source("s3://lake/raw/")))
+    assert sorted(out.lazy().collect().get_column("name").to_list()) == ["a", "b"]
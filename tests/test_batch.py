@@ -0,0 +1,63 @@
+import pytest
+import polars as pl
+
+from detl.batch import load_batch, plan_workers, run_many
+from detl.exceptions import ConfigError
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "contract.yml").write_text("columns:\n  id: {dtype: int}\n  name: {dtype: string, trim: true}\n")
+    (tmp_path / "broken.yml").write_text("columns:\n  id: {dtype: bogus}\n")
+    pl.DataFrame({"id": [1, 2], "name": [" a ", "b"]}).write_csv(tmp_path / "users.csv")
+    return tmp_path
+
+def test_plan_workers_never_oversubscribes(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 64)
+    assert plan_workers(200) == (64, 1)
+    assert plan_workers(200, max_workers=8) == (8, 8)
+    assert plan_workers(3) == (3, 21)
+    assert plan_workers(3, threads_per_worker=2) == (3, 2)
+
+def test_load_batch_resolves_paths_relative_to_jobs_file(workspace):
+    (workspace / "jobs.yml").write_text(
+        "jobs:\n"
+        "  - name: users\n"
+        "    config: contract.yml\n"
+        "    source: {uri: users.csv}\n"
+        "    sink: {type: sqlite, uri: 'sqlite:///out.db', table: users}\n"
+    )
+    job = load_batch(workspace / "jobs.yml").jobs[0]
+    assert job.config == workspace / "contract.yml"
+    assert job.source.uri == str(workspace / "users.csv")
+    assert job.sink.uri == "sqlite:///out.db"
+
+def test_load_batch_rejects_duplicate_names(workspace):
+    job = "  - {name: a, config: contract.yml, source: {uri: users.csv}, sink: {uri: out.csv}}\n"
+    (workspace / "jobs.yml").write_text("jobs:\n" + job + job)
+    with pytest.raises(ConfigError, match="Duplicate job name"):
+        load_batch(workspace / "jobs.yml")
+
+def test_run_many_isolates_failures_and_caps_threads(workspace):
+    jobs = [
+        {"name": "good", "config": workspace / "contract.yml", "source": {"uri": str(workspace / "users.csv")}, "sink": {"uri": str(workspace / "out" / "good.parquet")}},
+        {"name": "missing", "config": workspace / "contract.yml", "priority": 10, "source": {"uri": str(workspace / "nope.csv")}, "sink": {"uri": str(workspace / "out" / "missing.parquet")}},
+        {"name": "broken", "config": workspace / "broken.yml", "source": {"uri": str(workspace / "users.csv")}, "sink": {"uri": str(workspace / "out" / "broken.parquet")}},
+    ]
+    results = run_many(jobs, max_workers=2, threads_per_worker=1)
+
+    assert [r.name for r in results] == ["missing", "good", "broken"]
+    by_name = {r.name: r for r in results}
+    assert by_name["good"].ok and by_name["good"].threads == 1
+    assert not by_name["missing"].ok and "not found" in by_name["missing"].error
+    assert not by_name["broken"].ok and by_name["broken"].pid is None
+    assert pl.read_parquet(workspace / "out" / "good.parquet").get_column("name").to_list() == ["a", "b"]
+
+def test_jobs_of_a_worker_share_its_connection_pool(workspace):
+    sink = {"type": "sqlite", "uri": f"sqlite:///{workspace / 'out.db'}"}
+    jobs = [
+        {"name": f"load{i}", "config": workspace / "contract.yml", "source": {"uri": str(workspace / "users.csv")}, "sink": {**sink, "table": "users"}}
+        for i in range(3)
+    ]
+    results = run_many(jobs, max_workers=1, pool_size=1)
+    assert all(r.ok for r in results)
+    assert sum(r.connects for r in results) == 1
@@ -0,0 +1,112 @@
+import random
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors.memory import MemorySource, MemorySink
+from detl.stats import HeavyHitters, TDigest, ValueCounts
+from detl.exceptions import ConstraintViolationError
+
+@pytest.fixture
+def skewed():
+    # Batches differ wildly, so any per-batch statistic would give a visibly different fill
+    rows = 1000
+    return pl.DataFrame({
+        "amount": [None if i % 7 == 0 else float(i if i < 500 else i * 10) for i in range(rows)],
+        "qty": [None if i % 5 == 0 else i % 13 for i in range(rows)],
+        "city": [None if i % 9 == 0 else ("Oslo" if i > 600 else f"c{i % 50}") for i in range(rows)],
+        "score": [None if i % 11 == 0 else i for i in range(rows)],
+    })
+
+def run_both(contract, df, batch_size=100):
+    whole = Processor(Config(contract)).execute(MemorySource(df))
+    whole = whole.lazy().collect()
+    sink = MemorySink()
+    processor = Processor(Config(contract))
+    processor.execute_batches(MemorySource(df), sink, batch_size=batch_size)
+    return whole, sink.result.lazy().collect(), processor
+
+def test_null_fills_use_dataset_wide_statistics(skewed):
+    contract = {"columns": {
+        "amount": {"dtype": "float", "on_null": {"tactic": "fill_mean"}},
+        "qty": {"dtype": "int", "on_null": {"tactic": "fill_median"}},
+        "city": {"dtype": "string", "on_null": {"tactic": "fill_most_frequent"}},
+        "score": {"dtype": "int", "on_null": {"tactic": "fill_max"}},
+    }}
+    whole, batched, processor = run_both(contract, skewed)
+
+    assert batched["amount"].to_list() == pytest.approx(whole["amount"].to_list())
+    assert batched.drop("amount").equals(whole.drop("amount"))
+    assert [s["statistic"] for s in processor.statistics.values()] == ["mean", "median", "mode", "max"]
+
+def test_most_frequent_ignores_nulls_in_memory_and_in_batches():
+    # Null is the commonest entry and "a"/"b" tie: both runs fill with the smallest of the most frequent values
+    df = pl.DataFrame({"city": [None] * 6 + ["b", "a", "b", "a"]})
+    contract = {"columns": {"city": {"dtype": "string", "on_null": {"tactic": "fill_most_frequent"}}}}
+    whole, batched, _ = run_both(contract, df, batch_size=3)
+
+    assert whole["city"].to_list() == ["a"] * 6 + ["b", "a", "b", "a"]
+    assert batched.equals(whole)
+
+def test_dependent_statistics_resolve_over_several_passes(skewed):
+    # max_policy's mean depends on the null fill and on rows dropped by score's min_policy
+    contract = {"columns": {
+        "amount": {"dtype": "float", "on_null": {"tactic": "fill_median"},
+                   "constraints": {"max_policy": {"threshold": 3000, "violate_action": {"tactic": "fill_mean"}}}},
+        "score": {"dtype": "int", "on_null": {"tactic": "fill_min"},
+                  "constraints": {"min_policy": {"threshold": 20, "violate_action": {"tactic": "drop_row"}}}},
+        "qty": {"dtype": "int", "constraints": {"min_policy": {"threshold": 2, "violate_action": {"tactic": "fill_mean"}}}},
+    }}
+    whole, batched, _ = run_both(contract, skewed)
+
+    assert batched.height == whole.height
+    for col in ("amount", "score", "qty"):
+        assert batched[col].to_list() == pytest.approx(whole[col].to_list())
+
+def test_strict_checks_wait_for_final_statistics():
+    # The first batch's own median (100) would trip the custom check; the dataset-wide median (0) does not
+    df = pl.DataFrame({"v": [100, 100, 10] + [0] * 97})
+    contract = {"columns": {"v": {"dtype": "int", "constraints": {
+        "max_policy": {"threshold": 50, "violate_action": {"tactic": "fill_median"}},
+        "custom_expr": {"expr": "v <= 60", "violate_action": {"tactic": "fail"}},
+    }}}}
+    whole, batched, _ = run_both(contract, df, batch_size=3)
+    assert batched.equals(whole)
+    assert batched["v"].head(3).to_list() == [0, 0, 10]
+
+    with pytest.raises(ConstraintViolationError):
+        contract["columns"]["v"]["constraints"]["custom_expr"]["expr"] = "v <= 5"
+        Processor(Config(contract)).execute_batches(MemorySource(df), MemorySink(), batch_size=3)
+
+def test_single_pass_estimates_from_leading_rows():
+    df = pl.DataFrame({"v": [None, 10.0, 20.0, 30.0] + [1000.0] * 96})
+    contract = {
+        "conf": {"statistics": {"strategy": "single_pass", "sample_rows": 4}},
+        "columns": {"v": {"dtype": "float", "on_null": {"tactic": "fill_mean"}}},
+    }
+    sink = MemorySink()
+    processor = Processor(Config(contract))
+    metrics = processor.execute_batches(MemorySource(df), sink, batch_size=4)
+
+    assert sink.result.lazy().collect()["v"][0] == pytest.approx(20.0)
+    assert metrics.stages[0].rows == 100
+
+def test_approximate_sketches_merge_across_batches():
+    rng = random.Random(7)
+    values = [rng.gauss(50, 15) for _ in range(20_000)]
+    digest, exact = TDigest(100), ValueCounts("median")
+    for i in range(0, len(values), 1000):
+        part = TDigest(100)
+        part.update(pl.Series(values[i:i + 1000]))
+        digest.merge(part)
+        exact.update(pl.Series(values[i:i + 1000]))
+    assert exact.result() == pytest.approx(pl.Series(values).median())
+    assert digest.result() == pytest.approx(exact.result(), abs=0.5)
+    assert digest.centroids.height <= 100
+
+    hitters = HeavyHitters(capacity=10)
+    for i in range(20):
+        hitters.update(pl.Series(["hot"] * 30 + [f"cold{i}-{j}" for j in range(70)]))
+    assert hitters.result() == "hot"
+    assert hitters.counts.height <= 10
@@ -0,0 +1,76 @@
+import polars as pl
+
+from benchmarks import contracts, registries, wide
+from benchmarks.datagen import generate, kitchen_sink_frame
+from benchmarks.harness import BenchmarkResult, BenchmarkRun, compare, load_run, save_run
+
+
+def test_generator_is_seeded_and_shaped():
+    df = generate(2_000, columns=8, null_rate=0.1, dirty_rate=0.0, seed=7, string_shape="email", date_shape="mixed")
+
+    assert df.equals(generate(2_000, columns=8, null_rate=0.1, dirty_rate=0.0, seed=7, string_shape="email", date_shape="mixed"))
+    assert not df.equals(generate(2_000, columns=8, null_rate=0.1, dirty_rate=0.0, seed=8, string_shape="email", date_shape="mixed"))
+    assert df.columns == ["int_0", "float_1", "string_2", "boolean_3", "date_4", "datetime_5", "int_6", "float_7"]
+    assert 100 < df.get_column("int_0").null_count() < 300
+    assert df.get_column("boolean_3").null_count() == 0
+    assert df.get_column("string_2").drop_nulls().str.contains("@").all()
+    # Mixed date shape interleaves ISO and European layouts
+    dates = df.get_column("date_4").drop_nulls()
+    assert dates.str.contains("/").any() and dates.str.contains("-").any()
+
+
+def test_dirty_rate_injects_violations():
+    clean = generate(5_000, null_rate=0.0, dirty_rate=0.0)
+    dirty = generate(5_000, null_rate=0.0, dirty_rate=0.2)
+
+    assert clean.get_column("int_0").min() >= 0
+    assert dirty.get_column("int_0").min() < 0
+    assert kitchen_sink_frame(100).columns == ["user_id", "name", "age", "country", "salary", "role"]
+
+
+def test_every_registry_handler_has_a_case():
+    cases = registries.cases(500) + contracts.cases(500)
+    groups = {group for _, group, _ in cases}
+
+    assert groups == {"types", "nulls", "constraints", "actions", "pipeline", "contracts"}
+    for _, _, fn in cases:
+        fn()
+
+
+def test_wide_suite_caps_rows_and_covers_every_rule_kind():
+    cases = wide.cases(5_000, columns=[30, 60])
+
+    assert [name for name, _, _ in cases] == ["30_columns", "60_columns"]
+    out = cases[1][2]()
+    assert out.width == 60 and out.height <= wide.MAX_ROWS
+    assert set(out.schema.values()) == {pl.Float64, pl.Int64, pl.String}
+
+
+def test_compare_flags_regressions(tmp_path):
+    base = BenchmarkRun(commit="aaa", results=[
+        BenchmarkResult(name="regex", group="constraints", rows=10, timings=[1.0, 1.2]),
+        BenchmarkResult(name="sort", group="pipeline", rows=10, timings=[1.0]),
+    ])
+    head = BenchmarkRun(commit="bbb", results=[
+        BenchmarkResult(name="regex", group="constraints", rows=10, timings=[1.5]),
+        BenchmarkResult(name="sort", group="pipeline", rows=10, timings=[1.05]),
+    ])
+    save_run(base, tmp_path)
+    save_run(head, tmp_path)
+
+    rows, regressions = compare(load_run("aaa", tmp_path), load_run("bbb", tmp_path), threshold=0.10)
+
+    assert len(rows) == 2
+    assert [r.key for r in regressions] == ["constraints/regex@10"]
+
+
+def test_connector_suite_measures_local_targets():
+    from benchmarks.connectors import suite
+
+    results = suite.run(300, ["memory", "csv", "parquet", "sqlite"], batch_sizes=[None, 100], repeats=1, warmup=0)
+    names = {(r.group, r.name) for r in results}
+
+    assert ("connectors/csv", "write") in names and ("connectors/parquet", "read") in names
+    assert ("connectors/sqlite", "write[batch=100]") in names
+    assert ("connectors/sqlite", "write[sqlalchemy]") in names
+    assert all(r.bytes and r.peak_memory is not None for r in results)
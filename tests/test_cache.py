@@ -0,0 +1,98 @@
+import os
+import pytest
+import polars as pl
+
+from detl.cache import ResultCache
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors import CsvSource, ParquetSink
+from detl.connectors.memory import MemorySource, MemorySink
+from detl.exceptions import ConfigError
+
+CONTRACT = {
+    "columns": {
+        "id": {"dtype": "int"},
+        "name": {"dtype": "string", "trim": True},
+    }
+}
+
+class CountingSink(ParquetSink):
+    def __init__(self, path):
+        super().__init__(path)
+        self.writes = 0
+
+    def write(self, df):
+        self.writes += 1
+        super().write(df)
+
+@pytest.fixture
+def csv_input(tmp_path):
+    path = tmp_path / "users.csv"
+    pl.DataFrame({"id": [1, 2], "name": [" ann ", "bob"]}).write_csv(path)
+    return path
+
+def test_identical_rerun_skips_transform_and_sink(tmp_path, csv_input):
+    cache = ResultCache(tmp_path / "cache")
+    sink = CountingSink(tmp_path / "out.parquet")
+
+    first = Processor(Config(CONTRACT), cache=cache)
+    first.execute(CsvSource(csv_input), sink)
+    assert not first.cache_hit and sink.writes == 1
+
+    second = Processor(Config(CONTRACT), cache=cache)
+    second.execute(CsvSource(csv_input), sink)
+    assert second.cache_hit and sink.writes == 1
+    assert pl.read_parquet(sink.path).get_column("name").to_list() == ["ann", "bob"]
+
+def test_changed_sink_is_rewritten_from_cache(tmp_path, csv_input):
+    cache = ResultCache(tmp_path / "cache")
+    sink = CountingSink(tmp_path / "out.parquet")
+    Processor(Config(CONTRACT), cache=cache).execute(CsvSource(csv_input), sink)
+
+    sink.path.unlink()
+    proc = Processor(Config(CONTRACT), cache=cache)
+    proc.execute(CsvSource(csv_input), sink)
+    assert proc.cache_hit and sink.writes == 2
+    assert pl.read_parquet(sink.path).height == 2
+
+def test_changed_input_or_contract_misses(tmp_path, csv_input):
+    cache = ResultCache(tmp_path / "cache")
+    Processor(Config(CONTRACT), cache=cache).execute(CsvSource(csv_input))
+
+    other_contract = {"columns": {**CONTRACT["columns"], "name": {"dtype": "string"}}}
+    proc = Processor(Config(other_contract), cache=cache)
+    proc.execute(CsvSource(csv_input))
+    assert not proc.cache_hit
+
+    pl.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]}).write_csv(csv_input)
+    proc = Processor(Config(CONTRACT), cache=cache)
+    assert proc.execute(CsvSource(csv_input)).collect().height == 3
+    assert not proc.cache_hit
+
+def test_content_hash_survives_touch(tmp_path, csv_input):
+    cache = ResultCache(tmp_path / "cache", hash_content=True)
+    Processor(Config(CONTRACT), cache=cache).execute(CsvSource(csv_input))
+    os.utime(csv_input, (1, 1))
+
+    proc = Processor(Config(CONTRACT), cache=cache)
+    proc.execute(CsvSource(csv_input))
+    assert proc.cache_hit
+
+def test_unfingerprintable_source_is_not_cached(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    Processor(Config(CONTRACT), cache=cache).execute(MemorySource(pl.DataFrame({"id": [1], "name": ["a"]})), MemorySink())
+    assert cache.entries() == []
+
+def test_eviction_by_age_and_size(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=1)
+    first = cache.store("a" * 64, pl.DataFrame({"x": [1]}))
+    second = cache.store("b" * 64, pl.DataFrame({"x": [2]}))
+    # The entry just stored always survives, even if it alone exceeds the budget
+    assert not first.path.exists() and second.path.exists()
+
+    cache.max_age = 1e-9
+    assert cache.lookup("b" * 64) is None
+    assert cache.entries() == []
+
+    with pytest.raises(ConfigError):
+        ResultCache(tmp_path / "cache", max_age=0)
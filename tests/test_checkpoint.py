@@ -0,0 +1,112 @@
+import sqlite3
+
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors import CsvSink, CsvSource, ParquetSink, SQLiteSink, SQLiteSource
+from detl.connectors.memory import MemorySink, MemorySource
+from detl.exceptions import ConfigError
+
+def contract(tmp_path, **conf):
+    return {
+        "columns": {
+            "id": {"dtype": "int"},
+            "name": {"dtype": "string", "trim": True},
+            "amount": {"dtype": "float", "on_null": {"tactic": "fill_mean"}},
+        },
+        "conf": {"checkpoint": {"path": str(tmp_path / "run.checkpoint")}, **conf},
+    }
+
+@pytest.fixture
+def users_csv(tmp_path):
+    path = tmp_path / "users.csv"
+    pl.DataFrame({
+        # Every id occurs twice, the repeat in a later batch
+        "id": [i % 500 for i in range(1000)],
+        "name": [f" user{i} " for i in range(1000)],
+        "amount": [None if i % 7 == 0 else float(i) for i in range(1000)],
+    }).write_csv(path)
+    return path
+
+def crashing(sink_class):
+    class Crashing(sink_class):
+        """Fails on its `after + 1`-th batch, like a process killed mid-run."""
+        def __init__(self, *args, after: int, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.after, self.written = after, 0
+
+        def write_batch(self, df):
+            if self.written == self.after:
+                raise RuntimeError("killed")
+            super().write_batch(df)
+            self.written += 1
+    # The checkpoint records the sink class; the resumed run uses the plain one
+    Crashing.__name__ = sink_class.__name__
+    return Crashing
+
+def run_crashed(conf, source, sink_class, path, after=3, **sink_args):
+    with pytest.raises(RuntimeError, match="killed"):
+        Processor(Config(conf)).execute_batches(source, crashing(sink_class)(path, **sink_args, after=after), batch_size=100)
+    processor = Processor(Config(conf), resume=True)
+    processor.execute_batches(source, sink_class(path, **sink_args), batch_size=100)
+    return processor
+
+@pytest.mark.parametrize("sink_class,read", [(CsvSink, pl.read_csv), (ParquetSink, pl.read_parquet)])
+def test_resumed_run_matches_an_uninterrupted_one(tmp_path, users_csv, sink_class, read):
+    conf = contract(tmp_path, on_duplicate_rows={"tactic": "drop_extras", "subset": ["id"]})
+    Processor(Config(conf)).execute_batches(CsvSource(users_csv), sink_class(tmp_path / "clean.out"), batch_size=100)
+
+    processor = run_crashed(conf, CsvSource(users_csv), sink_class, tmp_path / "resumed.out")
+
+    assert processor.resumed.batches == 3
+    # Only the remaining batches went through the pipeline again
+    assert processor.metrics.stages[0].rows == 700
+    assert read(tmp_path / "resumed.out").equals(read(tmp_path / "clean.out"))
+    assert read(tmp_path / "resumed.out")["id"].is_unique().all()
+    assert not (tmp_path / "run.checkpoint").exists()
+    assert not (tmp_path / "run.checkpoint.d").exists()
+
+def test_resume_reuses_checkpointed_statistics(tmp_path, users_csv, monkeypatch):
+    conf = contract(tmp_path)
+    with pytest.raises(RuntimeError, match="killed"):
+        Processor(Config(conf)).execute_batches(CsvSource(users_csv), crashing(CsvSink)(tmp_path / "out.csv", after=2), batch_size=100)
+
+    def recompute(*args, **kwargs):
+        raise AssertionError("statistics were recomputed")
+    monkeypatch.setattr("detl.core.resolve_statistics", recompute)
+    Processor(Config(conf), resume=True).execute_batches(CsvSource(users_csv), CsvSink(tmp_path / "out.csv"), batch_size=100)
+
+    out = pl.read_csv(tmp_path / "out.csv")
+    assert out.height == 1000 and out["amount"].null_count() == 0
+
+def test_database_source_resumes_after_its_key(tmp_path):
+    db = tmp_path / "source.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE users (id INTEGER, name TEXT, amount REAL)")
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?)", [(i, f"u{i}", float(i)) for i in range(1000)])
+    conf = contract(tmp_path)
+    conf["conf"]["checkpoint"]["key"] = "id"
+    source = SQLiteSource(f"sqlite:///{db}", "SELECT * FROM users ORDER BY id")
+    out = f"sqlite:///{tmp_path / 'out.db'}"
+
+    processor = run_crashed(conf, source, SQLiteSink, out, table_name="users")
+
+    assert processor.metrics.stages[0].rows == 700
+    assert pl.read_database_uri("SELECT id FROM users ORDER BY id", out, engine="adbc")["id"].to_list() == list(range(1000))
+
+def test_checkpoint_of_another_contract_is_rejected(tmp_path, users_csv):
+    with pytest.raises(RuntimeError, match="killed"):
+        Processor(Config(contract(tmp_path))).execute_batches(CsvSource(users_csv), crashing(CsvSink)(tmp_path / "out.csv", after=1), batch_size=100)
+    changed = contract(tmp_path)
+    changed["columns"]["name"]["trim"] = False
+    with pytest.raises(ConfigError, match="different contract"):
+        Processor(Config(changed), resume=True).execute_batches(CsvSource(users_csv), CsvSink(tmp_path / "out.csv"), batch_size=100)
+
+def test_checkpoint_needs_a_resumable_sink(tmp_path):
+    df = pl.DataFrame({"id": [1], "name": ["a"], "amount": [1.0]})
+    with pytest.raises(ConfigError, match="MemorySink"):
+        Processor(Config(contract(tmp_path))).execute_batches(MemorySource(df), MemorySink(), batch_size=100)
+    with pytest.raises(ConfigError, match="Only batched runs"):
+        Processor(Config(contract(tmp_path)), resume=True).execute(MemorySource(df), CsvSink(tmp_path / "out.csv"))
@@ -0,0 +1,109 @@
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors.memory import MemorySource, MemorySink
+from detl.exceptions import ConfigError
+
+@pytest.fixture
+def events():
+    n = 10_000
+    return pl.DataFrame({
+        "user": [i % 700 for i in range(n)],
+        "clicks": [str(i % 300) for i in range(n)],
+        "ratio": [(i % 4) * 0.25 for i in range(n)],
+        "kind": (["view", "click", "buy", "bogus"] * (n // 4)),
+        "country": [["DE", "FR", "US"][i % 3] for i in range(n)],
+    })
+
+def test_declared_compact_dtypes(events):
+    contract = {"columns": {
+        "user": {"dtype": "int16"},
+        # 300 does not fit a uint8; such values become null and go through on_null like unparseable ones
+        "clicks": {"dtype": "uint8", "on_null": {"tactic": "fill_value", "value": 255}},
+        "ratio": {"dtype": "float32"},
+        "kind": {"dtype": "enum", "constraints": {
+            "allowed_values": {"values": ["view", "click", "buy"], "violate_action": {"tactic": "fill_value", "value": "other"}},
+        }},
+        "country": {"dtype": "category", "constraints": {"max_length": {"length": 2, "violate_action": {"tactic": "drop_row"}}}},
+    }}
+    out = Processor(Config(contract)).execute(MemorySource(events)).lazy().collect()
+
+    assert out.schema == pl.Schema({
+        "user": pl.Int16, "clicks": pl.UInt8, "ratio": pl.Float32,
+        "kind": pl.Enum(["view", "click", "buy", "other"]), "country": pl.Categorical(),
+    })
+    assert out["clicks"].max() == 255
+    assert out["kind"].value_counts().filter(pl.col("kind") == "other")["count"][0] == 2_500
+    assert out.estimated_size() < events.estimated_size() / 2
+
+def test_enum_requires_allowed_values():
+    with pytest.raises(ConfigError, match="enum"):
+        Config({"columns": {"kind": {"dtype": "enum"}}})
+
+def test_auto_downcast_picks_the_smallest_safe_type(events):
+    contract = {
+        "conf": {"auto_downcast": True},
+        "columns": {
+            "user": {"dtype": "int"},
+            "clicks": {"dtype": "int"},
+            "ratio": {"dtype": "float"},
+            "kind": {"dtype": "string"},
+            "country": {"dtype": "string", "constraints": {
+                "allowed_values": {"values": ["DE", "FR", "US"], "violate_action": {"tactic": "fail"}},
+            }},
+        },
+    }
+    wide = events.with_columns(pl.col("ratio") + 1e-9, (pl.col("user") * 100).alias("user"))
+    out = Processor(Config(contract)).execute(MemorySource(wide)).lazy().collect()
+    assert out.schema == pl.Schema({
+        "user": pl.Int32, "clicks": pl.Int16, "ratio": pl.Float64,
+        "kind": pl.Categorical(), "country": pl.Enum(["DE", "FR", "US"]),
+    })
+    assert out["ratio"].equals(wide["ratio"])
+
+    # Values that survive the float32 round trip are stored as float32
+    exact = Processor(Config(contract)).execute(MemorySource(events)).lazy().collect()
+    assert exact.schema["ratio"] == pl.Float32 and exact.schema["user"] == pl.Int16
+
+def test_batched_downcast_uses_declared_ranges_only(events):
+    contract = {
+        "conf": {"auto_downcast": True},
+        "columns": {
+            "user": {"dtype": "int", "constraints": {
+                "min_policy": {"threshold": 0, "violate_action": {"tactic": "fail"}},
+                "max_policy": {"threshold": 1_000, "violate_action": {"tactic": "fail"}},
+            }},
+            "clicks": {"dtype": "int"},
+        },
+    }
+    sink = MemorySink()
+    Processor(Config(contract)).execute_batches(MemorySource(events), sink, batch_size=1_000)
+    # Observed ranges would differ per batch; only the declared one is used so every batch shares a schema
+    assert sink.result.lazy().collect().schema == pl.Schema({"user": pl.Int16, "clicks": pl.Int64})
+
+def test_pipeline_sees_logical_types_under_auto_downcast():
+    contract = {
+        "conf": {"auto_downcast": True},
+        "columns": {"qty": {"dtype": "int"}, "a": {"dtype": "string"}},
+        "pipeline": [{"mutate": {"total": "qty * 1000", "u": "UPPER(a)"}}],
+    }
+    df = pl.DataFrame({"qty": [100, 120, 5, 5], "a": ["x", "x", "y", "y"]})
+    out = Processor(Config(contract)).execute(MemorySource(df)).lazy().collect()
+
+    assert out["total"].to_list() == [100_000, 120_000, 5_000, 5_000]
+    assert out["u"].to_list() == ["X", "X", "Y", "Y"]
+    assert out.schema["qty"] == pl.Int8 and out.schema["a"] == pl.Categorical()
+
+def test_seen_keys_compare_logical_types_under_auto_downcast(tmp_path):
+    contract = {
+        "conf": {"auto_downcast": True, "seen_keys": {"store": str(tmp_path / "keys"), "subset": ["id"]}},
+        "columns": {"id": {"dtype": "int"}, "renamed": {"dtype": "int", "rename": "n"}},
+    }
+    big = pl.DataFrame({"id": [1000, 2000], "renamed": [1, 2]})
+    Processor(Config(contract)).execute(MemorySource(big), MemorySink())
+
+    out = Processor(Config(contract)).execute(MemorySource(pl.DataFrame({"id": [1, 2, 1000], "renamed": [3, 4, 5]}))).lazy().collect()
+    assert out["id"].to_list() == [1, 2]
+    assert out.schema == pl.Schema({"id": pl.Int8, "n": pl.Int8})
@@ -0,0 +1,35 @@
+import polars as pl
+
+from detl.connectors import SQLiteSink, SQLiteSource
+from detl.connectors.database.pool import POOL, ConnectionPool
+
+def test_batches_and_runs_reuse_pooled_connections(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'warehouse.db'}"
+    for run in range(3):
+        sink = SQLiteSink(uri, "events", if_table_exists="replace")
+        sink.begin_batches()
+        for i in range(10):
+            sink.write_batch(pl.DataFrame({"run": [run], "batch": [i]}))
+        sink.commit_batches()
+    source = SQLiteSource(uri, "SELECT * FROM events")
+    assert sum(batch.height for batch in source.iter_batches(4)) == 10
+    source.estimate_size()
+
+    m = POOL.metrics()[uri]
+    # One ADBC connection for the 30 writes, one SQLAlchemy connection for the reads
+    assert m.connects == 2
+    assert m.checkouts == 30 + 1 + 2
+
+def test_broken_connections_are_replaced(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'warehouse.db'}"
+    pool = ConnectionPool(size=1, max_overflow=0)
+    with pool.adbc(uri) as connection:
+        # Simulates the server dropping the connection while it sits in the pool
+        connection.close()
+    with pool.adbc(uri) as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 42")
+            assert cursor.fetchone() == (42,)
+    m = pool.metrics()[uri]
+    assert m.connects == 2
+    assert m.invalidated >= 1
@@ -0,0 +1,64 @@
+import sqlite3
+
+import pytest
+import polars as pl
+
+from detl.connectors import SQLiteSink
+from detl.exceptions import ConnectionConfigurationError
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "warehouse.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, score INTEGER)")
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?)", [(1, "ann", 10), (2, "bob", 20), (3, "cid", 30)])
+    return path
+
+def _rows(path, sql="SELECT * FROM users ORDER BY id") -> list:
+    with sqlite3.connect(path) as conn:
+        return conn.execute(sql).fetchall()
+
+def _tables(path) -> list:
+    return [name for (name,) in _rows(path, "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")]
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_merge_upserts_on_key_columns(db, bulk):
+    changes = pl.DataFrame({"id": [2, 4], "name": ["bob", "dee"], "score": [25, 40]})
+    sink = SQLiteSink(f"sqlite:///{db}", "users", if_table_exists="merge", key_columns=["id"], bulk=bulk)
+    sink.write(changes.lazy())
+    assert _rows(db) == [(1, "ann", 10), (2, "bob", 25), (3, "cid", 30), (4, "dee", 40)]
+    assert _tables(db) == ["users"]
+
+def test_merge_creates_a_missing_target_with_a_unique_key(tmp_path):
+    db = tmp_path / "new.db"
+    sink = SQLiteSink(f"sqlite:///{db}", "users", if_table_exists="merge", key_columns=["id"], batch_size=1)
+    for run in (["a", "b"], ["c", "d"]):
+        sink.begin_batches()
+        for i, name in enumerate(run):
+            sink.write_batch(pl.DataFrame({"id": [i], "name": [name]}))
+        sink.commit_batches()
+    assert _rows(db) == [(0, "c"), (1, "d")]
+
+def test_merge_requires_key_columns(db):
+    with pytest.raises(ConnectionConfigurationError, match="key_columns"):
+        SQLiteSink(f"sqlite:///{db}", "users", if_table_exists="merge")
+    sink = SQLiteSink(f"sqlite:///{db}", "users", if_table_exists="merge", key_columns=["user_id"])
+    with pytest.raises(ConnectionConfigurationError, match="user_id"):
+        sink.write(pl.DataFrame({"id": [1]}))
+
+def test_swap_replaces_the_target_only_once_loaded(db):
+    uri = f"sqlite:///{db}"
+    sink = SQLiteSink(uri, "users", if_table_exists="swap")
+    sink.begin_batches()
+    sink.write_batch(pl.DataFrame({"id": [7], "name": ["eve"], "score": [70]}))
+    # Readers still see the old table while the shadow loads
+    assert len(_rows(db)) == 3
+    sink.commit_batches()
+    assert _rows(db) == [(7, "eve", 70)]
+    assert _tables(db) == ["users"]
+
+    sink.begin_batches()
+    sink.write_batch(pl.DataFrame({"id": [8], "name": ["fay"], "score": [80]}))
+    sink.abort_batches()
+    assert _rows(db) == [(7, "eve", 70)]
+    assert _tables(db) == ["users"]
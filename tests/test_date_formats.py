@@ -0,0 +1,46 @@
+import pytest
+import polars as pl
+from datetime import datetime
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors.memory import MemorySource
+from detl.exceptions import NullViolationError
+
+def _run(df, column: dict) -> pl.DataFrame:
+    return Processor(Config({"columns": {"d": column}})).execute(MemorySource(df)).lazy().collect()
+
+def test_formats_are_tried_in_order():
+    df = pl.DataFrame({"d": ["2024-03-01", "02/03/2024", "2024-13-01", None, "03/04/2024"]})
+    column = {"dtype": "date", "format": {"input": ["%Y-%m-%d", "%d/%m/%Y"], "output": "%Y-%m-%d"}}
+    out = _run(df, {**column, "on_null": {"tactic": "drop_row"}})
+    # Only the value neither format parses is lost
+    assert out["d"].to_list() == ["2024-03-01", "2024-03-02", "2024-04-03"]
+
+    # The first format that parses a value wins, even if a later one would too
+    ambiguous = pl.DataFrame({"d": ["01/02/2024"]})
+    first = _run(ambiguous, {"dtype": "date", "format": {"input": ["%m/%d/%Y", "%d/%m/%Y"], "output": "%Y-%m-%d"}})
+    assert first["d"].to_list() == ["2024-01-02"]
+
+def test_fail_raises_only_for_values_no_format_parses():
+    column = {"dtype": "date", "format": {"input": ["%Y-%m-%d", "%d/%m/%Y"], "output": "%Y-%m-%d", "on_parse_error": {"tactic": "fail"}}}
+    assert _run(pl.DataFrame({"d": ["2024-03-01", "02/03/2024", None]}), column)["d"].null_count() == 1
+    # Same error as a single strict format, listing only the values no format parsed
+    with pytest.raises(pl.exceptions.InvalidOperationError, match="1 out of 2 values"):
+        _run(pl.DataFrame({"d": ["2024-03-01", "2024.13.01"]}), column)
+
+def test_temporal_columns_skip_parsing():
+    df = pl.DataFrame({"d": [datetime(2024, 3, 1, 12, 30), None]})
+    out = _run(df, {"dtype": "datetime", "format": {"input": "%d/%m/%Y %H:%M", "output": "%Y-%m-%d %H:%M"}})
+    # Parsing the text of a datetime with the input format would have nulled it
+    assert out["d"].to_list() == ["2024-03-01 12:30", None]
+    as_date = _run(df, {"dtype": "date", "format": {"input": "%d/%m/%Y", "output": "%Y-%m-%d"}})
+    assert as_date["d"].to_list() == ["2024-03-01", None]
+
+def test_fill_value_accepts_any_input_format():
+    df = pl.DataFrame({"d": ["2024-03-01", None]})
+    column = {"dtype": "date", "format": {"input": ["%Y-%m-%d", "%d/%m/%Y"], "output": "%Y-%m-%d"}}
+    out = _run(df, {**column, "on_null": {"tactic": "fill_value", "value": "31/12/1999"}})
+    assert out["d"].to_list() == ["2024-03-01", "1999-12-31"]
+    with pytest.raises(NullViolationError, match="'%Y-%m-%d', '%d/%m/%Y'"):
+        _run(df, {**column, "on_null": {"tactic": "fill_value", "value": "1999.12.31"}})
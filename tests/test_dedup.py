@@ -0,0 +1,84 @@
+import random
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors.memory import MemorySource, MemorySink
+from detl.dedup import BloomKeyIndex, ExactKeyIndex
+from detl.exceptions import DuplicateRowError
+
+@pytest.fixture
+def orders():
+    # Every id appears three times, in batches far apart
+    return pl.DataFrame({"id": list(range(300)) * 3, "seq": list(range(900))})
+
+def run_batched(contract, df, batch_size=50):
+    sink = MemorySink()
+    Processor(Config(contract)).execute_batches(MemorySource(df), sink, batch_size=batch_size)
+    return sink.result.lazy().collect()
+
+def test_duplicate_rows_are_dropped_across_batches(orders):
+    contract = {
+        "conf": {"on_duplicate_rows": {"tactic": "drop_extras", "subset": ["id"]}},
+        "columns": {"id": {"dtype": "int"}, "seq": {"dtype": "int"}},
+    }
+    out = run_batched(contract, orders)
+    assert out.height == 300
+    # The first occurrence is the one kept
+    assert out["seq"].to_list() == list(range(300))
+
+def test_unique_constraint_holds_across_batches(orders):
+    contract = {"columns": {
+        "id": {"dtype": "int", "constraints": {"unique": {"tactic": "drop_extras"}}},
+        "seq": {"dtype": "int"},
+    }}
+    assert run_batched(contract, orders)["id"].n_unique() == 300 == run_batched(contract, orders).height
+
+    contract["columns"]["id"]["constraints"]["unique"]["tactic"] = "fail"
+    with pytest.raises(DuplicateRowError, match="'id'"):
+        run_batched(contract, orders)
+    # Batches that are each duplicate-free on their own still fail once a key repeats across them
+    run_batched(contract, orders.head(300))
+
+def test_exact_index_spills_to_disk_and_stays_exact(tmp_path):
+    index = ExactKeyIndex(max_memory_keys=500, spill_dir=tmp_path, max_segments=2)
+    rng = random.Random(3)
+    seen = set()
+    for _ in range(30):
+        keys = [rng.randrange(5_000) for _ in range(200)]
+        new = index.observe(pl.DataFrame({"k": keys})).to_list()
+        expected = []
+        for k in keys:
+            expected.append(k not in seen)
+            seen.add(k)
+        assert new == expected
+    assert len(index) == len(seen)
+    assert list(tmp_path.iterdir())
+    index.close()
+    assert not list(tmp_path.iterdir())
+
+@pytest.mark.parametrize("max_memory_keys", [1_000, 10])
+def test_exact_index_tells_apart_keys_sharing_a_hash(tmp_path, monkeypatch, max_memory_keys):
+    # Three hash values for a hundred keys: nearly every lookup meets a collision
+    monkeypatch.setattr("detl.dedup.key_hashes", lambda keys: keys.select((pl.col("k") % 3).cast(pl.UInt64)).to_series())
+    index = ExactKeyIndex(max_memory_keys=max_memory_keys, spill_dir=tmp_path)
+    assert index.observe(pl.DataFrame({"k": list(range(0, 100, 2))})).all()
+    new = index.observe(pl.DataFrame({"k": list(range(100))}))
+    assert new.to_list() == [k % 2 == 1 for k in range(100)]
+    assert len(index) == 100
+    index.close()
+
+def test_bloom_index_never_misses_a_duplicate():
+    contract = {
+        "conf": {"key_index": {"mode": "bloom", "capacity": 10_000, "error_rate": 0.01}},
+        "columns": {"id": {"dtype": "int", "constraints": {"unique": {"tactic": "drop_extras"}}}},
+    }
+    df = pl.DataFrame({"id": list(range(5_000)) * 2})
+    out = run_batched(contract, df, batch_size=1_000)
+    assert out["id"].n_unique() == out.height
+    # Roughly error_rate of the unique keys may be mistaken for duplicates
+    assert out.height > 5_000 * 0.97
+
+    index = BloomKeyIndex(capacity=1_000_000, error_rate=0.001)
+    assert index.hash_count == 10 and index.size // 8 < 1_900_000
@@ -0,0 +1,66 @@
+import pytest
+import polars as pl
+
+import detl.engine.checks as checks
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors.memory import MemorySource, MemorySink
+from detl.exceptions import ConstraintViolationError, DuplicateRowError, NullViolationError
+
+def test_null_fail_reports_first_offending_row():
+    df = pl.DataFrame({"id": list(range(10)), "name": ["a", "b", "c", None, "e", None, "g", "h", "i", "j"]})
+    contract = {"columns": {"id": {"dtype": "int"}, "name": {"dtype": "string", "on_null": {"tactic": "fail"}}}}
+    with pytest.raises(NullViolationError, match="First offending row: 3") as e:
+        Processor(Config(contract)).execute(MemorySource(df))
+    assert e.value.row_offset == 3
+    assert e.value.sample["id"].to_list() == [3, 5]
+    assert e.value.sample.columns == ["id", "name"]
+
+def test_constraint_fail_stops_at_first_violating_batch(monkeypatch):
+    consumed = []
+    original = checks.iter_frame_batches
+
+    def counting(df, batch_size):
+        for batch in original(df, batch_size):
+            consumed.append(batch.height)
+            yield batch
+
+    monkeypatch.setattr(checks, "iter_frame_batches", counting)
+    monkeypatch.setattr(checks, "CHECK_BATCH_ROWS", 1_000)
+    df = pl.LazyFrame({"v": list(range(100_000))})
+    contract = {"columns": {"v": {"dtype": "int", "constraints": {
+        "max_policy": {"threshold": 1_500, "violate_action": {"tactic": "fail"}},
+    }}}}
+    with pytest.raises(ConstraintViolationError, match="First offending row: 1501") as e:
+        Processor(Config(contract)).execute(MemorySource(df))
+    assert e.value.sample["v"].to_list() == [1_501, 1_502, 1_503, 1_504, 1_505]
+    # Only the batches up to the first violation were checked
+    assert 0 < sum(consumed) <= 2_000
+
+def test_duplicate_fail_reports_first_repeat():
+    df = pl.DataFrame({"id": [1, 2, 3, 2, 1], "seq": [0, 1, 2, 3, 4]})
+    contract = {
+        "conf": {"on_duplicate_rows": {"tactic": "fail", "subset": ["id"]}},
+        "columns": {"id": {"dtype": "int"}, "seq": {"dtype": "int"}},
+    }
+    with pytest.raises(DuplicateRowError, match="First offending row: 3") as e:
+        Processor(Config(contract)).execute(MemorySource(df))
+    assert e.value.sample["seq"].to_list() == [3, 4]
+
+    contract = {"columns": {"id": {"dtype": "int", "constraints": {"unique": {"tactic": "fail"}}}, "seq": {"dtype": "int"}}}
+    with pytest.raises(DuplicateRowError, match="'id'.*First offending row: 3"):
+        Processor(Config(contract)).execute(MemorySource(df))
+
+def test_batched_offsets_count_from_start_of_stream():
+    df = pl.DataFrame({"id": list(range(100)) + [7], "v": [1] * 95 + [None] + [1] * 5})
+    contract = {"columns": {"id": {"dtype": "int", "constraints": {"unique": {"tactic": "fail"}}},
+                            "v": {"dtype": "int", "on_null": {"tactic": "fail"}}}}
+    with pytest.raises(NullViolationError) as e:
+        Processor(Config(contract)).execute_batches(MemorySource(df), MemorySink(), batch_size=10)
+    assert e.value.row_offset == 95
+
+    contract["columns"]["v"]["on_null"]["tactic"] = "fill_value"
+    contract["columns"]["v"]["on_null"]["value"] = 0
+    with pytest.raises(DuplicateRowError) as e:
+        Processor(Config(contract)).execute_batches(MemorySource(df), MemorySink(), batch_size=10)
+    assert e.value.row_offset == 100
@@ -0,0 +1,50 @@
+from datetime import date
+
+import pytest
+import polars as pl
+
+from detl.connectors import ExcelSink, ExcelSource
+from detl.exceptions import ConnectionConfigurationError
+
+@pytest.fixture
+def orders():
+    return pl.DataFrame({"id": list(range(5)), "amount": [1.5, None, 3.0, 4.5, 6.0], "day": [date(2024, 1, i + 1) for i in range(5)]})
+
+def test_sink_splits_sheets_at_the_row_limit(tmp_path, orders):
+    path = tmp_path / "orders.xlsx"
+    ExcelSink(path, sheet_name="orders", max_rows_per_sheet=2).write(orders.lazy())
+
+    source = ExcelSource(path, sheets="all", sheet_column="sheet")
+    assert source.sheet_names() == ["orders", "orders_2", "orders_3"]
+    out = source.read()
+    assert out.drop("sheet").equals(orders)
+    assert out["sheet"].to_list() == ["orders", "orders", "orders_2", "orders_2", "orders_3"]
+
+def test_source_reads_selected_sheets_separately_or_unioned(tmp_path, orders):
+    path = tmp_path / "book.xlsx"
+    ExcelSink(path, max_rows_per_sheet=3).write(orders)
+
+    sheets = ExcelSource(path, sheets=["Sheet1_2", "Sheet1"]).read_sheets()
+    assert list(sheets) == ["Sheet1_2", "Sheet1"]
+    assert sheets["Sheet1_2"]["id"].to_list() == [3, 4]
+    assert ExcelSource(path, sheets=["Sheet1_2", "Sheet1"]).read()["id"].to_list() == [3, 4, 0, 1, 2]
+    assert ExcelSource(path).read()["id"].to_list() == [0, 1, 2]
+    with pytest.raises(ConnectionConfigurationError, match="either 'sheet_name' or 'sheets'"):
+        ExcelSource(path, sheet_name="Sheet1", sheets="all")
+
+def test_failed_write_keeps_the_previous_workbook(tmp_path, orders):
+    path = tmp_path / "orders.xlsx"
+    ExcelSink(path).write(orders.head(0))
+    assert pl.read_excel(path).columns == ["id", "amount", "day"]
+
+    ExcelSink(path).write(orders)
+    with pytest.raises(ConnectionConfigurationError, match="Failed to write Excel batch"):
+        ExcelSink(path).write(pl.DataFrame({"nested": [[1, 2]]}))
+    assert ExcelSource(path).read()["id"].to_list() == [0, 1, 2, 3, 4]
+    assert list(tmp_path.iterdir()) == [path]
+
+def test_strings_are_written_as_text_not_formulas(tmp_path):
+    path = tmp_path / "cells.xlsx"
+    df = pl.DataFrame({"=cmd": ["=1+1", "=HYPERLINK(\"http://x\")", "http://example.com", "plain"]})
+    ExcelSink(path).write(df)
+    assert ExcelSource(path).read().equals(df)
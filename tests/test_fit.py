@@ -0,0 +1,71 @@
+import json
+from datetime import date
+
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors.memory import MemorySource, MemorySink
+from detl.fit import StatisticsArtifact
+from detl.exceptions import ConfigError
+
+CONTRACT = {"columns": {
+    "price": {"dtype": "float", "on_null": {"tactic": "fill_mean"},
+              "constraints": {"max_policy": {"threshold": 900, "violate_action": {"tactic": "fill_median"}}}},
+    "shipped": {"dtype": "date", "on_null": {"tactic": "fill_max"}},
+    "note": {"dtype": "string", "on_null": {"tactic": "fill_most_frequent"}},
+}}
+
+@pytest.fixture
+def history():
+    return pl.DataFrame({
+        "price": [float(i) for i in range(1, 1001)],
+        "shipped": [date(2024, 1, 1 + i % 28) for i in range(1000)],
+        "note": [None] * 1000,
+    })
+
+@pytest.fixture
+def hour():
+    return pl.DataFrame({
+        "price": [None, 5.0, 2000.0],
+        "shipped": [None, date(2023, 6, 1), date(2023, 6, 2)],
+        "note": [None, "x", "x"],
+    })
+
+def test_fit_once_apply_many(tmp_path, history, hour):
+    path = tmp_path / "stats.json"
+    artifact = Processor(Config(CONTRACT)).fit(MemorySource(history), path, batch_size=128)
+    assert [(s["statistic"], s["value"]) for s in artifact.values()] == [
+        ("mean", 500.5), ("max", date(2024, 1, 28)), ("mode", None), ("median", 500.5),
+    ]
+
+    saved = json.loads(path.read_text())
+    assert saved["format"] == 1 and len(saved["contract"]) == 64
+
+    fitted = StatisticsArtifact.load(path)
+    out = Processor(Config(CONTRACT), fitted=fitted).execute(MemorySource(hour)).lazy().collect()
+    assert out["price"].to_list() == [500.5, 5.0, 500.5]
+    assert out["shipped"][0] == date(2024, 1, 28)
+    assert out["note"].to_list() == [None, "x", "x"]
+
+    sink = MemorySink()
+    processor = Processor(Config(CONTRACT), fitted=fitted)
+    processor.execute_batches(MemorySource(hour), sink, batch_size=1)
+    assert sink.result.lazy().collect().equals(out)
+
+def test_artifact_is_tied_to_its_contract(tmp_path, history):
+    path = tmp_path / "stats.json"
+    Processor(Config(CONTRACT)).fit(MemorySource(history), path)
+
+    changed = {"columns": {**CONTRACT["columns"], "price": {"dtype": "float", "on_null": {"tactic": "fill_median"}}}}
+    with pytest.raises(ConfigError, match="different contract"):
+        Processor(Config(changed), fitted=StatisticsArtifact.load(path)).execute(MemorySource(history))
+
+    data = json.loads(path.read_text())
+    data["format"] = 99
+    path.write_text(json.dumps(data))
+    with pytest.raises(ConfigError, match="format 99"):
+        StatisticsArtifact.load(path)
+    with pytest.raises(ConfigError, match="Cannot read"):
+        StatisticsArtifact.load(tmp_path / "missing.json")
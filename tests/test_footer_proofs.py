@@ -0,0 +1,79 @@
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors import ParquetSource
+from detl.connectors.base import RowGroup
+from detl.connectors.memory import MemorySink
+from detl.exceptions import ConstraintViolationError
+
+CONTRACT = {"columns": {
+    "qty": {"dtype": "int", "on_null": {"tactic": "fail"}, "constraints": {
+        "min_policy": {"threshold": 0, "violate_action": {"tactic": "fail"}},
+        "max_policy": {"threshold": 1_000, "violate_action": {"tactic": "fail"}},
+    }},
+    "price": {"dtype": "float", "constraints": {
+        "min_policy": {"threshold": 0, "violate_action": {"tactic": "fail"}},
+        "max_policy": {"threshold": 10_000, "violate_action": {"tactic": "fail"}},
+    }},
+}}
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Row groups read because their statistics could not settle a rule."""
+    read = []
+    original = RowGroup.read
+
+    def counting(self, columns):
+        read.append((self.index, tuple(columns)))
+        return original(self, columns)
+
+    monkeypatch.setattr(RowGroup, "read", counting)
+    return read
+
+def write(tmp_path, df, **kwargs):
+    path = tmp_path / "orders.parquet"
+    df.write_parquet(path, row_group_size=100, **kwargs)
+    return ParquetSource(path)
+
+def test_clean_file_is_validated_from_footer_alone(tmp_path, reads):
+    df = pl.DataFrame({"qty": list(range(1_000)), "price": [float(i) for i in range(1_000)]})
+    processor = Processor(Config(CONTRACT))
+    out = processor.execute(write(tmp_path, df)).lazy().collect()
+
+    assert out.equals(df)
+    assert processor.proven == {
+        "columns.qty.on_null", "columns.qty.min_policy", "columns.qty.max_policy",
+        "columns.price.min_policy", "columns.price.max_policy",
+    }
+    # Float max_policy is proven by reading its column (NaN is absent from Parquet statistics); nothing else is read
+    assert reads == [(i, ("price",)) for i in range(10)]
+
+def test_violations_still_fail(tmp_path):
+    df = pl.DataFrame({"qty": list(range(999)) + [5_000], "price": [1.0] * 999 + [float("nan")]})
+    processor = Processor(Config(CONTRACT))
+    with pytest.raises(ConstraintViolationError, match="First offending row: 999"):
+        processor.execute(write(tmp_path, df))
+    assert "columns.qty.max_policy" not in processor.proven
+
+    nan_only = df.with_columns(pl.col("qty").clip(upper_bound=1_000))
+    with pytest.raises(ConstraintViolationError, match="price"):
+        Processor(Config(CONTRACT)).execute(write(tmp_path, nan_only))
+
+def test_groups_without_statistics_are_read(tmp_path, reads):
+    df = pl.DataFrame({"qty": list(range(300)), "price": [1.0] * 300})
+    processor = Processor(Config(CONTRACT))
+    processor.execute_batches(write(tmp_path, df, statistics=False), MemorySink(), batch_size=50)
+    assert "columns.qty.max_policy" in processor.proven
+    assert (0, ("qty",)) in reads
+
+def test_null_fills_block_bound_proofs(tmp_path, reads):
+    contract = {"columns": {"qty": {"dtype": "int", "on_null": {"tactic": "fill_value", "value": -1}, "constraints": {
+        "min_policy": {"threshold": 0, "violate_action": {"tactic": "fail"}},
+    }}}}
+    df = pl.DataFrame({"qty": [1, None, 3]})
+    processor = Processor(Config(contract))
+    with pytest.raises(ConstraintViolationError):
+        processor.execute(write(tmp_path, df))
+    assert processor.proven == frozenset()
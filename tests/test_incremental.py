@@ -0,0 +1,102 @@
+import json
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors import CsvSource, ParquetSink, SQLiteSource, SQLiteSink
+from detl.connectors.base import Sink
+from detl.connectors.memory import MemorySink
+from detl.exceptions import ConfigError, ConnectionConfigurationError
+
+def _contract(state, **incremental):
+    return Config({
+        "columns": {
+            "id": {"dtype": "int"},
+            "updated_at": {"dtype": "string"},
+        },
+        "incremental": {"state": str(state), **incremental},
+    })
+
+class ExplodingSink(Sink):
+    def write(self, df):
+        raise ConnectionConfigurationError("target is down")
+
+def test_watermark_reads_only_new_rows(tmp_path):
+    src = tmp_path / "events.csv"
+    state = tmp_path / "state.json"
+    config = _contract(state, column="updated_at")
+
+    pl.DataFrame({"id": [1, 2], "updated_at": ["2024-01-01", "2024-01-02"]}).write_csv(src)
+    first = MemorySink()
+    Processor(config).execute(CsvSource(src), first)
+    assert first.result.collect().get_column("id").to_list() == [1, 2]
+
+    pl.DataFrame({"id": [1, 2, 3], "updated_at": ["2024-01-01", "2024-01-02", "2024-01-03"]}).write_csv(src)
+    second = MemorySink()
+    Processor(config).execute(CsvSource(src), second)
+    assert second.result.collect().get_column("id").to_list() == [3]
+
+    stored = json.loads(state.read_text())
+    assert list(stored.values())[0]["watermark"] == {"type": "string", "value": "2024-01-03"}
+
+def test_nothing_new_skips_the_sink(tmp_path):
+    src = tmp_path / "events.csv"
+    config = _contract(tmp_path / "state.json", column="updated_at")
+    pl.DataFrame({"id": [1], "updated_at": ["2024-01-01"]}).write_csv(src)
+
+    Processor(config).execute(CsvSource(src), MemorySink())
+    sink = MemorySink()
+    assert Processor(config).execute(CsvSource(src), sink) is None
+    assert sink.result is None
+
+def test_state_only_advances_after_sink_commit(tmp_path):
+    src = tmp_path / "events.csv"
+    state = tmp_path / "state.json"
+    config = _contract(state, column="updated_at")
+    pl.DataFrame({"id": [1], "updated_at": ["2024-01-01"]}).write_csv(src)
+
+    with pytest.raises(ConnectionConfigurationError):
+        Processor(config).execute(CsvSource(src), ExplodingSink())
+    assert not state.exists()
+
+    # The retry sees the same rows again because nothing was committed
+    sink = MemorySink()
+    Processor(config).execute(CsvSource(src), sink)
+    assert sink.result.collect().height == 1
+
+def test_files_mode_with_sqlite_state(tmp_path):
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    config = _contract(tmp_path / "state.sqlite", mode="files")
+    pl.DataFrame({"id": [1], "updated_at": ["a"]}).write_csv(landing / "part-1.csv")
+
+    out = tmp_path / "out.parquet"
+    Processor(config).execute(CsvSource(landing), ParquetSink(out))
+    assert pl.read_parquet(out).get_column("id").to_list() == [1]
+
+    pl.DataFrame({"id": [2], "updated_at": ["b"]}).write_csv(landing / "part-2.csv")
+    Processor(config).execute(CsvSource(landing / "*.csv"), ParquetSink(out))
+    # Glob and directory spellings resolve to the same files but are distinct state keys
+    assert pl.read_parquet(out).get_column("id").to_list() == [1, 2]
+
+    Processor(config).execute(CsvSource(landing), ParquetSink(out))
+    assert pl.read_parquet(out).get_column("id").to_list() == [2]
+
+def test_database_watermark_is_pushed_into_sql(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'src.db'}"
+    SQLiteSink(uri, "events").write(pl.DataFrame({"id": [1, 2], "updated_at": ["2024-01-01", "2024-01-02"]}))
+    config = _contract(tmp_path / "state.json", column="updated_at")
+
+    Processor(config).execute(SQLiteSource(uri, "SELECT * FROM events"), MemorySink())
+    SQLiteSink(uri, "events", if_table_exists="append").write(pl.DataFrame({"id": [3], "updated_at": ["2024-01-03"]}))
+
+    sink = MemorySink()
+    Processor(config).execute(SQLiteSource(uri, "SELECT * FROM events"), sink)
+    assert sink.result.get_column("id").to_list() == [3]
+
+def test_incremental_config_validation(tmp_path):
+    with pytest.raises(ConfigError, match="requires a 'column'"):
+        Config({"incremental": {"mode": "watermark"}})
+    with pytest.raises(ConfigError, match="forbidden"):
+        Config({"incremental": {"mode": "files", "column": "updated_at"}})
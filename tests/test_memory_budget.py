@@ -0,0 +1,80 @@
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.budget import parse_memory
+from detl.connectors import CsvSink, CsvSource, ParquetSink, ParquetSource, SQLiteSink, SQLiteSource
+from detl.connectors.memory import MemorySource, MemorySink
+from detl.exceptions import ConfigError, MemoryBudgetError
+
+CONTRACT = {"columns": {"id": {"dtype": "int"}, "name": {"dtype": "string", "trim": True}}}
+
+@pytest.fixture
+def users():
+    return pl.DataFrame({"id": list(range(20_000)), "name": [f"  user{i}  " for i in range(20_000)]})
+
+class UnreadableSource(MemorySource):
+    """Reports its size but fails if actually read, to prove a run is refused up front."""
+    def read(self):
+        raise AssertionError("the source must not be read")
+
+def test_parse_memory():
+    assert parse_memory(1024) == 1024
+    assert parse_memory("512MB") == 512 * 2**20
+    assert parse_memory("1.5 GiB") == int(1.5 * 2**30)
+    with pytest.raises(ConfigError, match="max_memory"):
+        Processor(Config(CONTRACT), max_memory="lots")
+
+def test_small_input_runs_in_memory(tmp_path, users):
+    users.write_csv(tmp_path / "users.csv")
+    processor = Processor(Config(CONTRACT), max_memory="1GB")
+    processor.execute(CsvSource(tmp_path / "users.csv"), CsvSink(tmp_path / "out.csv"))
+
+    assert processor.plan.strategy == "in_memory"
+    assert processor.plan.estimated_bytes == (tmp_path / "users.csv").stat().st_size
+    assert pl.read_csv(tmp_path / "out.csv")["name"][0] == "user0"
+
+def test_large_scan_streams_to_a_streaming_sink(tmp_path, users):
+    users.write_parquet(tmp_path / "users.parquet")
+    source = ParquetSource(tmp_path / "users.parquet")
+    budget = source.estimate_size().bytes  # The decoded input fits, its transform working set does not
+
+    processor = Processor(Config(CONTRACT), max_memory=budget)
+    processor.execute(source, ParquetSink(tmp_path / "out.parquet"))
+    assert processor.plan.strategy == "streaming"
+    assert source.estimate_size().rows == 20_000
+    assert pl.read_parquet(tmp_path / "out.parquet").equals(users.with_columns(pl.col("name").str.strip_chars()))
+
+def test_falls_back_to_batches_sized_to_the_budget(tmp_path, users):
+    budget = users.estimated_size()
+    processor = Processor(Config(CONTRACT), max_memory=budget)
+    # Without streaming, the CSV sink still appends batch by batch
+    processor.execute(MemorySource(users), CsvSink(tmp_path / "out.csv", streaming=False))
+
+    plan = processor.plan
+    assert plan.strategy == "batched" and processor.metrics is not None
+    assert plan.batch_size * users.estimated_size() / users.height * 10 <= budget
+    assert processor.metrics.stages[0].batches == -(-20_000 // plan.batch_size)
+    assert pl.read_csv(tmp_path / "out.csv").height == 20_000
+
+def test_refuses_runs_that_cannot_fit_before_reading(users):
+    budget = users.estimated_size()
+    with pytest.raises(MemoryBudgetError, match="sink can neither") as e:
+        # MemorySink buffers every batch, so batching would not bound its memory
+        Processor(Config(CONTRACT), max_memory=budget).execute(UnreadableSource(users), MemorySink())
+    assert e.value.estimated_bytes == users.estimated_size() and e.value.budget == budget
+
+    with pytest.raises(MemoryBudgetError, match="without a sink"):
+        Processor(Config(CONTRACT), max_memory=budget).execute(UnreadableSource(users))
+
+    sorted_contract = {**CONTRACT, "pipeline": [{"sort": {"by": "id"}}]}
+    with pytest.raises(MemoryBudgetError, match="sort"):
+        Processor(Config(sorted_contract), max_memory=budget).execute(UnreadableSource(users), CsvSink("unused.csv"))
+
+def test_database_estimate_counts_rows(tmp_path, users):
+    uri = f"sqlite:///{tmp_path / 'src.db'}"
+    SQLiteSink(uri, "users").write(users)
+    estimate = SQLiteSource(uri, "SELECT * FROM users WHERE id < 5000;").estimate_size()
+    assert estimate.rows == 5_000
+    assert 0.5 < estimate.bytes / users.head(5_000).estimated_size() < 2
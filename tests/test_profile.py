@@ -0,0 +1,60 @@
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors.memory import MemorySource
+from detl.profile import DataProfile, DistinctSketch, profile_source
+
+def feed(n=2_000):
+    return pl.DataFrame({
+        "order_id": list(range(n)),
+        "sku": [f"SK-{i % 97:03d}" for i in range(n)],
+        "status": ["new", "paid", "shipped", None][:3] * (n // 3) + ["new"] * (n % 3),
+        "amount": [str(round(i * 0.25, 2)) for i in range(n)],
+        "placed": [f"{1 + i % 28:02d}/03/2024" for i in range(n)],
+        "note": [None if i % 5 else "x" for i in range(n)],
+    })
+
+def test_drafted_contract_accepts_the_profiled_data():
+    df = feed()
+    profile = profile_source(MemorySource(df), batch_size=300)
+    manifest = profile.manifest()
+    columns = manifest["columns"]
+
+    assert columns["order_id"]["dtype"] == "int"
+    assert columns["order_id"]["constraints"]["max_policy"]["threshold"] == 1_999
+    assert columns["amount"]["dtype"] == "float"
+    assert columns["placed"]["dtype"] == "date" and columns["placed"]["format"]["input"] == "%d/%m/%Y"
+    assert columns["status"]["constraints"]["allowed_values"]["values"] == ["new", "paid", "shipped"]
+    assert columns["sku"]["constraints"]["regex"]["pattern"] == r"^[A-Za-z]+\-[0-9]+$"
+    assert columns["order_id"]["on_null"] == {"tactic": "fail"}
+    assert "on_null" not in columns["note"]
+
+    out = Processor(Config(manifest)).execute(MemorySource(df)).lazy().collect()
+    assert out.height == df.height
+
+def test_profiles_merge_like_a_single_pass():
+    df = feed()
+    whole = profile_source(MemorySource(df), batch_size=500)
+    left, right = DataProfile(), DataProfile()
+    left.update(df.head(700))
+    right.update(df.tail(1_300))
+    left.merge(right)
+
+    assert left.manifest() == whole.manifest()
+    # Top values are approximate once a column has more distinct values than the sketch keeps
+    def drop_top(summary):
+        return [{k: v for k, v in s.items() if k != "top"} for s in summary]
+    assert drop_top(left.summary()) == drop_top(whole.summary())
+    assert left.summary()[2]["top"] == whole.summary()[2]["top"]
+
+def test_distinct_sketch_is_accurate_and_mergeable():
+    a, b = DistinctSketch(), DistinctSketch()
+    a.update(pl.Series(range(0, 300_000)))
+    b.update(pl.Series(range(200_000, 500_000)))
+    a.merge(b)
+    assert abs(a.estimate() - 500_000) / 500_000 < 0.05
+
+    small = DistinctSketch()
+    small.update(pl.Series(["a", "b", "c", "a", None]))
+    assert small.estimate() == 3
@@ -0,0 +1,56 @@
+import pytest
+import polars as pl
+from pydantic import ValidationError
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors.memory import MemorySource
+from detl.patterns import LiteralPattern, literal_form, pattern_mask
+from detl.schema.constraints import RegexPolicy
+
+VALUES = ["SKU-001", "sku-002", "ORD-7", "a.b", "axb", None, "promo_SKU"]
+
+def _run(regex: dict) -> list:
+    contract = {"columns": {"v": {"dtype": "string", "constraints": {
+        "regex": {**regex, "violate_action": {"tactic": "fill_value", "value": "bad"}},
+    }}}}
+    return Processor(Config(contract)).execute(MemorySource(pl.DataFrame({"v": VALUES}))).lazy().collect()["v"].to_list()
+
+def test_invalid_patterns_fail_at_config_load():
+    with pytest.raises(ValidationError, match="Invalid regex pattern '\\(a'"):
+        RegexPolicy(pattern=["^ok$", "(a"], violate_action={"tactic": "drop_row"})
+    # Polars' regex engine has no look-arounds, so they are refused before any data is read
+    with pytest.raises(ValidationError, match="look-around"):
+        RegexPolicy(pattern="(?<=a)b", violate_action={"tactic": "drop_row"})
+    with pytest.raises(ValidationError, match="at least one pattern"):
+        RegexPolicy(pattern=[], violate_action={"tactic": "drop_row"})
+
+def test_literal_forms():
+    assert literal_form("^SKU\\-") == LiteralPattern("SKU-", True, False)
+    assert literal_form("a\\.b$") == LiteralPattern("a.b", False, True)
+    assert literal_form("^exact$") == LiteralPattern("exact", True, True)
+    for regex in ("a.b", "^\\d+$", "\\bword", "(?i)sku", "a|b", "\\<x"):
+        assert literal_form(regex) is None
+    plan = str(pattern_mask(pl.col("v"), ["^SKU", "7$", "a\\.b", "^exact$"]))
+    # The escaped dot is searched for as plain text
+    assert 'str.contains(["a.b"])' in plan and "starts_with" in plan and "ends_with" in plan and '== ("exact")' in plan
+
+@pytest.mark.parametrize("regex", [
+    {"pattern": ["^SKU\\-", "^ORD"]},
+    {"pattern": ["^[A-Z]+\\-\\d+$", "^ORD"]},
+    {"pattern": "^(SKU|ORD)"},
+])
+def test_any_of_several_patterns(regex):
+    assert _run(regex) == ["SKU-001", "bad", "ORD-7", "bad", "bad", None, "bad"]
+
+def test_all_patterns_and_literal_kernels_match_the_regex_engine():
+    assert _run({"pattern": ["SKU", "\\d$"], "match": "all"}) == ["SKU-001", "bad", "bad", "bad", "bad", None, "bad"]
+    # An escaped dot is a literal dot: "axb" does not match it, as it would not with str.contains
+    assert _run({"pattern": "a\\.b"}) == ["bad", "bad", "bad", "a.b", "bad", None, "bad"]
+    assert _run({"pattern": ["_SKU$", "^a\\.b$"]}) == ["bad", "bad", "bad", "a.b", "bad", None, "promo_SKU"]
+
+    frame = pl.DataFrame({"v": VALUES})
+    for patterns in (["SKU", "-0"], ["^sku", "b$"], ["^ORD\\-7$", "x"]):
+        fast = frame.select(pattern_mask(pl.col("v"), patterns)).to_series()
+        engine = frame.select(pl.col("v").str.contains("|".join(patterns))).to_series()
+        assert fast.to_list() == engine.to_list()
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors.memory import MemorySource
+from detl.ordering import RuleProfile
+
+def _contract(profile=None, a_rules=None) -> dict:
+    conf = {"rule_order": {"profile": str(profile)}} if profile else {}
+    return {"conf": conf, "columns": {
+        "s": {"dtype": "string", "constraints": {
+            "regex": {"pattern": r"^[a-z]+\d+@(\w+\.)+\w+$", "violate_action": {"tactic": "drop_row"}},
+        }},
+        "a": a_rules or {"dtype": "int", "constraints": {
+            "min_policy": {"threshold": 45, "violate_action": {"tactic": "drop_row"}},
+        }},
+    }}
+
+@pytest.fixture
+def frame():
+    n = 20_000
+    return pl.DataFrame({"a": [i % 50 for i in range(n)], "s": [f"user{i}@mail.example.com" if i % 7 else "bad" for i in range(n)]})
+
+def test_profile_runs_selective_cheap_rules_first(tmp_path, frame):
+    profile = tmp_path / "rules.json"
+    expected = Processor(Config(_contract())).execute(MemorySource(frame)).lazy().collect()
+
+    out = Processor(Config(_contract(profile))).execute(MemorySource(frame.lazy()))
+    plan = out.explain(optimized=False)
+    # Plans print the last step first: the regex only sees the rows min_policy kept
+    assert plan.index("str.contains") < plan.index("45")
+    assert out.collect().equals(expected)
+
+    rules = json.loads(profile.read_text())["rules"]
+    by_rule = {stats["rule"]: stats for stats in rules.values()}
+    assert len(by_rule) == 2
+    min_stats = next(stats for rule, stats in by_rule.items() if "45" in rule)
+    assert min_stats["drop_rate"] == pytest.approx(0.9) and min_stats["rows"] == 20_000
+
+def test_profile_is_reused_across_runs(tmp_path, frame, monkeypatch):
+    profile = tmp_path / "rules.json"
+    Processor(Config(_contract(profile))).execute(MemorySource(frame)).lazy().collect()
+
+    def measure(*args):
+        raise AssertionError("known rules must not be measured again")
+    monkeypatch.setattr(RuleProfile, "measure", measure)
+    out = Processor(Config(_contract(profile))).execute(MemorySource(frame)).lazy().collect()
+    assert out.height == Processor(Config(_contract())).execute(MemorySource(frame)).lazy().collect().height
+
+def test_rules_on_rewritten_columns_keep_their_place(tmp_path):
+    df = pl.DataFrame({"a": [-5, 10, 60, -1], "s": ["u1@x.io", "u2@x.io", "u3@x.io", "bad"]})
+    # The drop sees a's values before the max_policy fill rewrites them, so it cannot move after it
+    a_rules = {"dtype": "int", "constraints": {
+        "min_policy": {"threshold": 0, "violate_action": {"tactic": "drop_row"}},
+        "max_policy": {"threshold": 50, "violate_action": {"tactic": "fill_value", "value": -100}},
+    }}
+    expected = Processor(Config(_contract(a_rules=a_rules))).execute(MemorySource(df)).lazy().collect()
+    out = Processor(Config(_contract(tmp_path / "rules.json", a_rules))).execute(MemorySource(df)).lazy().collect()
+    assert out.equals(expected)
+    assert out["a"].to_list() == [10, -100]
@@ -0,0 +1,79 @@
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors import CsvSource, ParquetSink
+from detl.connectors.memory import MemorySource, MemorySink
+from detl.exceptions import ConfigError
+from detl.seen import SeenKeyStore
+
+def contract(store, **seen):
+    return {
+        "conf": {"seen_keys": {"store": str(store), "subset": ["order_id"], **seen}},
+        "columns": {"order_id": {"dtype": "int"}, "amount": {"dtype": "float"}},
+    }
+
+def test_overlapping_resend_loads_only_new_rows(tmp_path):
+    store = tmp_path / "keys"
+    first = pl.DataFrame({"order_id": [1, 2, 3], "amount": [1.0, 2.0, 3.0]})
+    resend = pl.DataFrame({"order_id": [2, 3, 4, 5], "amount": [2.0, 3.0, 4.0, 5.0]})
+    first.write_csv(tmp_path / "first.csv")
+    resend.write_csv(tmp_path / "resend.csv")
+
+    Processor(Config(contract(store))).execute(CsvSource(tmp_path / "first.csv"), ParquetSink(tmp_path / "a.parquet"))
+    Processor(Config(contract(store))).execute(CsvSource(tmp_path / "resend.csv"), ParquetSink(tmp_path / "b.parquet"))
+
+    assert pl.read_parquet(tmp_path / "b.parquet")["order_id"].to_list() == [4, 5]
+    assert SeenKeyStore(store, ["order_id"]).count() == 5
+
+    # Batched runs share the same store
+    sink = MemorySink()
+    again = pl.DataFrame({"order_id": [5, 6, 1, 7], "amount": [0.0] * 4})
+    Processor(Config(contract(store))).execute_batches(MemorySource(again), sink, batch_size=2)
+    assert sorted(sink.result.lazy().collect()["order_id"].to_list()) == [6, 7]
+
+def test_keys_are_recorded_only_after_commit(tmp_path):
+    store = tmp_path / "keys"
+    df = pl.DataFrame({"order_id": [1, 2], "amount": [1.0, 2.0]})
+    processor = Processor(Config(contract(store)))
+    out = processor.execute(MemorySource(df))
+    assert out.lazy().collect().height == 2
+    assert SeenKeyStore(store, ["order_id"]).count() == 0
+
+    processor.commit_state()
+    assert SeenKeyStore(store, ["order_id"]).count() == 2
+    assert Processor(Config(contract(store))).execute(MemorySource(df)).lazy().collect().height == 0
+
+def test_store_compacts_as_it_grows(tmp_path):
+    store = tmp_path / "keys"
+    for i in range(5):
+        df = pl.DataFrame({"order_id": [i, i + 1], "amount": [0.0, 0.0]})
+        Processor(Config(contract(store, compact_after=3))).execute(MemorySource(df), MemorySink())
+
+    keys = SeenKeyStore(store, ["order_id"])
+    assert len(keys.segments()) <= 3
+    assert keys.scan().collect()["order_id"].sort().to_list() == [0, 1, 2, 3, 4, 5]
+
+def test_key_columns_are_required():
+    with pytest.raises(ConfigError, match="seen_keys requires key columns"):
+        Config({"conf": {"seen_keys": {"store": "keys"}}, "columns": {"a": {"dtype": "int"}}})
+
+def test_only_keys_of_written_rows_are_recorded(tmp_path):
+    store = tmp_path / "keys"
+    conf = contract(store)
+    conf["pipeline"] = [{"filter": "amount > 0"}]
+    df = pl.DataFrame({"order_id": [1, 2, 3], "amount": [1.0, -2.0, 3.0]})
+    df.write_csv(tmp_path / "orders.csv")
+
+    processor = Processor(Config(conf))
+    out = processor.execute(CsvSource(tmp_path / "orders.csv"))
+    # The source changes before the output is committed; the keys recorded are still those returned
+    pl.DataFrame({"order_id": [9], "amount": [9.0]}).write_csv(tmp_path / "orders.csv")
+    processor.commit_state()
+    assert out.lazy().collect()["order_id"].to_list() == [1, 3]
+    assert SeenKeyStore(store, ["order_id"]).scan().collect()["order_id"].sort().to_list() == [1, 3]
+
+    # The corrected row 2 is loaded by the next run
+    fixed = pl.DataFrame({"order_id": [1, 2], "amount": [1.0, 2.0]})
+    assert Processor(Config(conf)).execute(MemorySource(fixed)).lazy().collect()["order_id"].to_list() == [2]
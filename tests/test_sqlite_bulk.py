@@ -0,0 +1,64 @@
+import sqlite3
+
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors import SQLiteSink, SQLiteSource
+from detl.connectors.memory import MemorySource
+from detl.exceptions import ConnectionConfigurationError
+
+class FullDiskSink(SQLiteSink):
+    """Fails its second batch, after the first one was committed."""
+    def write_batch(self, df):
+        if self._batches_written == 1:
+            raise ConnectionConfigurationError("disk full")
+        super().write_batch(df)
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "staging.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE users (id INTEGER, name TEXT)")
+        conn.execute("CREATE INDEX users_name ON users (name)")
+        conn.execute("INSERT INTO users VALUES (-1, 'stale')")
+    return path
+
+def _indexes(path) -> list:
+    with sqlite3.connect(path) as conn:
+        return [name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name")]
+
+def test_bulk_load_keeps_indexes_and_applies_pragmas(db):
+    users = pl.DataFrame({"id": list(range(1000)), "name": [f"user{i}" for i in range(1000)]})
+    uri = f"sqlite:///{db}"
+    SQLiteSink(uri, "users", if_table_exists="append", batch_size=300, bulk=True).write(users.lazy())
+    assert SQLiteSource(uri, "SELECT COUNT(*) AS n FROM users").read()["n"][0] == 1001
+    assert _indexes(db) == ["users_name"]
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    # Unlike the non-bulk mode, replacing the table keeps its indexes, whether deferred or not
+    for defer in (True, False):
+        SQLiteSink(uri, "users", bulk=True, defer_indexes=defer).write(users.head(10))
+        assert SQLiteSource(uri, "SELECT * FROM users ORDER BY id").read().equals(users.head(10))
+        assert _indexes(db) == ["users_name"]
+
+def test_bulk_modes_and_empty_results(db):
+    uri = f"sqlite:///{db}"
+    with pytest.raises(ConnectionConfigurationError, match="already exists"):
+        SQLiteSink(uri, "users", if_table_exists="fail", bulk=True).write(pl.DataFrame({"id": [1], "name": ["a"]}))
+    assert _indexes(db) == ["users_name"]
+
+    SQLiteSink(uri, "empty", bulk=True).write(pl.DataFrame(schema={"id": pl.Int64, "name": pl.String}))
+    assert SQLiteSource(uri, "SELECT * FROM empty").read().columns == ["id", "name"]
+
+def test_failed_batch_restores_indexes(db):
+    uri = f"sqlite:///{db}"
+    sink = FullDiskSink(uri, "users", if_table_exists="append", bulk=True)
+    with pytest.raises(ConnectionConfigurationError, match="disk full"):
+        Processor(Config({"columns": {"id": {"dtype": "int"}, "name": {"dtype": "string"}}})).execute_batches(
+            MemorySource(pl.DataFrame({"id": [1, 2], "name": ["a", "b"]})), sink, batch_size=1
+        )
+    assert _indexes(db) == ["users_name"]
+    assert SQLiteSource(uri, "SELECT COUNT(*) AS n FROM users").read()["n"][0] == 2
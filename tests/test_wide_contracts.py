@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+import polars as pl
+
+from detl.config import Config
+from detl.core import Processor
+from detl.connectors.memory import MemorySource
+from detl.engine.actions import ACTION_REGISTRY, apply_violate_action
+from detl.engine.staging import StagedFrame
+from detl.exceptions import ConstraintViolationError
+
+def _float_rules(max_tactic: str) -> dict:
+    return {
+        "dtype": "float",
+        "on_null": {"tactic": "fill_value", "value": 0.0},
+        "constraints": {
+            "min_policy": {"threshold": 0, "violate_action": {"tactic": "drop_row"}},
+            "max_policy": {"threshold": 100, "violate_action": {"tactic": max_tactic, "value": 100.0}},
+        },
+    }
+
+def test_wide_contract_keeps_the_plan_shallow():
+    n = 3_000
+    df = pl.LazyFrame({f"c{i}": ["1.5", "200", None, "-1" if i == 7 else "3"] for i in range(n)})
+    contract = {"columns": {f"c{i}": _float_rules("fill_value") for i in range(n)}}
+
+    out = Processor(Config(contract)).execute(MemorySource(df))
+    # Applied column by column this would be thousands of nodes deep
+    assert out.explain(optimized=False).count("WITH_COLUMNS") < 10
+
+    out = out.collect()
+    assert out.shape == (3, n)
+    assert out["c0"].to_list() == [1.5, 100.0, 0.0] and out["c7"].to_list() == [1.5, 100.0, 0.0]
+
+def test_staged_rules_keep_rule_order_semantics():
+    df = pl.DataFrame({
+        "a": [5.0, -1.0, None, 500.0, 7.0],
+        "b": [1.0, 999.0, 2.0, 3.0, 300.0],
+        "c": ["x", "bad", "y", "x", "zz"],
+    })
+    contract = {"columns": {
+        "a": _float_rules("fill_value"),
+        "b": {"dtype": "float", "constraints": {"max_policy": {"threshold": 100, "violate_action": {"tactic": "fill_mean"}}}},
+        "c": {"dtype": "string", "constraints": {
+            "allowed_values": {"values": ["x", "y"], "violate_action": {"tactic": "fill_value", "value": "other"}},
+        }},
+    }}
+    out = Processor(Config(contract)).execute(MemorySource(df)).lazy().collect()
+    assert out["a"].to_list() == [5.0, 0.0, 100.0, 7.0]
+    # The mean only counts the rows a's rule kept, as it would applying one rule after another
+    assert out["b"].to_list() == [1.0, 2.0, 3.0, (1.0 + 2.0 + 3.0 + 300.0) / 4]
+    assert out["c"].to_list() == ["x", "y", "x", "other"]
+
+def test_staged_check_reports_offsets_among_kept_rows():
+    df = pl.DataFrame({"a": [-1.0, 1.0, -2.0, 1.0, 1.0], "b": [1.0, 2.0, 3.0, 400.0, 500.0], "c": [1.0, 1.0, 1.0, 1.0, 900.0]})
+    fail_over_100 = {"dtype": "float", "constraints": {"max_policy": {"threshold": 100, "violate_action": {"tactic": "fail"}}}}
+    contract = {"columns": {"a": _float_rules("fill_value"), "b": fail_over_100, "c": fail_over_100}}
+
+    with pytest.raises(ConstraintViolationError, match="'b'.*First offending row: 1") as e:
+        Processor(Config(contract)).execute(MemorySource(df))
+    # Offsets count the rows left by the filters before the check, as in the unstaged plan
+    assert e.value.row_offset == 1
+    assert e.value.sample["b"].to_list() == [400.0, 500.0]
+    assert e.value.sample.columns == ["a", "b", "c"]
+
+def test_handlers_not_declared_rowwise_get_the_plain_frame(monkeypatch):
+    frames = []
+    def fill_kept_count(df, col_name, mask, action):
+        frames.append(df)
+        return df.with_columns(pl.when(mask).then(pl.len()).otherwise(pl.col(col_name)).alias(col_name))
+    monkeypatch.setitem(ACTION_REGISTRY, "fill_kept_count", fill_kept_count)
+
+    staged = StagedFrame(pl.DataFrame({"a": [1, -1, 2, 300]})).filter(pl.col("a") > 0)
+    out = apply_violate_action(staged, "a", pl.col("a") > 100, SimpleNamespace(tactic="fill_kept_count"))
+    # Registered without `rowwise=True`, it sees a real frame with the pending filter applied
+    assert isinstance(frames[0], pl.DataFrame)
+    assert out["a"].to_list() == [1, 2, 3]